@@ -48,8 +48,8 @@ class Bike(Device, ClassifierMixin):
         self.cadence = round(cadence * 0.5)
         self.power = power
 
-        # Predict resistance, if we're not training
-        if not self.training:
+        # Predict resistance, if we're pedaling and not training. Stopped, it stays where it was.
+        if not self.training and self.cadence:
             self.resistance = self.predict_resistance(self.cadence, self.power, self.speed)
 
     def poll_device(self, data_handler: Callable, data_uuid: str = ""):
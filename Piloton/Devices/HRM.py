@@ -1,6 +1,13 @@
-from typing import Callable
+from typing import Callable, List, Optional
 
-from Piloton.Types import Device, LoopStatus
+from Piloton.Types import Device, HeartRateVariability, LoopStatus
+
+# Heart Rate Measurement flags
+_HEART_RATE_UINT16: int = 0x01
+_SENSOR_CONTACT_SUPPORTED: int = 0x04
+_SENSOR_CONTACT_DETECTED: int = 0x02
+_ENERGY_EXPENDED_PRESENT: int = 0x08
+_RR_INTERVALS_PRESENT: int = 0x10
 
 
 class HRM(Device):
@@ -15,20 +22,47 @@ class HRM(Device):
 
         # Set up heart rate monitor instance members
         self.heart_rate: int = 0  # BPM
+        self.sensor_contact: Optional[bool] = None  # None, if the HRM doesn't report contact
+        self.energy_expended: Optional[int] = None  # kJ, if the HRM reports it
+        self.rr_intervals: List[int] = []  # 1/1024 s, from the latest measurement only
+        self.hrv: HeartRateVariability = HeartRateVariability()
         self.hrm_data_uuid: str = "00002a37-0000-1000-8000-00805f9b34fb"
         self.loop_status: LoopStatus = LoopStatus.INACTIVE
 
     def update(self, data) -> None:
         """
-        Update hrm parameters with data received from heart rate monitor
+        Update hrm parameters with data received from heart rate monitor. Parses the Heart Rate Measurement
+        characteristic: flags, 8 or 16 bit heart rate, sensor contact, energy expended and RR-intervals.
 
         :param data: Heart Rate Monitor data
         """
         # Unpack from data bytes
         data_bytes: bytes = bytes(data)
+        flags: int = data_bytes[0]
+        offset: int = 1
 
         # Set heart rate from data
-        self.heart_rate = int.from_bytes(data_bytes, "big")
+        if flags & _HEART_RATE_UINT16:
+            self.heart_rate = int.from_bytes(data_bytes[offset : offset + 2], "little")
+            offset += 2
+        else:
+            self.heart_rate = data_bytes[offset]
+            offset += 1
+
+        # Sensor contact is only meaningful if the HRM supports it
+        self.sensor_contact = bool(flags & _SENSOR_CONTACT_DETECTED) if flags & _SENSOR_CONTACT_SUPPORTED else None
+
+        if flags & _ENERGY_EXPENDED_PRESENT:
+            self.energy_expended = int.from_bytes(data_bytes[offset : offset + 2], "little")
+            offset += 2
+
+        # Any remaining bytes are RR-intervals, oldest first
+        self.rr_intervals = []
+        if flags & _RR_INTERVALS_PRESENT:
+            for index in range(offset, len(data_bytes) - 1, 2):
+                rr_interval: int = int.from_bytes(data_bytes[index : index + 2], "little")
+                self.rr_intervals.append(rr_interval)
+                self.hrv.update(rr_interval)
 
     def poll_device(self, data_handler: Callable, data_uuid: str = ""):
         """
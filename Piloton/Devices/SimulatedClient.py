@@ -0,0 +1,114 @@
+import asyncio
+import math
+import random
+import struct
+import time
+from typing import Callable, Optional
+
+# Characteristics the simulator knows how to generate
+INDOOR_BIKE_DATA_UUID: str = "00002ad2-0000-1000-8000-00805f9b34fb"
+HRM_DATA_UUID: str = "00002a37-0000-1000-8000-00805f9b34fb"
+
+
+class SimulatedClient:
+    """
+    Stand-in for BleakClient that generates Indoor Bike Data and Heart Rate Measurement notifications locally.
+    Assign it (or a functools.partial of it) to a device's client_class to drive Piloton without hardware.
+    """
+
+    def __init__(self, address: str, rate: float = 0.0, seed: int = 0):
+        """
+        Set up simulated client
+
+        :param str address: [Unused] BLE address of device
+        :param float rate: Notifications per second (0: 4 Hz for bikes, 1 Hz for HRMs)
+        :param int seed: Seed for the generated ride
+        """
+        self.address: str = address
+        self.rate: float = rate
+        self._random: random.Random = random.Random(seed)
+        self._task: Optional[asyncio.Task] = None
+
+        # Notification statistics (s)
+        self.notifications: int = 0
+        self.total_latency: float = 0.0
+        self.max_latency: float = 0.0
+        self.total_handler_time: float = 0.0
+        self.max_handler_time: float = 0.0
+
+    async def __aenter__(self) -> "SimulatedClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def is_connected(self) -> bool:
+        return True
+
+    def indoor_bike_data(self, elapsed: float) -> bytearray:
+        """
+        Generate an Indoor Bike Data packet (flags 0x0244) for the given point in the ride
+
+        :param float elapsed: Seconds since notifications started
+        :return: Indoor Bike Data packet
+        """
+        cadence: float = 80 + 15 * math.sin(elapsed / 30) + self._random.uniform(-2, 2)
+        power: float = max(0.0, 2.2 * cadence + 40 * math.sin(elapsed / 90) + self._random.uniform(-5, 5))
+        speed: float = cadence * 0.45  # km/h
+
+        return bytearray(struct.pack("<hhhh", 0x0244, round(speed * 100), round(cadence * 2), round(power)) + b"\x00")
+
+    def heart_rate_measurement(self, elapsed: float) -> bytearray:
+        """
+        Generate a Heart Rate Measurement packet (8 bit heart rate, contact detected, RR-intervals) for the given
+        point in the ride
+
+        :param float elapsed: Seconds since notifications started
+        :return: Heart Rate Measurement packet
+        """
+        heart_rate: float = 140 + 20 * math.sin(elapsed / 120) + self._random.uniform(-1, 1)
+
+        # One RR-interval (1/1024 s) per beat since the last packet, with some beat-to-beat variation
+        beat: float = 60 / heart_rate * 1024
+        rr_intervals = [round(beat * self._random.gauss(1, 0.03)) for _ in range(round(heart_rate / 60))]
+        return bytearray(struct.pack(f"<BB{len(rr_intervals)}H", 0x16, round(heart_rate), *rr_intervals))
+
+    async def _notify(self, data_uuid: str, callback: Callable) -> None:
+        """
+        Call back with generated packets at a fixed rate anchored to the monotonic clock
+
+        :param str data_uuid: UUID of characteristic being simulated
+        :param Callable callback: Notification handler
+        """
+        if data_uuid == INDOOR_BIKE_DATA_UUID:
+            generate_packet: Callable[[float], bytearray] = self.indoor_bike_data
+            rate: float = self.rate or 4.0
+        else:
+            generate_packet = self.heart_rate_measurement
+            rate = self.rate or 1.0
+
+        start: float = time.monotonic()
+        while True:
+            # Sleep until the next notification is due, always yielding so a backlog can't starve the loop
+            due: float = start + self.notifications / rate
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+
+            # Record how late the notification is delivered and how long the handler takes with it
+            called: float = time.monotonic()
+            callback(data_uuid, generate_packet(due - start))
+            finished: float = time.monotonic()
+
+            self.notifications += 1
+            self.total_latency += called - due
+            self.max_latency = max(self.max_latency, called - due)
+            self.total_handler_time += finished - called
+            self.max_handler_time = max(self.max_handler_time, finished - called)
+
+    async def start_notify(self, data_uuid: str, callback: Callable) -> None:
+        self._task = asyncio.ensure_future(self._notify(data_uuid, callback))
+
+    async def stop_notify(self, data_uuid: str) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
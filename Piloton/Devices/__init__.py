@@ -1,2 +1,3 @@
 from Piloton.Devices.Bike import Bike
 from Piloton.Devices.HRM import HRM
+from Piloton.Devices.SimulatedClient import SimulatedClient
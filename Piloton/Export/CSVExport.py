@@ -0,0 +1,38 @@
+import csv
+import time
+from typing import Dict, List, TextIO
+
+from Piloton.Types.Export import Export
+
+
+class CSVExport(Export):
+    """
+    Export rides to a CSV file with a header row. Times are RFC3339, and missing values are empty.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file: TextIO = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.COLUMNS)
+
+    @staticmethod
+    def _format_time(nanoseconds: int) -> str:
+        """
+        Format a time as RFC3339, to the microsecond
+
+        :param int nanoseconds: Nanoseconds since the epoch
+        :return: RFC3339 time
+        :rtype: str
+        """
+        seconds, fraction = divmod(nanoseconds, 1_000_000_000)
+        return "{}.{:06d}Z".format(time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)), fraction // 1000)
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        self._writer.writerows(
+            [self._format_time(row["time"])] + [row[column] for column in self.COLUMNS[1:]] for row in rows
+        )
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self._file.close()
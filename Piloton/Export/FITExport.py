@@ -0,0 +1,292 @@
+import struct
+import time
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from Piloton.Types.Export import Export
+
+# FIT times are seconds since 1989-12-31T00:00:00Z
+_FIT_EPOCH: int = 631065600
+
+# Protocol 2.0, profile 21.32
+_PROTOCOL_VERSION: int = 0x20
+_PROFILE_VERSION: int = 2132
+_HEADER: struct.Struct = struct.Struct("<BBHI4s")
+_HEADER_SIZE: int = _HEADER.size + 2
+
+# Base types
+_ENUM: int = 0x00
+_UINT8: int = 0x02
+_UINT16: int = 0x84
+_UINT32: int = 0x86
+
+# Global message number, and field number, struct format, and base type of each field written
+_Fields = Tuple[Tuple[int, str, int], ...]
+_FILE_ID: Tuple[int, _Fields] = (0, ((0, "B", _ENUM), (1, "H", _UINT16), (2, "H", _UINT16), (4, "I", _UINT32)))
+_RECORD: Tuple[int, _Fields] = (
+    20,
+    ((253, "I", _UINT32), (3, "B", _UINT8), (4, "B", _UINT8), (6, "H", _UINT16), (7, "H", _UINT16)),
+)
+_LAP: Tuple[int, _Fields] = (
+    19,
+    (
+        (253, "I", _UINT32),
+        (2, "I", _UINT32),
+        (7, "I", _UINT32),
+        (8, "I", _UINT32),
+        (0, "B", _ENUM),
+        (1, "B", _ENUM),
+        (15, "B", _UINT8),
+        (16, "B", _UINT8),
+        (17, "B", _UINT8),
+        (18, "B", _UINT8),
+        (19, "H", _UINT16),
+        (20, "H", _UINT16),
+    ),
+)
+_SESSION: Tuple[int, _Fields] = (
+    18,
+    (
+        (253, "I", _UINT32),
+        (2, "I", _UINT32),
+        (7, "I", _UINT32),
+        (8, "I", _UINT32),
+        (0, "B", _ENUM),
+        (1, "B", _ENUM),
+        (5, "B", _ENUM),
+        (6, "B", _ENUM),
+        (16, "B", _UINT8),
+        (17, "B", _UINT8),
+        (18, "B", _UINT8),
+        (19, "B", _UINT8),
+        (20, "H", _UINT16),
+        (21, "H", _UINT16),
+        (25, "H", _UINT16),
+        (26, "H", _UINT16),
+    ),
+)
+_ACTIVITY: Tuple[int, _Fields] = (
+    34,
+    ((253, "I", _UINT32), (0, "I", _UINT32), (1, "H", _UINT16), (2, "B", _ENUM), (3, "B", _ENUM), (4, "B", _ENUM)),
+)
+
+# Values
+_ACTIVITY_FILE: int = 4
+_DEVELOPMENT_MANUFACTURER: int = 255
+_STOP: int = 1
+_LAP_EVENT: int = 9
+_SESSION_EVENT: int = 8
+_ACTIVITY_EVENT: int = 26
+_CYCLING: int = 2
+_INDOOR_CYCLING: int = 6
+_MPH_TO_MM_PER_SECOND: float = 447.04
+
+# Invalid values, for missing data
+_NO_UINT8: int = 0xFF
+_NO_UINT16: int = 0xFFFF
+_NO_UINT32: int = 0xFFFFFFFF
+
+
+def _crc_table() -> List[int]:
+    """
+    Build the lookup table of FIT's CRC-16, a byte at a time
+
+    :return: CRC of every byte value
+    :rtype: List[int]
+    """
+    table: List[int] = []
+    for byte in range(256):
+        crc: int = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE: List[int] = _crc_table()
+
+
+def _crc(data: bytes, crc: int = 0) -> int:
+    """
+    Update a FIT CRC with data
+
+    :param bytes data: Data
+    :param int crc: CRC of the data before
+    :return: CRC
+    :rtype: int
+    """
+    table: List[int] = _CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class FITExport(Export):
+    """
+    Export rides to a FIT activity file, as read by Garmin Connect, Strava, and most training software. Each row is
+    a record of heart rate, cadence, speed, and power; a lap and a session summarize them at the end. The whole
+    export is one indoor cycling activity, so export one session to upload a ride.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file: BinaryIO = open(path, "w+b")
+
+        # The header holds the size of the data, so it's written last
+        self._file.write(bytes(_HEADER_SIZE))
+        self._size: int = 0
+        self._defined: List[int] = []
+
+        # Running totals for the summary: first and last time, and sum, count, and max of each record field
+        self._first: Optional[int] = None
+        self._last: int = 0
+        self._sums: List[int] = [0, 0, 0]
+        self._counts: List[int] = [0, 0, 0]
+        self._maxima: List[int] = [0, 0, 0]
+
+        self._write_message(_FILE_ID, (_ACTIVITY_FILE, _DEVELOPMENT_MANUFACTURER, 0, self._timestamp(time.time_ns())))
+        self._write_definition(_RECORD)
+        self._record: struct.Struct = struct.Struct("<BIBBHH")
+
+    @staticmethod
+    def _timestamp(nanoseconds: int) -> int:
+        """
+        Convert a time to a FIT timestamp
+
+        :param int nanoseconds: Nanoseconds since the epoch
+        :return: Seconds since the FIT epoch
+        :rtype: int
+        """
+        return nanoseconds // 1_000_000_000 - _FIT_EPOCH
+
+    def _write(self, data: bytes) -> None:
+        """
+        Write message data
+
+        :param bytes data: Messages
+        """
+        self._file.write(data)
+        self._size += len(data)
+
+    def _write_definition(self, message: Tuple[int, _Fields]) -> None:
+        """
+        Write a definition message. Each message is given its own local message type, in the order they're defined.
+
+        :param message: Global message number and fields
+        """
+        number, fields = message
+        local: int = len(self._defined)
+        self._defined.append(number)
+        definition: bytes = struct.pack("<BBBHB", 0x40 | local, 0, 0, number, len(fields))
+        for field, form, base_type in fields:
+            definition += struct.pack("<BBB", field, struct.calcsize(f"<{form}"), base_type)
+        self._write(definition)
+
+    def _write_message(self, message: Tuple[int, _Fields], values: Tuple[int, ...]) -> None:
+        """
+        Write a data message, defining it first if it hasn't been
+
+        :param message: Global message number and fields
+        :param Tuple[int, ...] values: Field values
+        """
+        if message[0] not in self._defined:
+            self._write_definition(message)
+        local: int = self._defined.index(message[0])
+        self._write(struct.pack("<B" + "".join(field[1] for field in message[1]), local, *values))
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+
+        local: int = self._defined.index(_RECORD[0])
+        pack = self._record.pack
+        records: List[bytes] = []
+        for row in rows:
+            heart_rate, cadence, power, speed = row["heart_rate"], row["cadence"], row["power"], row["speed"]
+            heart_rate = _NO_UINT8 if heart_rate is None else min(round(heart_rate), _NO_UINT8 - 1)
+            cadence = _NO_UINT8 if cadence is None else min(round(cadence), _NO_UINT8 - 1)
+            power = _NO_UINT16 if power is None else min(round(power), _NO_UINT16 - 1)
+            speed = _NO_UINT16 if speed is None else min(round(speed * _MPH_TO_MM_PER_SECOND), _NO_UINT16 - 1)
+            records.append(pack(local, self._timestamp(row["time"]), heart_rate, cadence, speed, power))
+
+            for index, value, missing in ((0, heart_rate, _NO_UINT8), (1, cadence, _NO_UINT8), (2, power, _NO_UINT16)):
+                if value != missing:
+                    self._sums[index] += value
+                    self._counts[index] += 1
+                    if value > self._maxima[index]:
+                        self._maxima[index] = value
+
+        self._write(b"".join(records))
+        if self._first is None:
+            self._first = self._timestamp(rows[0]["time"])
+        self._last = self._timestamp(rows[-1]["time"])
+        self.rows += len(rows)
+
+    def _write_summary(self) -> None:
+        """
+        Write the lap, session, and activity messages that close the activity
+        """
+        start: int = self._first if self._first is not None else self._last
+        # Milliseconds, which only go to about 49 days
+        elapsed: int = min((self._last - start) * 1000, _NO_UINT32 - 1)
+        heart_rate, cadence, power = (
+            round(total / count) if count else missing
+            for total, count, missing in zip(self._sums, self._counts, (_NO_UINT8, _NO_UINT8, _NO_UINT16))
+        )
+        max_heart_rate: int = self._maxima[0] if self._counts[0] else _NO_UINT8
+        max_cadence: int = self._maxima[1] if self._counts[1] else _NO_UINT8
+        max_power: int = self._maxima[2] if self._counts[2] else _NO_UINT16
+
+        self._write_message(
+            _LAP,
+            (
+                self._last,
+                start,
+                elapsed,
+                elapsed,
+                _LAP_EVENT,
+                _STOP,
+                heart_rate,
+                max_heart_rate,
+                cadence,
+                max_cadence,
+                power,
+                max_power,
+            ),
+        )
+        self._write_message(
+            _SESSION,
+            (
+                self._last,
+                start,
+                elapsed,
+                elapsed,
+                _SESSION_EVENT,
+                _STOP,
+                _CYCLING,
+                _INDOOR_CYCLING,
+                heart_rate,
+                max_heart_rate,
+                cadence,
+                max_cadence,
+                power,
+                max_power,
+                0,
+                1,
+            ),
+        )
+        self._write_message(_ACTIVITY, (self._last, elapsed, 1, 0, _ACTIVITY_EVENT, _STOP))
+
+    def close(self) -> None:
+        self._write_summary()
+
+        # Now the size is known, write the header, then the CRC of the whole file
+        header: bytes = _HEADER.pack(_HEADER_SIZE, _PROTOCOL_VERSION, _PROFILE_VERSION, self._size, b".FIT")
+        self._file.seek(0)
+        self._file.write(header + struct.pack("<H", _crc(header)))
+        self._file.seek(0)
+
+        crc: int = 0
+        for chunk in iter(lambda: self._file.read(1 << 16), b""):
+            crc = _crc(chunk, crc)
+        self._file.write(struct.pack("<H", crc))
+        self._file.close()
@@ -0,0 +1,39 @@
+from typing import Dict, List
+
+from Piloton.Types.Export import Export
+
+
+class ParquetExport(Export):
+    """
+    Export rides to a Parquet file, one row group per chunk, for pandas, Spark, DuckDB and the like. Needs pyarrow
+    (poetry install -E parquet). Times are UTC timestamps; measurements are floats, as resampled data points hold
+    means.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow is not installed. Install it to export Parquet: poetry install -E parquet")
+
+        super().__init__(path)
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [("time", pyarrow.timestamp("ns", tz="UTC")), ("session", pyarrow.string()), ("rider", pyarrow.string())]
+            + [(column, pyarrow.float64()) for column in self.COLUMNS[3:]]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+
+        table = self._pyarrow.Table.from_pydict(
+            {column: [row[column] for row in rows] for column in self.COLUMNS}, schema=self._schema
+        )
+        self._writer.write_table(table)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self._writer.close()
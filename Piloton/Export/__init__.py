@@ -0,0 +1,3 @@
+from Piloton.Export.CSVExport import CSVExport
+from Piloton.Export.FITExport import FITExport
+from Piloton.Export.ParquetExport import ParquetExport
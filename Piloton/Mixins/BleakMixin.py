@@ -17,6 +17,9 @@ else:
 
 
 class BleakMixin(_Base):  # type: ignore
+    # Client used to connect to the device. Swappable for a simulated client.
+    client_class: Callable = BleakClient
+
     async def scan(self) -> str:
         """
         Asynchronously scan for device using name
@@ -45,7 +48,7 @@ class BleakMixin(_Base):  # type: ignore
         :param str data_uuid: UUID of Data being polled for
         """
         self.loop_status = LoopStatus.CONNECTING  # For display purposes, need to connect before loading UI
-        async with BleakClient(self.ble_address) as client:
+        async with self.client_class(self.ble_address) as client:
             # Wait until we're connected with the device
             connected = await client.is_connected()
             self.logger.debug("Device (%s) Connected: %s", self.ble_address, connected)
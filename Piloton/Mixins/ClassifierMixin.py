@@ -1,8 +1,10 @@
-from typing import TYPE_CHECKING, List, MutableMapping, Tuple, Union
+from typing import TYPE_CHECKING, Sequence, Union
 
 from sklearn import tree
 import numpy as np
 
+from Piloton.Types.TrainingData import TrainingData
+
 # Only import when type checking
 if TYPE_CHECKING:
     from Piloton.Devices import Bike
@@ -22,34 +24,18 @@ class ClassifierMixin(_Base):  # type: ignore
         self.trained: bool = False
         super().__init__()
 
-    def train(self, training_data: MutableMapping[int, MutableMapping[int, List[Tuple[int, float]]]]) -> None:
+    def train(self, training_data: TrainingData) -> None:
         """
         Fit the training data to the Decision Tree Classifier
 
-        :param training_data: training_data from Piloton base class
+        :param TrainingData training_data: training_data from Piloton base class
         """
-        # Set up our data structures
-        classifications: List[int] = []
-        training_inputs: List[List[Union[int, float]]] = []
-
-        # Build up our classifications and training inputs
-        for resistance, cadences in training_data.items():
-            for cadence, power_speed_readings in cadences.items():
-                for power_speed_reading in power_speed_readings:
-                    power: int = power_speed_reading[0]
-                    speed: float = power_speed_reading[1]
-
-                    # Intended that predict(Cadence, Power, Speed) => Resistance
-                    training_inputs.append([cadence, power, speed])
-                    classifications.append(resistance)
-
-        # Convert to np.array
-        input_values: np.ndarray = np.array(training_inputs)
-        output_values: np.ndarray = np.array(classifications)
+        # Intended that predict(Cadence, Power, Speed) => Resistance
+        input_values, output_values = training_data.matrices()
 
         # Fit the data in the classifier
         self.logger.info(
-            "Training (%d) data points to (%d) classifications", len(classifications), len(set(classifications))
+            "Training (%d) data points to (%d) classifications", len(output_values), len(np.unique(output_values))
         )
         self.classifier.fit(input_values, output_values)
         self.trained = True
@@ -71,3 +57,26 @@ class ClassifierMixin(_Base):  # type: ignore
 
             return prediction
         return 0
+
+    def predict_resistance_many(
+        self,
+        cadence: Union[Sequence[int], np.ndarray],
+        power: Union[Sequence[int], np.ndarray],
+        speed: Union[Sequence[float], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Predict Resistance for many samples in one call, e.g. to re-predict past rides after retraining
+
+        :param cadence: Cadences of bike (RPM)
+        :param power: Powers being generated by bike (W)
+        :param speed: Speeds of bike (mp/h)
+        :return: Predicted resistances, in the same order
+        :rtype: np.ndarray
+        """
+        input_values: np.ndarray = np.column_stack(
+            (np.asarray(cadence, dtype=np.float64), np.asarray(power, dtype=np.float64), np.asarray(speed))
+        )
+        if not self.trained or not len(input_values):
+            return np.zeros(len(input_values), dtype=np.int16)
+
+        return self.classifier.predict(input_values).astype(np.int16)
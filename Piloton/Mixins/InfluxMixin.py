@@ -1,11 +1,31 @@
-from typing import Dict, Tuple, TYPE_CHECKING
+import asyncio
+import calendar
+import heapq
+import sqlite3
+from functools import partial
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
+
+import numpy as np
 
 from influxdb import InfluxDBClient
+from influxdb.exceptions import InfluxDBClientError, InfluxDBServerError
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from Piloton.Storage.InfluxStorage import InfluxStorage
+from Piloton.Storage.SQLiteStorage import SQLiteStorage
+from Piloton.Types.Export import Export
+from Piloton.Types.InfluxUDPClient import InfluxUDPClient
+from Piloton.Types.LoopStatus import LoopStatus
+from Piloton.Types.Resampler import Resampler
+from Piloton.Types.Storage import Storage
 
 
 # Only import when type_checking
 if TYPE_CHECKING:
-    from Piloton import Piloton
+    from Piloton.Devices.Bike import Bike
+    import Piloton.Piloton as Piloton
 
     _Base = Piloton
 else:
@@ -20,17 +40,56 @@ _MEMBER_REQUIREMENTS: Tuple[str, ...] = (
     "influx_database",
 )
 
+# Latest time Influx can hold (nanoseconds since the epoch)
+_LATEST_TIME: int = 2 ** 63 - 2
+
+# Export columns of each device's fields, in raw and combined data points
+_EXPORT_FIELDS: Dict[str, Dict[str, str]] = {
+    "bike": {
+        "speed": "speed",
+        "cadence": "cadence",
+        "power": "power",
+        "resistance": "resistance",
+        "power_zone": "power_zone",
+    },
+    "hrm": {"heart_rate": "heart_rate", "zone": "heart_zone", "rmssd": "rmssd", "sdnn": "sdnn"},
+}
+
 
 class InfluxMixin(_Base):  # type: ignore
     def __init__(self):
         """
-        Set up Influx Client
+        Set up storage: Influx Client, or an embedded SQLite database if storage_backend is "sqlite"
         """
+        # Data points waiting for the next batch write
+        self._queued_points: List[Dict] = []
+
         # Warn if any fields are missing from Base
-        if any(not hasattr(self, requirement) for requirement in _MEMBER_REQUIREMENTS):
+        required: bool = self.storage_backend != "sqlite"
+        if required and any(not hasattr(self, requirement) for requirement in _MEMBER_REQUIREMENTS):
             self.logger.warning("Missing required field. Unable to setup InfluxDB Client.")
             return
 
+        self.storage: Storage = self.create_storage()
+
+        # Make sure retention policies and rollups are in place
+        if required:
+            self.setup_retention_policies()
+
+        super().__init__()
+
+    def create_storage(self) -> Storage:
+        """
+        Connect to storage. Also used by a forked storage process, which needs connections of its own.
+
+        :return: Storage backend
+        :rtype: Storage
+        """
+        # Embedded storage needs no server
+        if self.storage_backend == "sqlite":
+            self.logger.info("Storing data points in %s", self.sqlite_path)
+            return SQLiteStorage(self.sqlite_path, self.influx_batch_size, self.influx_flush_interval)
+
         # Set up InfluxDB client
         self.influx_client: InfluxDBClient = InfluxDBClient(
             host=self.influx_host,
@@ -41,11 +100,64 @@ class InfluxMixin(_Base):  # type: ignore
         )
         self.logger.debug("Successfully set up InfluxDB Client")
 
-        super().__init__()
+        # Data points are written over HTTP, or fired off over UDP. Queries always go over HTTP.
+        influx_writer: Union[InfluxDBClient, InfluxUDPClient] = self.influx_client
+        if self.influx_transport == "udp":
+            influx_writer = InfluxUDPClient(self.influx_host, self.influx_udp_port, self.influx_udp_mtu)
+            self.logger.info("Writing data points over UDP to port (%s)", self.influx_udp_port)
+        return InfluxStorage(self.influx_client, influx_writer)
+
+    def setup_retention_policies(self) -> None:
+        """
+        Create (or update) the retention policies and continuous queries Piloton writes and reads through:
+
+        autogen: Every data point, kept for influx_raw_retention. Stays the default policy, so all writes land here,
+            and sessions, repredictions, and exports read every data point ever recorded here.
+        rollup_<interval>: mean_<field> and max_<field> of every measurement per interval, kept as configured in
+            influx_rollups. Continuous queries fill these from autogen, so long-range dashboards read far fewer points.
+        """
+        database: str = self.influx_database
+        try:
+            self.influx_client.create_database(database)
+
+            # Retention policies by name
+            policies: Dict[str, Dict] = {
+                policy["name"]: policy for policy in self.influx_client.get_list_retention_policies(database)
+            }
+            wanted: Dict[str, str] = {"autogen": self.influx_raw_retention}
+            wanted.update({f"rollup_{interval}": duration for interval, duration in self.influx_rollups.items()})
+
+            for name, duration in wanted.items():
+                if name not in policies:
+                    self.logger.info("Creating retention policy (%s) with duration (%s)", name, duration)
+                    self.influx_client.create_retention_policy(name, duration, "1", database, default=name == "autogen")
+                else:
+                    self.influx_client.alter_retention_policy(
+                        name, database, duration=duration, default=name == "autogen"
+                    )
+
+            # Continuous queries by name. Existing ones are left as they are.
+            queries: List[str] = []
+            for database_queries in self.influx_client.get_list_continuous_queries():
+                queries.extend(query["name"] for query in database_queries.get(database, []))
+
+            for interval in self.influx_rollups:
+                name = f"cq_{interval}"
+                if name in queries:
+                    continue
+
+                self.logger.info("Creating continuous query (%s)", name)
+                select: str = (
+                    f'SELECT mean(*), max(*) INTO "{database}"."rollup_{interval}".:MEASUREMENT '
+                    f'FROM "{database}"."autogen"./.*/ GROUP BY time({interval}), *'
+                )
+                self.influx_client.create_continuous_query(name, select, database)
+        except (RequestsConnectionError, OSError, InfluxDBClientError, InfluxDBServerError) as error:
+            self.logger.warning("Unable to set up Influx retention policies: %s", error)
 
     def write_data_point(self, measurement: str, tags: Dict, time: str, fields: Dict) -> None:
         """
-        Write Data Point to Influx
+        Write Data Point to storage
 
         :param str measurement: Measurement to write data point to
         :param Dict tags: Tags associated to data point
@@ -54,4 +166,385 @@ class InfluxMixin(_Base):  # type: ignore
         :return: Nothing
         """
         data_point = [{"measurement": measurement, "tags": tags, "time": time, "fields": fields}]
-        self.influx_client.write_points(data_point)
+        self.storage.write_points(data_point)
+
+    def write_session_event(
+        self, session: str, rider: str, event: str, elapsed: float = 0.0, paused: float = 0.0
+    ) -> None:
+        """
+        Write a session start or stop marker to the session measurement. A failed write is logged, not raised,
+        so an unreachable Influx doesn't stop a workout from starting.
+
+        :param str session: Session ID
+        :param str rider: Rider name
+        :param str event: "start", "resume" (after a crash or reboot), or "stop"
+        :param float elapsed: Seconds since the session started
+        :param float paused: Seconds of elapsed spent auto-paused
+        """
+        try:
+            self.write_data_point(
+                measurement="session",
+                tags={"session": session, "rider": rider},
+                time=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+                fields={"event": event, "elapsed": elapsed, "paused": paused},
+            )
+        except (RequestsConnectionError, OSError, InfluxDBClientError, InfluxDBServerError, sqlite3.Error) as error:
+            self.logger.warning("Unable to write session (%s) %s: %s", session, event, error)
+
+    def list_sessions(self, rider: Optional[str] = None) -> List[str]:
+        """
+        List recorded sessions
+
+        :param Optional[str] rider: Only list this rider's sessions
+        :return: Session IDs
+        :rtype: List[str]
+        """
+        return self.storage.list_sessions(rider)
+
+    def repredict_resistance(self, bike: "Bike", sessions: Optional[List[str]] = None, chunk_size: int = 10000) -> int:
+        """
+        Re-predict resistance for past rides with the bike's current model, e.g. after more training. Each session's
+        bike data is read in chunks, predicted in one call per chunk, and written back over the old resistance.
+
+        :param Bike bike: Trained bike
+        :param Optional[List[str]] sessions: Sessions to re-predict (default: every session)
+        :param int chunk_size: Most points read, predicted, and written at a time
+        :return: Number of points re-predicted
+        :rtype: int
+        """
+        if sessions is None:
+            sessions = self.list_sessions()
+
+        repredicted: int = 0
+        for session in sessions:
+            # Bike data is in its own measurement if written raw, combined with HRM data if resampled
+            for measurement in ("indoor_bike_data", self.resample_measurement):
+                repredicted += self._repredict_measurement(bike, measurement, session, chunk_size)
+
+            self.storage.flush()
+            self.logger.info("Re-predicted resistance for session (%s)", session)
+
+        return repredicted
+
+    def _repredict_measurement(self, bike: "Bike", measurement: str, session: str, chunk_size: int) -> int:
+        """
+        Re-predict resistance for a session's bike data in one measurement. See repredict_resistance.
+
+        :param Bike bike: Trained bike
+        :param str measurement: Measurement holding bike data
+        :param str session: Session ID
+        :param int chunk_size: Most points read, predicted, and written at a time
+        :return: Number of points re-predicted
+        :rtype: int
+        """
+        # Combined points hold mean resistance, and a field keeps the type it was first written with
+        cast: type = float if measurement == self.resample_measurement else int
+
+        repredicted: int = 0
+
+        # Read the session a chunk at a time, tags included so points are written back to the same series
+        for points in self._read_chunks(measurement, 0, _LATEST_TIME, session, chunk_size):
+            # Combined points from intervals without bike data have nothing to predict from
+            bike_points: List[Dict] = [point for point in points if point.get("power") is not None]
+            if bike_points:
+                # Predict the whole chunk at once
+                resistances: np.ndarray = bike.predict_resistance_many(
+                    [point["cadence"] or 0 for point in bike_points],
+                    [point["power"] or 0 for point in bike_points],
+                    [point["speed"] or 0.0 for point in bike_points],
+                )
+
+                # Write back only the resistance field; storage merges it into the existing points
+                self.storage.write_points(
+                    [
+                        {
+                            "measurement": measurement,
+                            "tags": {key: point[key] for key in ("session", "rider", "device") if point.get(key)},
+                            "time": point["time"],
+                            "fields": {"resistance": cast(resistance)},
+                        }
+                        for point, resistance in zip(bike_points, resistances)
+                    ],
+                    batch_size=self.influx_batch_size,
+                )
+                repredicted += len(bike_points)
+
+        return repredicted
+
+    def export_rides(
+        self,
+        export: Export,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        session: Optional[str] = None,
+    ) -> int:
+        """
+        Export recorded rides, with bike and heart rate data joined on time. Raw and combined data points are read
+        in chunks of export_chunk_size, merged in time order, and written a chunk at a time, so memory use stays the
+        same however much is exported. On Influx, points older than autogen keeps them are read from the finest
+        rollup that still holds them, a row per rollup interval.
+
+        :param Export export: File to export to
+        :param Optional[datetime] start: Export from this time (UTC, default: the start)
+        :param Optional[datetime] end: Export up to this time, not included (UTC, default: the end)
+        :param Optional[str] session: Only export this session
+        :return: Number of rows exported
+        :rtype: int
+        """
+        start_time: int = self._to_nanoseconds(start) if start is not None else 0
+        end_time: int = self._to_nanoseconds(end) if end is not None else _LATEST_TIME
+
+        # Each measurement is read in time order, so they can be merged without holding more than a chunk of each
+        measurements: Tuple[str, ...] = ("indoor_bike_data", "heart_rate_monitor", self.resample_measurement)
+        points: Iterator[Dict] = heapq.merge(
+            *(
+                self._read_range(measurement, source_start, source_end, session, policy)
+                for policy, source_start, source_end in self._export_sources(start_time, end_time)
+                for measurement in measurements
+            ),
+            key=itemgetter("time"),
+        )
+
+        exported: int = 0
+        rows: List[Dict] = []
+        for row in self._join_devices(points):
+            rows.append(row)
+            if len(rows) >= self.export_chunk_size:
+                export.write_rows(rows)
+                exported += len(rows)
+                rows = []
+        export.write_rows(rows)
+
+        return exported + len(rows)
+
+    @staticmethod
+    def _to_nanoseconds(moment: datetime) -> int:
+        """
+        Convert a time to nanoseconds since the epoch
+
+        :param datetime moment: Time, UTC if naive
+        :return: Nanoseconds since the epoch
+        :rtype: int
+        """
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return calendar.timegm(moment.utctimetuple()) * 1_000_000_000 + moment.microsecond * 1000
+
+    def _export_sources(self, start: int, end: int) -> List[Tuple[Optional[str], int, int]]:
+        """
+        Find which retention policy holds each part of a time range. Every data point is in autogen (and in raw, if
+        an earlier version made that the default) for as long as autogen keeps them. Older parts of the range are
+        read from the rollup with the shortest interval that still holds them.
+
+        :param int start: First time (nanoseconds since the epoch)
+        :param int end: Time to read up to, not included (nanoseconds since the epoch)
+        :return: Retention policy (None: storage has none) and the part of the range to read from it
+        :rtype: List[Tuple[Optional[str], int, int]]
+        """
+        policies: Dict[str, int] = self.storage.retention_policies()
+        if not policies:
+            return [(None, start, end)]
+
+        # When each policy's points start, as of now
+        now: int = self._to_nanoseconds(datetime.utcnow())
+        kept_from: Dict[str, int] = {name: now - duration if duration else 0 for name, duration in policies.items()}
+
+        sources: List[Tuple[Optional[str], int, int]] = []
+        raw_start: int = max(start, kept_from.get("autogen", 0))
+        if raw_start < end:
+            sources.extend((name, raw_start, end) for name in ("autogen", "raw") if name in policies)
+
+        # Rollups keeping points longer have longer intervals, so go from the shortest kept back
+        rollups: List[Tuple[int, str]] = sorted(
+            ((kept, name) for name, kept in kept_from.items() if name.startswith("rollup_")), reverse=True
+        )
+        older_end: int = min(end, raw_start)
+        for kept, name in rollups:
+            if older_end <= start:
+                break
+            if max(start, kept) < older_end:
+                sources.append((name, max(start, kept), older_end))
+                older_end = max(start, kept)
+
+        return sources
+
+    def _read_range(
+        self, measurement: str, start: int, end: int, session: Optional[str], retention_policy: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Read a measurement's points in a time range, export_chunk_size at a time. See _read_chunks. Rollup points are
+        read as data points, see _from_rollup.
+
+        :param str measurement: Measurement to read
+        :param int start: First time (nanoseconds since the epoch)
+        :param int end: Time to read up to, not included (nanoseconds since the epoch)
+        :param Optional[str] session: Only read this session's points
+        :param Optional[str] retention_policy: Retention policy to read (default: the default policy)
+        :return: Points, oldest first
+        """
+        rollup: bool = retention_policy is not None and retention_policy.startswith("rollup_")
+        for points in self._read_chunks(measurement, start, end, session, self.export_chunk_size, retention_policy):
+            if not rollup:
+                yield from points
+                continue
+
+            yield from map(self._from_rollup, points)
+
+    @staticmethod
+    def _from_rollup(point: Dict) -> Dict:
+        """
+        Read a rollup point as a data point: each field's mean over the interval, except for zones, where a mean
+        names no zone, so the highest zone
+
+        :param Dict point: Rollup point, with mean_<field> and max_<field>
+        :return: Data point
+        :rtype: Dict
+        """
+        fields: Dict = {}
+        for key, value in point.items():
+            if key.startswith("mean_"):
+                key = key[len("mean_") :]
+                if key in Resampler.CATEGORICAL:
+                    continue
+            elif key.startswith("max_"):
+                key = key[len("max_") :]
+                if key not in Resampler.CATEGORICAL:
+                    continue
+            fields[key] = value
+        return fields
+
+    def _read_chunks(
+        self,
+        measurement: str,
+        start: int,
+        end: int,
+        session: Optional[str],
+        chunk_size: int,
+        retention_policy: Optional[str] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Read a measurement's points in a time range, a chunk at a time. Each chunk starts at the last time of the one
+        before, instead of at an offset, so later chunks cost no more to read than the first.
+
+        :param str measurement: Measurement to read
+        :param int start: First time (nanoseconds since the epoch)
+        :param int end: Time to read up to, not included (nanoseconds since the epoch)
+        :param Optional[str] session: Only read this session's points
+        :param int chunk_size: Most points read at a time
+        :param Optional[str] retention_policy: Retention policy to read (default: the default policy)
+        :return: Chunks of points, oldest first
+        """
+        while True:
+            points: List[Dict] = self.storage.query_range(
+                measurement, start, end, chunk_size, session, retention_policy
+            )
+            if len(points) < chunk_size:
+                if points:
+                    yield points
+                return
+
+            # More points may share the last time than fit in this chunk, so read them with the next one
+            last: int = points[-1]["time"]
+            complete: int = len(points)
+            while complete and points[complete - 1]["time"] == last:
+                complete -= 1
+
+            # Unless the whole chunk is one time
+            if not complete:
+                yield points
+                start = last + 1
+            else:
+                yield points[:complete]
+                start = last
+
+    def _join_devices(self, points: Iterator[Dict]) -> Iterator[Dict]:
+        """
+        Join bike and heart rate data points on time. Every point becomes a row, with the other device's latest
+        values from the same session, if they're at most export_join_tolerance old. Points of a session at the same
+        time, like combined data points, are one row.
+
+        :param Iterator[Dict] points: Raw and combined data points of any sessions, oldest first
+        :return: Export rows, oldest first
+        """
+        tolerance: int = int(self.export_join_tolerance * 1_000_000_000)
+
+        # Each session's latest values from each device, and when they're from
+        latest: Dict[Optional[str], Dict[str, Tuple[int, Dict]]] = {}
+
+        # Rows at the current time, by session
+        current: int = -1
+        rows: Dict[Optional[str], Dict] = {}
+
+        for point in points:
+            moment: int = point["time"]
+            if moment != current:
+                yield from rows.values()
+                current, rows = moment, {}
+
+            session: Optional[str] = point.get("session")
+            if session not in latest:
+                # Forget sessions with nothing recent enough to join
+                stale: List[Optional[str]] = [
+                    key for key, devices in latest.items() if all(moment - at > tolerance for at, _ in devices.values())
+                ]
+                for key in stale:
+                    del latest[key]
+                latest[session] = {}
+
+            devices: Dict[str, Tuple[int, Dict]] = latest[session]
+            for device, fields in _EXPORT_FIELDS.items():
+                values: Dict = {column: point.get(field) for field, column in fields.items()}
+                if any(value is not None for value in values.values()):
+                    devices[device] = (moment, values)
+
+            row: Dict = dict.fromkeys(Export.COLUMNS)
+            row.update(time=moment, session=session, rider=point.get("rider"))
+            for at, values in devices.values():
+                if moment - at <= tolerance:
+                    row.update(values)
+            rows[session] = row
+
+        yield from rows.values()
+
+    def queue_data_point(self, measurement: str, tags: Dict, time: str, fields: Dict) -> None:
+        """
+        Queue Data Point to be written to Influx with the next batch. See write_queued_points.
+
+        :param str measurement: Measurement to write data point to
+        :param Dict tags: Tags associated to data point
+        :param str time: Time of data point
+        :param Dict fields: Fields of data point
+        :return: Nothing
+        """
+        self._queued_points.append({"measurement": measurement, "tags": tags, "time": time, "fields": fields})
+
+    async def _flush_queued_points(self) -> None:
+        """
+        Write all queued data points to storage off the event loop
+        """
+        if not self._queued_points:
+            return
+
+        points, self._queued_points = self._queued_points, []
+        try:
+            write = partial(self.storage.write_points, points, batch_size=self.influx_batch_size)
+            await asyncio.get_running_loop().run_in_executor(None, write)
+        except Exception:
+            self.logger.exception("Unable to write (%d) data points to storage", len(points))
+
+    async def write_queued_points(self) -> None:
+        """
+        Batch Writer Loop. Writes queued data points every influx_flush_interval seconds until signal interrupt.
+        """
+        # Get function name
+        func_name = "_influx_write_queued_points"
+
+        # Set status to active
+        self.loop_tracker[func_name] = LoopStatus.ACTIVE
+
+        while self.loop_tracker[func_name] == LoopStatus.ACTIVE:
+            await asyncio.sleep(self.influx_flush_interval)
+            await self._flush_queued_points()
+
+        # Write whatever came in since the last batch
+        await self._flush_queued_points()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import math
+import time
+import signal
+import asyncio
+import multiprocessing
+from multiprocessing.process import BaseProcess
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from Piloton.Types.Display import Display
+from Piloton.Types.SampleRing import SampleRing
+
+# Only import when type_checking
+if TYPE_CHECKING:
+    from Piloton import Piloton
+    from Piloton.Types.Resampler import Resampler
+
+    _Base = Piloton
+else:
+    _Base = object
+
+
+class ProcessMixin(_Base):  # type: ignore
+    # Points queued for the next batch, set up by InfluxMixin
+    _queued_points: List[Dict]
+
+    def __init__(self):
+        """
+        Set up multiprocess workouts. The process that talks to the devices writes every sample to a shared memory
+        ring; a storage process and a display process read from it, so neither storage writes nor rendering can
+        hold the GIL while a notification is waiting.
+        """
+        self.ring: Optional[SampleRing] = None
+        self._workers: List[BaseProcess] = []
+
+        super().__init__()
+
+    def start_workers(self, display: Display) -> bool:
+        """
+        Start the storage and display processes. They're forked, so they start with a copy of the session as it
+        is now: tags, resampling, and the structured workout, which has to be started first.
+
+        :param Display display: Display to run in the display process
+        :return: True, if the processes started. False, if processes can't be forked here.
+        :rtype: bool
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            self.logger.warning("Unable to fork worker processes on this platform. Running in one process.")
+            return False
+
+        context = multiprocessing.get_context("fork")
+        self.ring = SampleRing(self.ring_capacity)
+        self._workers = [
+            context.Process(target=self._storage_worker, name="piloton-storage"),
+            context.Process(target=self._display_worker, args=(display,), name="piloton-display"),
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        self.logger.info("Started storage (%d) and display (%d) processes", *(w.pid for w in self._workers))
+        return True
+
+    def stop_workers(self, timeout: float = 10.0) -> None:
+        """
+        Close the ring and wait for the storage and display processes to finish what's in it
+
+        :param float timeout: Seconds to wait for each process before terminating it
+        """
+        if self.ring is None:
+            return
+
+        self.ring.close()
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                self.logger.warning("Worker process (%s) didn't finish. Terminating it.", worker.name)
+                worker.terminate()
+                worker.join()
+
+        self._workers = []
+        self.ring.release()
+        self.ring = None
+
+    def share_sample(self, kind: int) -> None:
+        """
+        Write the latest snapshot to the ring, if running in multiprocess mode
+
+        :param int kind: SampleRing.BIKE or SampleRing.HRM
+        """
+        if self.ring is None:
+            return
+
+        sdnn: float = math.nan
+        if kind == SampleRing.HRM and len(self.hrm.hrv) > 1:
+            sdnn = self.hrm.hrv.sdnn
+        self.ring.write(kind, time.time(), self.snapshot, sdnn)
+
+    @staticmethod
+    def _ignore_interrupts() -> None:
+        """
+        Leave Ctrl+C to the device process, which closes the ring to stop the workers
+        """
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    @staticmethod
+    def _bike_fields(record: np.void) -> Dict:
+        """
+        Get a bike sample's data point fields, as the workout handler writes them
+
+        :param np.void record: Bike sample record
+        :return: Fields
+        """
+        return {
+            "speed": round(float(record["speed"]), 2),
+            "cadence": int(record["cadence"]),
+            "power": int(record["power"]),
+            "resistance": int(record["resistance"]),
+            "power_zone": int(record["power_zone"]),
+        }
+
+    @staticmethod
+    def _hrm_fields(record: np.void) -> Dict:
+        """
+        Get a heart rate sample's data point fields, as the workout handler writes them
+
+        :param np.void record: Heart rate sample record
+        :return: Fields
+        """
+        fields: Dict = {"heart_rate": int(record["heart_rate"]), "zone": int(record["heart_zone"])}
+        if not math.isnan(record["sdnn"]):
+            fields.update(rmssd=float(record["rmssd"]), sdnn=float(record["sdnn"]))
+        return fields
+
+    def _storage_worker(self) -> None:
+        """
+        Storage process. Writes samples from the ring in batches, every influx_flush_interval, until the ring
+        closes. Paused samples aren't written, as in one process.
+        """
+        self._ignore_interrupts()
+
+        # Connections aren't shared with the device process
+        self.storage = self.create_storage()
+        resampler: Optional[Resampler] = self._create_resampler(self.session_id, self.user_name)
+
+        # Workers only run once start_workers has set up the ring
+        ring: Optional[SampleRing] = self.ring
+        assert ring is not None
+
+        cursor: int = 0
+        dropped: int = 0
+        while True:
+            # Anything written before the ring closed is read below
+            closed: bool = ring.closed
+            records, cursor, lost = ring.read(cursor)
+            dropped += lost
+
+            for record in records[records["paused"] == 0]:
+                timestamp: float = float(record["timestamp"])
+                if record["kind"] == SampleRing.BIKE:
+                    fields: Dict = self._bike_fields(record)
+                    self._write_sample(
+                        self.queue_data_point, resampler, "indoor_bike_data", self.bike_tags, fields, timestamp
+                    )
+                else:
+                    fields = self._hrm_fields(record)
+                    self._write_sample(
+                        self.queue_data_point, resampler, "heart_rate_monitor", self.hrm_tags, fields, timestamp
+                    )
+
+            points, self._queued_points = self._queued_points, []
+            if points:
+                try:
+                    self.storage.write_points(points, batch_size=self.influx_batch_size)
+                except Exception:
+                    self.logger.exception("Unable to write (%d) data points to storage", len(points))
+
+            if closed:
+                break
+
+            # Wait for the next batch, waking early when the ring closes
+            deadline: float = time.monotonic() + self.influx_flush_interval
+            while time.monotonic() < deadline and not ring.closed:
+                time.sleep(self.worker_poll_interval)
+
+        if dropped:
+            self.logger.warning("Storage process fell behind and lost (%d) samples", dropped)
+        self._flush_resampler(resampler)
+        self.storage.flush()
+        self.storage.close()
+
+    def _display_worker(self, display: Display) -> None:
+        """
+        Display process. Runs the display on its own event loop, fed from the ring, until the ring closes.
+
+        :param Display display: Display to run
+        """
+        self._ignore_interrupts()
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(asyncio.gather(self._follow_ring(), display.live_output()))
+
+    async def _follow_ring(self) -> None:
+        """
+        Keep the display process's snapshot and structured workout compliance up to date from the ring, stopping
+        the display once the ring closes
+        """
+        # Workers only run once start_workers has set up the ring
+        ring: Optional[SampleRing] = self.ring
+        assert ring is not None
+
+        cursor: int = 0
+        while not ring.closed:
+            await asyncio.sleep(self.worker_poll_interval)
+            records, cursor, _ = ring.read(cursor)
+            if not len(records):
+                continue
+
+            if self.workout is not None:
+                now: float = time.monotonic()
+                moving: np.ndarray = records[(records["kind"] == SampleRing.BIKE) & (records["paused"] == 0)]
+                for power in moving["power"]:
+                    self.workout.record(int(power), now, self.power_zones.ftp)
+            self.snapshot = SampleRing.to_snapshot(records[-1])
+
+        self.stop()
@@ -2,4 +2,5 @@ from Piloton.Mixins.BleakMixin import BleakMixin
 from Piloton.Mixins.ClassifierMixin import ClassifierMixin
 from Piloton.Mixins.InfluxMixin import InfluxMixin
 from Piloton.Mixins.LoggingMixin import LoggingMixin
+from Piloton.Mixins.ProcessMixin import ProcessMixin
 from Piloton.Mixins.RichMixin import RichMixin
@@ -1,24 +1,71 @@
 import os
 import json
+import time
+import uuid
 import signal
 import asyncio
 
 from datetime import datetime
-from typing import List, Dict, MutableMapping, Tuple
+from functools import partial
+from typing import Any, Callable, Coroutine, List, Dict, Optional, TYPE_CHECKING
 
-from Piloton.Devices import Bike, HRM
-from Piloton.Mixins import InfluxMixin, LoggingMixin, RichMixin
-from Piloton.Types import Device, HeartZone, HeartZones, LoopStatus, Menu, PowerZone, PowerZones
+from rich.prompt import Confirm
+
+from Piloton.Devices import Bike, HRM, SimulatedClient
+from Piloton.Mixins import InfluxMixin, LoggingMixin, ProcessMixin, RichMixin
+from Piloton.Types import (
+    AutoPause,
+    Device,
+    Form,
+    HeartZone,
+    HeartZones,
+    LoopStatus,
+    Menu,
+    MetricsSnapshot,
+    OnlineLearner,
+    PowerCurve,
+    PowerZone,
+    PowerZones,
+    Resampler,
+    Rider,
+    SampleRing,
+    SessionCheckpoint,
+    SettingsStore,
+    TrainingData,
+    WorkoutPlan,
+    WorkoutScheduler,
+)
 from Piloton.UI.Menus import MainMenu
-from Piloton.UI.Displays import LiveMetrics, TrainingMetrics
+from Piloton.UI.Displays import Leaderboard, LiveMetrics, MetricsStream, TrainingMetrics
+
+# Only import when type_checking
+if TYPE_CHECKING:
+    from utils import LoopLagMonitor
 
 
-class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
-    def __init__(self, data_path: str = "data/"):
+class Piloton(LoggingMixin, InfluxMixin, RichMixin, ProcessMixin):  # type: ignore
+    def __init__(
+        self,
+        data_path: str = "data/",
+        headless: bool = False,
+        event_loop: str = "asyncio",
+        influx_transport: str = "http",
+        storage_backend: str = "influx",
+        resample_interval: float = 1.0,
+        terminal_renderer: str = "rich",
+        multiprocess: bool = False,
+    ):
         """
         Initialize Piloton
 
         :param str data_path: Path to directory containing device, user, and training data
+        :param bool headless: Stream workout metrics over HTTP instead of rendering them in the terminal
+        :param str event_loop: Event loop implementation: "asyncio" or "uvloop" (if installed)
+        :param str influx_transport: How data points are written to Influx: "http" or "udp" (fire-and-forget)
+        :param str storage_backend: Where data points are stored: "influx", or "sqlite" to need no database server
+        :param float resample_interval: Seconds per combined bike and HRM data point (0: write every notification)
+        :param str terminal_renderer: How displays are drawn: "rich", or "diff" to send only changed characters
+        :param bool multiprocess: Write workout data to storage and draw the display from their own processes
         """
         # Influx members
         self.influx_host: str = "localhost"
@@ -26,6 +73,55 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
         self.influx_username: str = "root"
         self.influx_password: str = "root"
         self.influx_database: str = "piloton"
+        self.influx_batch_size: int = 5000  # Most points per write request
+        self.influx_flush_interval: float = 1.0  # Seconds between batched writes
+        self.influx_raw_retention: str = "INF"  # How long every data point is kept. Queries only read these.
+        self.influx_rollups: Dict[str, str] = {"10s": "90d", "1m": "INF"}  # Rollup interval: How long it's kept
+        self.influx_transport: str = influx_transport
+        self.influx_udp_port: int = 8089  # InfluxDB UDP listener, writing to influx_database
+        self.influx_udp_mtu: int = 1500  # Most bytes per UDP packet
+
+        # Storage members
+        self.storage_backend: str = storage_backend
+        self.sqlite_path: str = f"{data_path}piloton.sqlite"
+        self.resample_interval: float = resample_interval
+        self.resample_measurement: str = "ride"  # Measurement of combined data points
+        self.export_chunk_size: int = 10000  # Most points read from each measurement at a time when exporting
+        self.export_join_tolerance: float = 5.0  # Seconds a device's last values are joined to the other's data
+
+        # Headless streaming members
+        self.headless: bool = headless
+        self.stream_host: str = "0.0.0.0"
+        self.stream_port: int = 8765
+        self.stream_rate: float = 2.0  # Maximum pushes per second
+
+        # Display members
+        self.display_min_fps: float = 0.5  # Refresh rate when nothing changes
+        self.display_max_fps: float = 4.0
+        self.display_render_budget: float = 0.25  # Fraction of time rendering may take
+        self.render_in_thread: bool = True  # Keep rendering off the event loop
+        self.terminal_renderer: str = terminal_renderer
+
+        # Multiprocess members. Workout samples are passed to the storage and display processes in a shared ring.
+        self.multiprocess: bool = multiprocess
+        self.ring_capacity: int = 4096  # Most samples held for a process that falls behind
+        self.worker_poll_interval: float = 0.05  # Seconds between display process reads
+
+        # Settings members
+        self.settings_watch_interval: float = 1.0  # Seconds between checks for edited settings files
+
+        # Auto-pause members. Paused rides aren't written to storage, and paused time is left out of summaries.
+        self.auto_pause_delay: float = 5.0  # Seconds stopped before pausing (0: never pause)
+        self.auto_pause_cadence: int = 10  # RPM at or below which the rider counts as stopped
+        self.auto_pause_power: int = 10  # Watts at or below which the rider counts as stopped
+
+        # Power curve members
+        self.ftp_from_power_curve: bool = False  # Raise FTP when a ride's estimate beats it
+
+        # Checkpoint members. A workout's running state is saved as it goes, so a crash or reboot can resume it.
+        self.checkpoint_path: str = f"{data_path}checkpoint.json"
+        self.checkpoint_interval: float = 10.0  # Seconds between checkpoints (0: never checkpoint)
+        self.checkpoint_max_age: float = 7200.0  # Seconds after which an interrupted workout isn't offered to resume
 
         # Call to Super
         super().__init__()
@@ -38,19 +134,20 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
         self.data_path = data_path
 
         # Load Device data
-        with open(f"{self.data_path}devices.json", "r") as fh:
-            device_info = json.load(fh)
-            self.logger.info("Device Data Loaded")
+        device_info: SettingsStore = SettingsStore.open(f"{self.data_path}devices.json")
+        self.logger.info("Device Data Loaded")
 
         # Load User data
-        with open(f"{self.data_path}users.json", "r") as fh:
-            user_info = json.load(fh)
-            self.logger.info("User Data Loaded")
+        user_info: SettingsStore = SettingsStore.open(f"{self.data_path}users.json")
+        self.logger.info("User Data Loaded")
 
         # Set up our Asyncio loop and tracker
-        self._loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        self._loop: asyncio.AbstractEventLoop = self._create_event_loop(event_loop)
         self.loop_tracker: Dict[str, LoopStatus] = {}
 
+        # Measures loop lag while sessions run (e.g. when profiling), not while the loop sits stopped in menus
+        self.loop_lag_monitor: Optional["LoopLagMonitor"] = None
+
         # Set up our devices
         self.bike: Bike = Bike(device_info["bike"])
         self.hrm: HRM = HRM(device_info["hrm"])
@@ -61,11 +158,25 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
         self.heart_zones: HeartZones = HeartZones(age=user_info["age"])
         self.power_zone: PowerZone = PowerZone.NO_ZONE
         self.power_zones: PowerZones = PowerZones(ftp=user_info["ftp"])
+        self.power_curve: PowerCurve = PowerCurve()
+
+        # Set up session tags. Every data point in a workout carries its session, rider, and device.
+        self.user_name: str = user_info["name"]
+        self.session_id: str = ""
+        self.bike_tags: Dict[str, str] = {}
+        self.hrm_tags: Dict[str, str] = {}
 
-        # Set up training data
-        self.training_data: MutableMapping[int, MutableMapping[int, List[Tuple[int, float]]]] = {}
-        for resistance in range(0, 100):
-            self.training_data[resistance] = {cadence: [] for cadence in range(20, 131)}
+        # Bike and HRM samples are combined onto a grid before they're written, unless writing raw
+        self.resampler: Optional[Resampler] = None
+
+        # Breaks in the current ride
+        self.auto_pause: AutoPause = AutoPause(0.0)
+
+        # Structured workout, if one is running
+        self.workout: Optional[WorkoutScheduler] = None
+
+        # Latest metrics for displays, replaced (never mutated) by the data handlers
+        self.snapshot: MetricsSnapshot = MetricsSnapshot()
 
         # Load in training data from json
         training_data_path = f"{self.data_path}training.json"
@@ -74,40 +185,328 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
 
         if not training_data:
             # Write default data to json
+            self.training_data: TrainingData = TrainingData()
             with open(f"{self.data_path}training.json", "w+") as fh:
-                json.dump(self.training_data, fh, indent=4)
+                json.dump(self.training_data.to_json(), fh, indent=4)
         else:
             # Load in values
-            for resistance in range(0, 100):
-                for cadence in range(20, 131):
-                    self.training_data[resistance][cadence] = training_data[str(resistance)][str(cadence)]
+            self.training_data = TrainingData.from_json(training_data)
+
+        # Learns from training sessions as they happen, to show how well each resistance is covered
+        self.online_learner: Optional[OnlineLearner] = None
+
+        # Samples per cadence at the resistance being trained. Swapped in like snapshot, for the training display.
+        self.training_counts: Dict[int, int] = {}
+
+        # Set up studio riders
+        self.riders: List[Rider] = self.load_riders()
+
+        # Apply only the settings that change, whether from a form or an edited file
+        self.device_settings: SettingsStore = device_info
+        self.device_settings.subscribe("bike", partial(self._rename_device, self.bike))
+        self.device_settings.subscribe("hrm", partial(self._rename_device, self.hrm))
+        self.user_settings: SettingsStore = user_info
+        self.user_settings.subscribe("name", self._update_user_name)
+        self.user_settings.subscribe("age", self._update_age)
+        self.user_settings.subscribe("ftp", self._update_ftp)
+        self.device_settings.watch(self.settings_watch_interval)
+        self.user_settings.watch(self.settings_watch_interval)
 
         # Attach signal handlers
         signal.signal(signal.SIGTERM, self.stop)
         signal.signal(signal.SIGINT, self.stop)
 
+    def _create_event_loop(self, event_loop: str) -> asyncio.AbstractEventLoop:
+        """
+        Create the event loop Piloton runs on, falling back to asyncio's if the requested one is unavailable
+
+        :param str event_loop: Event loop implementation: "asyncio" or "uvloop"
+        :return: Event loop
+        :rtype: asyncio.AbstractEventLoop
+        """
+        if event_loop == "uvloop":
+            try:
+                import uvloop
+            except ImportError:
+                self.logger.warning("uvloop is not installed. Using the asyncio event loop.")
+            else:
+                loop: asyncio.AbstractEventLoop = uvloop.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self.logger.info("Using the uvloop event loop")
+                return loop
+        elif event_loop != "asyncio":
+            self.logger.warning("Unknown event loop (%s). Using the asyncio event loop.", event_loop)
+
+        return asyncio.get_event_loop()
+
+    def load_riders(self) -> List[Rider]:
+        """
+        Load studio riders from riders.json, if present. Riders without their own training file share Piloton's.
+
+        :return: Studio riders
+        :rtype: List[Rider]
+        """
+        riders_path = f"{self.data_path}riders.json"
+        if not os.path.exists(riders_path):
+            return []
+
+        with open(riders_path, "r") as fh:
+            rider_info = json.load(fh)
+
+        # Riders with the same training file share the training data
+        training_data: Dict[str, TrainingData] = {}
+        riders: List[Rider] = []
+        for info in rider_info:
+            training_file: Optional[str] = info.get("training")
+            if training_file and training_file not in training_data:
+                with open(f"{self.data_path}{training_file}", "r") as fh:
+                    training_data[training_file] = TrainingData.from_json(json.load(fh))
+
+            riders.append(
+                Rider(
+                    name=info["name"],
+                    bike=Bike(info["bike"]),
+                    hrm=HRM(info["hrm"]),
+                    heart_zones=HeartZones(age=info["age"]),
+                    power_zones=PowerZones(ftp=info["ftp"]),
+                    training_data=training_data[training_file] if training_file else self.training_data,
+                )
+            )
+
+        self.logger.info("Rider Data Loaded (%d riders)", len(riders))
+        return riders
+
     def update(self) -> None:
         """
-        Update User and Device data from json
+        Update User and Device data from json, applying only the settings that changed
         """
-        # Load Device data
-        with open(f"{self.data_path}devices.json", "r") as fh:
-            device_info = json.load(fh)
-            self.logger.info("Device Data Loaded")
+        self.device_settings.reload()
+        self.user_settings.reload()
 
-        # Load User data
-        with open(f"{self.data_path}users.json", "r") as fh:
-            user_info = json.load(fh)
-            self.logger.info("User Data Loaded")
+    def list_workout_plans(self) -> List[str]:
+        """
+        List structured workouts in the workouts directory
 
-        # Set up our devices
-        self.bike = Bike(device_info["bike"])
-        self.hrm = HRM(device_info["hrm"])
-        self.devices = [self.bike, self.hrm]
+        :return: Workout file names, without extension
+        :rtype: List[str]
+        """
+        workouts_path = f"{self.data_path}workouts/"
+        if not os.path.exists(workouts_path):
+            return []
+        return sorted(file[: -len(".json")] for file in os.listdir(workouts_path) if file.endswith(".json"))
 
-        # Set up performance metrics
-        self.heart_zones = HeartZones(age=user_info["age"])
-        self.power_zones = PowerZones(ftp=user_info["ftp"])
+    def load_workout_plan(self, name: str) -> WorkoutPlan:
+        """
+        Load a structured workout from the workouts directory
+
+        :param str name: Workout file name, without extension
+        :return: Workout plan
+        :rtype: WorkoutPlan
+        """
+        with open(f"{self.data_path}workouts/{name}.json", "r") as fh:
+            return WorkoutPlan.from_json(json.load(fh))
+
+    async def run_workout_plan(self):
+        """
+        Structured workout loop. Sleeps until each step transition, measured from the start on the monotonic clock,
+        and ends the workout after the last step or on signal interrupt.
+        """
+        # Get function name
+        func_name = "_run_workout_plan"
+
+        # Set status to active
+        self.loop_tracker[func_name] = LoopStatus.ACTIVE
+
+        # Workouts are started before their processes fork, or are already running when resumed
+        workout: WorkoutScheduler = self.workout
+        if workout.started is None:
+            workout.start(time.monotonic())
+        self.logger.info("Starting structured workout: %s (%d steps)", workout.plan.name, len(workout.plan))
+
+        index: int = -1
+        while self.loop_tracker[func_name] == LoopStatus.ACTIVE:
+            now: float = time.monotonic()
+            transition: Optional[float] = workout.next_transition(now)
+            if transition is None:
+                self.logger.info("Structured workout complete!")
+                self.stop()
+                break
+
+            # Announce each new step
+            if workout.step_index(now) != index:
+                index = workout.step_index(now)
+                step = workout.plan.steps[index]
+                self.logger.info("Step %d/%d: %s (%d s)", index + 1, len(workout.plan), step.name, step.duration)
+
+            # Wake for the transition, or sooner to notice Ctrl+C
+            await asyncio.sleep(min(transition - now, 0.5))
+
+        for index, step in enumerate(workout.plan.steps):
+            if workout.samples[index]:
+                self.logger.info("%s: %.0f%% on target", step.name, workout.compliance(index) * 100)
+
+    async def checkpoint_session(self, started: float):
+        """
+        Checkpoint loop. Saves the workout's running state every checkpoint interval, writing off the event loop so
+        a slow SD card doesn't hold up notifications.
+
+        :param float started: Monotonic time the session started at, moved back by any resumed time
+        """
+        # Get function name
+        func_name = "_checkpoint_session"
+
+        # Set status to active
+        self.loop_tracker[func_name] = LoopStatus.ACTIVE
+
+        due: float = time.monotonic() + self.checkpoint_interval
+        while self.loop_tracker[func_name] == LoopStatus.ACTIVE:
+            now: float = time.monotonic()
+            if now < due:
+                # Wake for the checkpoint, or sooner to notice Ctrl+C
+                await asyncio.sleep(min(due - now, 0.5))
+                continue
+
+            due = now + self.checkpoint_interval
+            checkpoint = SessionCheckpoint.capture(
+                self.session_id,
+                self.user_name,
+                started,
+                now,
+                self.auto_pause,
+                self.power_curve,
+                [self.bike, self.hrm],
+                self.workout,
+            )
+            try:
+                await self._loop.run_in_executor(None, checkpoint.save, self.checkpoint_path)
+            except OSError as error:
+                self.logger.warning("Unable to save checkpoint (%s): %s", self.checkpoint_path, error)
+
+    def load_checkpoint(self) -> Optional[SessionCheckpoint]:
+        """
+        Find a workout that was interrupted by a crash or reboot. Checkpoints that are unreadable, too old, or
+        another rider's are discarded.
+
+        :return: Checkpoint to resume, if there is one
+        :rtype: Optional[SessionCheckpoint]
+        """
+        try:
+            checkpoint: Optional[SessionCheckpoint] = SessionCheckpoint.load(self.checkpoint_path)
+        except ValueError as error:
+            self.logger.warning("Discarding checkpoint (%s): %s", self.checkpoint_path, error)
+            self.discard_checkpoint()
+            return None
+
+        if checkpoint is None:
+            return None
+        if time.time() - checkpoint.saved > self.checkpoint_max_age or checkpoint.rider != self.user_name:
+            self.logger.info("Discarding stale checkpoint for session (%s)", checkpoint.session_id)
+            self.discard_checkpoint()
+            return None
+        return checkpoint
+
+    def discard_checkpoint(self) -> None:
+        """
+        Delete the checkpoint, once its workout has ended or won't be resumed
+        """
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+    def resume_workout(self, checkpoint: SessionCheckpoint):
+        """
+        Resume an interrupted workout
+
+        :param SessionCheckpoint checkpoint: Interrupted workout's checkpoint
+        """
+        self.bike.training = False
+        return self.start_workout(checkpoint=checkpoint)
+
+    def save_power_curve(self, rider: str, session_id: str, power_curve: PowerCurve) -> PowerCurve:
+        """
+        Save a session's power curve and merge it into the rider's all-time curve
+
+        :param str rider: Rider name
+        :param str session_id: Session ID
+        :param PowerCurve power_curve: Session power curve
+        :return: Rider's all-time power curve
+        :rtype: PowerCurve
+        """
+        power_curve_path = f"{self.data_path}power_curves/"
+        os.makedirs(power_curve_path, exist_ok=True)
+
+        # Save session curve
+        with open(f"{power_curve_path}{session_id}.json", "w") as fh:
+            json.dump({"rider": rider, "power_curve": power_curve.to_json()}, fh, indent=4)
+
+        # Load all-time curves, by rider
+        all_time_path = f"{power_curve_path}all_time.json"
+        all_time: Dict[str, Dict[str, float]] = {}
+        if os.path.exists(all_time_path):
+            with open(all_time_path, "r") as fh:
+                all_time = json.load(fh)
+
+        # Merge and save all-time curve
+        all_time_curve: PowerCurve = PowerCurve.from_json(all_time.get(rider, {}))
+        all_time_curve.merge(power_curve)
+        all_time[rider] = all_time_curve.to_json()
+        with open(all_time_path, "w") as fh:
+            json.dump(all_time, fh, indent=4)
+
+        return all_time_curve
+
+    def _finish_power_curve(self) -> None:
+        """
+        Save the workout's power curve and, if enabled, raise FTP to the curve's estimate
+        """
+        self.power_curve.finish()
+        if not self.power_curve:
+            return
+
+        self.save_power_curve(self.user_name, self.session_id, self.power_curve)
+        ftp_estimate: Optional[int] = self.power_curve.ftp_estimate()
+        if ftp_estimate is None:
+            return
+
+        self.logger.info("FTP estimate: %d W (current: %d W)", ftp_estimate, self.power_zones.ftp)
+        if self.ftp_from_power_curve and ftp_estimate > self.power_zones.ftp:
+            self.user_settings.set("ftp", ftp_estimate)
+
+    def _rename_device(self, device: Device, name: str) -> None:
+        """
+        Rename a device. Only its BLE address is stale; its trained classifier is kept.
+
+        :param Device device: Renamed device
+        :param str name: New Bluetooth searchable name
+        """
+        self.logger.info("Device renamed: %s -> %s", device.name, name)
+        device.name = name
+        device.ble_address = ""
+
+    def _update_user_name(self, name: str) -> None:
+        """
+        Update user name for new sessions
+
+        :param str name: User name
+        """
+        self.user_name = name
+
+    def _update_age(self, age: int) -> None:
+        """
+        Recompute heart zones from age
+
+        :param int age: User age
+        """
+        self.heart_zones = HeartZones(age=age)
+
+    def _update_ftp(self, ftp: int) -> None:
+        """
+        Recompute power zones from FTP
+
+        :param int ftp: User Functional Threshold Power (FTP)
+        """
+        self.power_zones = PowerZones(ftp=ftp)
 
     def stop(self, *args, **kwargs) -> None:
         """
@@ -127,6 +526,31 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
             if value != LoopStatus.INACTIVE:
                 self.loop_tracker[loop] = LoopStatus.INACTIVE
 
+    def _run_tasks(self, *coroutines: Coroutine, return_exceptions: bool = False) -> List[Any]:
+        """
+        Run coroutines together until they're all done. If one fails, the others are stopped and waited for, so no
+        display thread is left rendering.
+
+        :param Coroutine coroutines: Coroutines to run
+        :param bool return_exceptions: Return exceptions as results, instead of raising the first
+        :return: Results, in order
+        :rtype: List[Any]
+        """
+        tasks: List[asyncio.Task] = [self._loop.create_task(coroutine) for coroutine in coroutines]
+        if self.loop_lag_monitor is not None:
+            self.loop_lag_monitor.start(self._loop)
+        try:
+            return self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=return_exceptions))
+        finally:
+            self.stop()
+            if self.loop_lag_monitor is not None:
+                self.loop_lag_monitor.stop()
+            pending: List[asyncio.Task] = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
     def scan_for_devices(self) -> bool:
         """
         Scan for devices
@@ -144,6 +568,107 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
 
         return True
 
+    def _update_snapshot(self) -> None:
+        """
+        Swap in a new snapshot of the latest metrics. Displays on other threads see either the old or the new one.
+        """
+        self.snapshot = MetricsSnapshot(
+            cadence=self.bike.cadence,
+            resistance=self.bike.resistance,
+            power=self.bike.power,
+            speed=self.bike.speed,
+            heart_rate=self.hrm.heart_rate,
+            rmssd=self.hrm.hrv.rmssd,
+            heart_zone=self.heart_zone,
+            power_zone=self.power_zone,
+            paused=self.auto_pause.paused,
+        )
+
+    def simulate_devices(self, rate: float = 0.0) -> None:
+        """
+        Replace BLE connections with simulated notifications, e.g. for benchmarks and profiling without hardware
+
+        :param float rate: Notifications per second per device (0: device default)
+        """
+        for device in self.devices + [device for rider in self.riders for device in rider.devices]:
+            device.client_class = partial(SimulatedClient, rate=rate)
+            device.ble_address = "SIMULATED"
+
+    def _create_resampler(self, session_id: str, rider: str) -> Optional[Resampler]:
+        """
+        Create a resampler combining a session's bike and HRM samples, unless writing every notification raw
+
+        :param str session_id: Session ID
+        :param str rider: Rider name
+        :return: Resampler, or None if resample_interval is 0
+        :rtype: Optional[Resampler]
+        """
+        if self.resample_interval <= 0:
+            return None
+
+        tags: Dict[str, str] = {"session": session_id, "rider": rider}
+        return Resampler(self.resample_interval, self.resample_measurement, tags)
+
+    def _create_auto_pause(self) -> AutoPause:
+        """
+        Create a pause detector for a new ride
+
+        :return: Auto Pause
+        :rtype: AutoPause
+        """
+        return AutoPause(self.auto_pause_delay, self.auto_pause_cadence, self.auto_pause_power)
+
+    @staticmethod
+    def _write_sample(
+        write: Callable,
+        resampler: Optional[Resampler],
+        measurement: str,
+        tags: Dict[str, str],
+        fields: Dict,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Write a sample as its own data point, or fold it into its resampler interval, writing the combined data
+        point of the interval it finishes
+
+        :param Callable write: write_data_point or queue_data_point
+        :param Optional[Resampler] resampler: Resampler, or None to write the sample raw
+        :param str measurement: Measurement of the raw data point
+        :param Dict[str, str] tags: Tags of the raw data point
+        :param Dict fields: Sample's fields
+        :param Optional[float] timestamp: Seconds since the epoch the sample arrived at (default: now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+
+        # Raw points keep microseconds, so several a second don't overwrite each other
+        if resampler is None:
+            write(
+                measurement=measurement,
+                tags=tags,
+                time=datetime.utcfromtimestamp(timestamp).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                fields=fields,
+            )
+            return
+
+        point: Optional[Dict] = resampler.add(fields, timestamp)
+        if point is not None:
+            write(**point)
+
+    def _flush_resampler(self, resampler: Optional[Resampler]) -> None:
+        """
+        Write the combined data point of the last, unfinished interval, at the end of a session
+
+        :param Optional[Resampler] resampler: Session's resampler, if any
+        """
+        point: Optional[Dict] = resampler.flush() if resampler is not None else None
+        if point is None:
+            return
+
+        try:
+            self.write_data_point(**point)
+        except Exception:
+            self.logger.exception("Unable to write last data point for session (%s)", point["tags"]["session"])
+
     def __indoor_bike_data_training_handler(self, sender, data):
         """
         When training, update the bike data and write bike data to Piloton's training data.
@@ -155,10 +680,14 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
         # Update Bike with Data
         self.bike.update(data)
 
-        # To somewhat curb overfitting, there's a hard limit of 25 samples per resistance-cadence.
+        # Training data drops samples beyond its per resistance-cadence limit. The online learner takes them all.
         if self.bike.cadence > 20:
-            if len(self.training_data[self.bike.resistance][self.bike.cadence]) < 26:
-                self.training_data[self.bike.resistance][self.bike.cadence].append((self.bike.power, self.bike.speed))
+            if self.training_data.append(self.bike.resistance, self.bike.cadence, self.bike.power, self.bike.speed):
+                self.training_counts = self.training_data.cadence_counts(self.bike.resistance)
+            if self.online_learner is not None:
+                self.online_learner.add(self.bike.resistance, self.bike.cadence, self.bike.power, self.bike.speed)
+
+        self._update_snapshot()
 
     def __indoor_bike_data_workout_handler(self, sender, data):
         """
@@ -170,23 +699,33 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
         """
         # Update Bike with data
         self.bike.update(data)
+        now: float = time.monotonic()
 
-        # Calculate Power Zone
+        # Calculate Power Zone. While paused, only the display is kept up to date.
         self.power_zone = self.power_zones.calculate_power_zone(self.bike.power)
+        if self.auto_pause.update(self.bike.cadence, self.bike.power, now):
+            self._update_snapshot()
+            self.share_sample(SampleRing.BIKE)
+            return
+
+        # Calculate best efforts on the moving clock, so breaks don't count as 0 W
+        self.power_curve.record(self.bike.power, self.auto_pause.moving_time(now))
+        if self.workout is not None:
+            self.workout.record(self.bike.power, now, self.power_zones.ftp)
+        self._update_snapshot()
+        self.share_sample(SampleRing.BIKE)
 
-        # Write data point to Influx
+        # Write data point to storage, or combine it with this interval's, unless the storage process does
+        if self.ring is not None:
+            return
         fields: Dict = {
             "speed": self.bike.speed,
             "cadence": self.bike.cadence,
             "power": self.bike.power,
+            "resistance": self.bike.resistance,
             "power_zone": self.power_zone.value,
         }
-        self.write_data_point(
-            measurement="indoor_bike_data",
-            tags={},
-            time=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            fields=fields,
-        )
+        self._write_sample(self.write_data_point, self.resampler, "indoor_bike_data", self.bike_tags, fields)
 
     def __hrm_data_workout_handler(self, sender, data):
         """
@@ -201,15 +740,73 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
 
         # Calculate Heart Zone
         self.heart_zone = self.heart_zones.calculate_heart_zone(self.hrm.heart_rate)
+        self._update_snapshot()
+        self.share_sample(SampleRing.HRM)
+        if self.auto_pause.paused or self.ring is not None:
+            return
 
-        # Write data point to Influx
+        # Write data point to storage, or combine it with this interval's, with HRV once there are RR-intervals
         fields: Dict = {"heart_rate": self.hrm.heart_rate, "zone": self.heart_zone.value}
-        self.write_data_point(
-            measurement="heart_rate_monitor",
-            tags={},
-            time=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-            fields=fields,
-        )
+        if len(self.hrm.hrv) > 1:
+            fields.update(rmssd=self.hrm.hrv.rmssd, sdnn=self.hrm.hrv.sdnn)
+        self._write_sample(self.write_data_point, self.resampler, "heart_rate_monitor", self.hrm_tags, fields)
+
+    def __studio_bike_data_handler(self, rider: Rider, sender, data):
+        """
+        In studio mode, update the rider's bike data and queue it for InfluxDB
+
+        :param Rider rider: Rider the bike belongs to
+        :param sender: [Unused] Data sender
+        :param data: Data
+        :return: None
+        """
+        # Update Bike with data
+        rider.bike.update(data)
+        now: float = time.monotonic()
+
+        # Calculate Power Zone. While paused, only the leaderboard is kept up to date.
+        rider.power_zone = rider.power_zones.calculate_power_zone(rider.bike.power)
+        if rider.auto_pause.update(rider.bike.cadence, rider.bike.power, now):
+            rider.update_snapshot()
+            return
+
+        # Calculate best efforts on the moving clock
+        rider.power_curve.record(rider.bike.power, rider.auto_pause.moving_time(now))
+        rider.update_snapshot()
+
+        # Queue data point for the next batch, or combine it with this interval's
+        fields: Dict = {
+            "speed": rider.bike.speed,
+            "cadence": rider.bike.cadence,
+            "power": rider.bike.power,
+            "resistance": rider.bike.resistance,
+            "power_zone": rider.power_zone.value,
+        }
+        self._write_sample(self.queue_data_point, rider.resampler, "indoor_bike_data", rider.bike_tags, fields)
+
+    def __studio_hrm_data_handler(self, rider: Rider, sender, data):
+        """
+        In studio mode, update the rider's hrm data and queue it for InfluxDB
+
+        :param Rider rider: Rider the HRM belongs to
+        :param sender: [Unused] Data sender
+        :param data: Data
+        :return: None
+        """
+        # Update HRM with data
+        rider.hrm.update(data)
+
+        # Calculate Heart Zone
+        rider.heart_zone = rider.heart_zones.calculate_heart_zone(rider.hrm.heart_rate)
+        rider.update_snapshot()
+        if rider.auto_pause.paused:
+            return
+
+        # Queue data point for the next batch, or combine it with this interval's, with HRV once there are RR-intervals
+        fields: Dict = {"heart_rate": rider.hrm.heart_rate, "zone": rider.heart_zone.value}
+        if len(rider.hrm.hrv) > 1:
+            fields.update(rmssd=rider.hrm.hrv.rmssd, sdnn=rider.hrm.hrv.sdnn)
+        self._write_sample(self.queue_data_point, rider.resampler, "heart_rate_monitor", rider.hrm_tags, fields)
 
     def poll_indoor_bike_data(self):
         """
@@ -223,13 +820,22 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
         """
         return self._loop.run_until_complete(self.hrm.poll_device(self.__hrm_data_workout_handler))
 
-    def start_workout(self):
+    def start_workout(self, plan: Optional[WorkoutPlan] = None, checkpoint: Optional[SessionCheckpoint] = None):
         """
-        Start Workout of length. If no length, run until Ctrl+C
+        Start Workout of length. If no length, run until Ctrl+C. When headless, metrics are streamed instead of
+        rendered.
+
+        :param Optional[WorkoutPlan] plan: Structured workout to follow, ending the workout after its last step
+        :param Optional[SessionCheckpoint] checkpoint: Interrupted workout to resume, instead of starting a new one
         """
         # Train bike on training data
         self.bike.train(self.training_data)
 
+        # Reconnect to the devices an interrupted workout was using, rather than scanning
+        if checkpoint is not None:
+            for device in (self.bike, self.hrm):
+                device.ble_address = device.ble_address or checkpoint.addresses.get(device.name, "")
+
         # Scan for devices
         if not self.bike.ble_address or not self.hrm.ble_address:
             self.logger.info("Scanning for devices before training.")
@@ -237,15 +843,128 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
 
             self.scan_for_devices()
 
-        self.logger.info("Beginning workout!")
-        tasks = asyncio.gather(
-            *(
-                self.bike.poll_device(self.__indoor_bike_data_workout_handler),
-                self.hrm.poll_device(self.__hrm_data_workout_handler),
-                LiveMetrics(self).live_output(),
-            )
-        )
-        return self._loop.run_until_complete(tasks)
+        # Tag every data point with this session, carrying on an interrupted one's
+        self.session_id = uuid.uuid4().hex if checkpoint is None else checkpoint.session_id
+        self.power_curve = PowerCurve() if checkpoint is None else checkpoint.power_curve()
+        self.hrm.hrv.clear()
+        self.bike_tags = {"session": self.session_id, "rider": self.user_name, "device": self.bike.name}
+        self.hrm_tags = {"session": self.session_id, "rider": self.user_name, "device": self.hrm.name}
+        self.resampler = self._create_resampler(self.session_id, self.user_name)
+        self.auto_pause = self._create_auto_pause()
+        self.workout = WorkoutScheduler(plan) if plan is not None else None
+
+        # Time Piloton wasn't running isn't counted, so the session clock carries on from the checkpoint
+        started: float = time.monotonic()
+        if checkpoint is not None:
+            started -= checkpoint.elapsed
+            self.auto_pause.resume(checkpoint.paused, checkpoint.pauses)
+            self.workout = checkpoint.workout(time.monotonic())
+
+        # Start the structured workout's clock now, so processes forked below share it
+        if self.workout is not None and self.workout.started is None:
+            self.workout.start(time.monotonic())
+
+        # In multiprocess mode, storage writes and the display run in their own processes
+        self.logger.info("%s workout! Session: %s", "Resuming" if checkpoint else "Beginning", self.session_id)
+        display = MetricsStream(self) if self.headless else LiveMetrics(self)
+        workers: bool = self.multiprocess and self.start_workers(display)
+        tasks: List[Coroutine] = [
+            self.bike.poll_device(self.__indoor_bike_data_workout_handler),
+            self.hrm.poll_device(self.__hrm_data_workout_handler),
+            *([display.live_output()] if not workers else []),
+            *([self.run_workout_plan()] if self.workout is not None else []),
+            *([self.checkpoint_session(started)] if self.checkpoint_interval > 0 else []),
+        ]
+
+        event: str = "start" if checkpoint is None else "resume"
+        self.write_session_event(self.session_id, self.user_name, event, time.monotonic() - started)
+        try:
+            result = self._run_tasks(*tasks)
+
+            # Only a workout that ended cleanly is done with its checkpoint
+            self.discard_checkpoint()
+            return result
+        finally:
+            now: float = time.monotonic()
+            self.stop_workers()
+            self._flush_resampler(self.resampler)
+            paused: float = self.auto_pause.paused_time(now)
+            self.write_session_event(self.session_id, self.user_name, "stop", now - started, paused)
+            moving: float = now - started - paused
+            pauses: int = self.auto_pause.pauses
+            self.logger.info("Workout over: %.0f s moving, %.0f s paused (%d pauses)", moving, paused, pauses)
+            self.storage.flush()
+            self._finish_power_curve()
+            self.workout = None
+
+    def start_studio(self):
+        """
+        Start a studio session: every rider's bike and HRM polled on one loop, until Ctrl+C
+        """
+        if not self.riders:
+            self.logger.warning("No riders found in %sriders.json. Unable to start studio.", self.data_path)
+            return
+
+        # Train each rider's bike, sharing models between riders with the same training data
+        trained: Dict[int, Bike] = {}
+        for rider in self.riders:
+            if id(rider.training_data) in trained:
+                rider.bike.classifier = trained[id(rider.training_data)].classifier
+                rider.bike.trained = True
+            else:
+                rider.bike.train(rider.training_data)
+                trained[id(rider.training_data)] = rider.bike
+
+        # Scan once for every device that doesn't have an address yet
+        self.devices = [device for rider in self.riders for device in rider.devices]
+        unscanned: List[Device] = [device for device in self.devices if not device.ble_address]
+        if unscanned:
+            self.logger.info("Scanning for (%d) devices before studio.", len(unscanned))
+            self._loop.run_until_complete(Device.scan_all(unscanned))
+
+        # Riders whose devices weren't found sit this one out
+        riders: List[Rider] = []
+        for rider in self.riders:
+            if all(device.ble_address for device in rider.devices):
+                riders.append(rider)
+            else:
+                self.logger.warning("Unable to find devices for rider (%s). Skipping.", rider.name)
+
+        # Each rider's ride is its own session
+        for rider in riders:
+            rider.start_session()
+            rider.resampler = self._create_resampler(rider.session_id, rider.name)
+            rider.auto_pause = self._create_auto_pause()
+            self.write_session_event(rider.session_id, rider.name, "start")
+
+        self.logger.info("Beginning studio with (%d) riders!", len(riders))
+        tasks: List[Coroutine] = [
+            *(rider.bike.poll_device(partial(self.__studio_bike_data_handler, rider)) for rider in riders),
+            *(rider.hrm.poll_device(partial(self.__studio_hrm_data_handler, rider)) for rider in riders),
+            Leaderboard(self, riders).live_output(),
+            self.write_queued_points(),
+        ]
+        started: float = time.monotonic()
+        try:
+            # One rider's dropped connection shouldn't end everyone's ride
+            results = self._run_tasks(*tasks, return_exceptions=True)
+        finally:
+            self.devices = [self.bike, self.hrm]
+            for rider in riders:
+                self._flush_resampler(rider.resampler)
+                now: float = time.monotonic()
+                paused: float = rider.auto_pause.paused_time(now)
+                self.write_session_event(rider.session_id, rider.name, "stop", now - started, paused)
+                rider.power_curve.finish()
+                if rider.power_curve:
+                    self.save_power_curve(rider.name, rider.session_id, rider.power_curve)
+            self.storage.flush()
+
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("Studio task failed: %r", result)
+
+        return results
 
     def start_training(self, resistance: int):
         """
@@ -261,19 +980,32 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
             self.devices = [self.bike]
             self.scan_for_devices()
 
+        # Seed the online learner with what's been collected so far
+        self.online_learner = OnlineLearner(self.training_data)
+
         self.logger.info("Beginning training!")
-        tasks = asyncio.gather(
-            *(
-                self.bike.poll_device(self.__indoor_bike_data_training_handler),
-                TrainingMetrics(self, resistance).live_output(),
-            )
+        return self._run_tasks(
+            self.bike.poll_device(self.__indoor_bike_data_training_handler),
+            TrainingMetrics(self, resistance).live_output(),
         )
-        return self._loop.run_until_complete(tasks)
 
     def app(self):
         """
         Main Piloton app loop
         """
+        # Offer to pick up a workout that was interrupted by a crash or reboot
+        checkpoint: Optional[SessionCheckpoint] = self.load_checkpoint()
+        if checkpoint is not None:
+            minutes: float = checkpoint.elapsed / 60
+            saved: str = datetime.fromtimestamp(checkpoint.saved).strftime("%H:%M")
+            if Confirm.ask(f"Resume workout interrupted at {saved} ({minutes:.0f} min in)?", default=True):
+                self.resume_workout(checkpoint)
+            else:
+                self.discard_checkpoint()
+
+        # Forms read workout plans and the like from this Piloton
+        Form.piloton = self
+
         active: bool = True
         current_view = MainMenu
         last_menu = MainMenu
@@ -294,6 +1026,7 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
                 current_view = current_view.handle_selection(selection)
                 if current_view is None:
                     self.logger.info("Quitting Piloton")
+                    self.storage.close()
                     active = False
 
             # Render "Form"
@@ -301,10 +1034,17 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
                 response = self.render_form(current_view)
                 if response is None:
                     current_view = last_menu
+                elif "workout_plan" in response:
+                    self.bike.training = False
+                    self.start_workout(self.load_workout_plan(response[1]))
+                    current_view = MainMenu
                 elif "workout" in response:
                     self.bike.training = False
                     self.start_workout()  # Live view will override here
                     current_view = MainMenu
+                elif "studio" in response:
+                    self.start_studio()
+                    current_view = MainMenu
                 elif "training" in response:
                     self.bike.training = True
                     self.start_training(response[1])
@@ -312,6 +1052,6 @@ class Piloton(LoggingMixin, InfluxMixin, RichMixin):  # type: ignore
 
                     # Save training data to json data
                     with open(f"{self.data_path}training.json", "w+") as fh:
-                        json.dump(self.training_data, fh, indent=4)
+                        json.dump(self.training_data.to_json(), fh, indent=4)
                 elif response is not None:
                     current_view = response()
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import time
+from functools import partial
+from typing import AsyncIterator, List, Optional
+
+from Piloton.Devices import Bike, HRM, SimulatedClient
+from Piloton.Mixins import LoggingMixin
+from Piloton.Types import BikeSample, Device, HeartRateSample, LoopStatus, Sample, SettingsStore, TrainingData
+
+
+class PilotonSession(LoggingMixin):  # type: ignore
+    """
+    Headless, async access to a bike and heart rate monitor, for embedding Piloton in another service. Runs on the
+    caller's event loop and never touches the terminal:
+
+        async with PilotonSession("IC Bike", "CL831-0318513") as session:
+            async for sample in session.samples():
+                ...
+
+    Each notification becomes a BikeSample or HeartRateSample. Every samples() iterator has its own bounded queue;
+    a consumer that falls behind loses its oldest samples (counted in dropped) rather than holding up the devices
+    or other consumers.
+    """
+
+    def __init__(
+        self,
+        bike: str,
+        hrm: Optional[str] = None,
+        training_data: Optional[TrainingData] = None,
+        simulate: bool = False,
+        rate: float = 0.0,
+        queue_size: int = 1024,
+    ):
+        """
+        Initialize Piloton Session
+
+        :param str bike: Bike name, as it advertises over BLE
+        :param Optional[str] hrm: Heart rate monitor name, if any
+        :param Optional[TrainingData] training_data: Training data to predict resistance with (default: no resistance)
+        :param bool simulate: Generate notifications instead of connecting over BLE
+        :param float rate: Simulated notifications per second per device (0: device default)
+        :param int queue_size: Most samples held for each consumer
+        """
+        # Call to Super
+        super().__init__()
+
+        self.bike: Bike = Bike(bike)
+        self.hrm: Optional[HRM] = HRM(hrm) if hrm else None
+        self.devices: List[Device] = [self.bike] + ([self.hrm] if self.hrm is not None else [])
+        self.training_data: Optional[TrainingData] = training_data
+        self.queue_size: int = queue_size
+        self.dropped: int = 0  # Samples consumers fell too far behind to receive
+
+        if simulate:
+            for device in self.devices:
+                device.client_class = partial(SimulatedClient, rate=rate)
+                device.ble_address = "SIMULATED"
+
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Future] = []
+        self._error: Optional[BaseException] = None
+        self._closed: bool = False
+
+    @classmethod
+    def from_data_path(cls, data_path: str = "data/", **kwargs) -> "PilotonSession":
+        """
+        Set up a session with the devices and training data Piloton is configured with
+
+        :param str data_path: Path to directory containing device and training data
+        :param kwargs: Other PilotonSession arguments
+        :return: Piloton Session
+        :rtype: PilotonSession
+        """
+        devices: SettingsStore = SettingsStore.open(f"{data_path}devices.json")
+        with open(f"{data_path}training.json", "r") as fh:
+            training_data: TrainingData = TrainingData.from_json(json.load(fh) or {})
+
+        return cls(devices["bike"], devices.get("hrm"), training_data=training_data, **kwargs)
+
+    async def __aenter__(self) -> "PilotonSession":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Train the bike, find devices that don't have an address yet, and start polling them
+
+        :raises ConnectionError: If a device can't be found
+        """
+        # A session can be started again after it's closed
+        self._closed, self._error = False, None
+
+        if self.training_data is not None and len(self.training_data):
+            self.bike.train(self.training_data)
+
+        unscanned: List[Device] = [device for device in self.devices if not device.ble_address]
+        if unscanned:
+            await Device.scan_all(unscanned)
+        for device in self.devices:
+            if not device.ble_address:
+                raise ConnectionError(f"Unable to find device ({device.name})")
+
+        self._tasks = [asyncio.ensure_future(self.bike.poll_device(self._bike_handler))]
+        if self.hrm is not None:
+            self._tasks.append(asyncio.ensure_future(self.hrm.poll_device(self._hrm_handler)))
+        for task in self._tasks:
+            task.add_done_callback(self._task_done)
+
+    async def close(self, timeout: float = 2.0) -> None:
+        """
+        Stop polling devices and end every samples() iterator
+
+        :param float timeout: Seconds to wait for devices to disconnect before cancelling them
+        """
+        for device in self.devices:
+            device.loop_status = LoopStatus.INACTIVE
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            self._tasks = []
+
+        self._closed = True
+        self._end_queues()
+
+    async def samples(self) -> AsyncIterator[Sample]:
+        """
+        Iterate over samples from the bike and heart rate monitor as they arrive, from when iteration starts until
+        the session closes
+
+        :return: Samples, oldest first
+        :raises Exception: Whatever stopped a device, if one failed
+        """
+        # Iteration that starts after the session closed or a device failed would never be ended
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._queues.append(queue)
+        try:
+            while True:
+                sample: Optional[Sample] = await queue.get()
+                if sample is None:
+                    break
+                yield sample
+        finally:
+            self._queues.remove(queue)
+
+        if self._error is not None:
+            raise self._error
+
+    def _publish(self, sample: Optional[Sample]) -> None:
+        """
+        Hand a sample to every consumer, dropping a consumer's oldest sample if its queue is full
+
+        :param Optional[Sample] sample: Sample, or None to end iteration
+        """
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(sample)
+
+    def _end_queues(self) -> None:
+        """
+        End every samples() iterator
+        """
+        self._publish(None)
+
+    def _task_done(self, task: asyncio.Future) -> None:
+        """
+        End iteration if a device fails, so consumers see the error instead of waiting forever
+
+        :param asyncio.Future task: Device polling task
+        """
+        if task.cancelled() or task.exception() is None:
+            return
+
+        self._error = task.exception()
+        self.logger.error("Device failed: %r", self._error)
+        self._end_queues()
+
+    def _bike_handler(self, sender, data) -> None:
+        """
+        Update the bike and publish a sample
+
+        :param sender: [Unused] Data sender
+        :param data: Data
+        """
+        bike: Bike = self.bike
+        bike.update(data)
+        self._publish(BikeSample(time.time(), bike.cadence, bike.power, bike.speed, bike.resistance))
+
+    def _hrm_handler(self, sender, data) -> None:
+        """
+        Update the heart rate monitor and publish a sample
+
+        :param sender: [Unused] Data sender
+        :param data: Data
+        """
+        # Only registered in start() when there is a heart rate monitor
+        hrm: Optional[HRM] = self.hrm
+        assert hrm is not None
+        hrm.update(data)
+        self._publish(HeartRateSample(time.time(), hrm.heart_rate, tuple(hrm.rr_intervals), hrm.hrv.rmssd))
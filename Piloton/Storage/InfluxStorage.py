@@ -0,0 +1,108 @@
+import re
+from typing import Dict, List, Optional, Union
+
+from influxdb import InfluxDBClient
+
+from Piloton.Types.InfluxUDPClient import InfluxUDPClient
+from Piloton.Types.Storage import Storage
+
+
+def _escape_string(value: str) -> str:
+    """
+    Escape a value for a single-quoted InfluxQL string
+
+    :param str value: Value to escape
+    :return: Escaped value
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+# Nanoseconds per unit of the durations Influx lists retention policies with, e.g. "168h0m0s"
+_DURATION_UNITS: Dict[str, int] = {
+    "ns": 1,
+    "us": 1_000,
+    "µs": 1_000,
+    "ms": 1_000_000,
+    "s": 1_000_000_000,
+    "m": 60_000_000_000,
+    "h": 3_600_000_000_000,
+}
+
+
+def _parse_duration(value: str) -> int:
+    """
+    Convert an Influx duration to nanoseconds
+
+    :param str value: Duration, e.g. "168h0m0s" ("0s" for forever)
+    :return: Nanoseconds (0: forever)
+    :rtype: int
+    """
+    return sum(
+        round(float(number) * _DURATION_UNITS[unit])
+        for number, unit in re.findall(r"([\d.]+)(ns|us|µs|ms|s|m|h)", value)
+    )
+
+
+class InfluxStorage(Storage):
+    """
+    Store data points in InfluxDB. Points are written over HTTP, or fired off over UDP; queries always go over HTTP.
+    """
+
+    def __init__(self, client: InfluxDBClient, writer: Optional[Union[InfluxDBClient, InfluxUDPClient]] = None):
+        """
+        Initialize Influx Storage
+
+        :param InfluxDBClient client: Influx client, for queries (and writes, if no writer is given)
+        :param writer: Influx client or UDP client to write data points with
+        """
+        self.client: InfluxDBClient = client
+        self.writer: Union[InfluxDBClient, InfluxUDPClient] = writer if writer is not None else client
+
+    def write_points(self, points: List[Dict], batch_size: Optional[int] = None) -> bool:
+        return self.writer.write_points(points, batch_size=batch_size)
+
+    def list_sessions(self, rider: Optional[str] = None) -> List[str]:
+        # Read the session tag's values from the index instead of scanning points
+        query: str = 'SHOW TAG VALUES FROM "session" WITH KEY = "session"'
+        if rider is not None:
+            query += " WHERE \"rider\" = '{}'".format(_escape_string(rider))
+
+        return [point["value"] for point in self.client.query(query).get_points()]
+
+    def query_session(self, measurement: str, session: str, limit: int, offset: int = 0) -> List[Dict]:
+        query: str = "SELECT * FROM \"{}\" WHERE \"session\" = '{}' ORDER BY time ASC LIMIT {} OFFSET {}".format(
+            measurement, _escape_string(session), limit, offset
+        )
+        return list(self.client.query(query).get_points())
+
+    def query_range(
+        self,
+        measurement: str,
+        start: int,
+        end: int,
+        limit: int,
+        session: Optional[str] = None,
+        retention_policy: Optional[str] = None,
+    ) -> List[Dict]:
+        source: str = '"{}"'.format(measurement)
+        if retention_policy is not None:
+            source = '"{}".{}'.format(retention_policy, source)
+
+        query: str = "SELECT * FROM {} WHERE time >= {} AND time < {}".format(source, start, end)
+        if session is not None:
+            query += " AND \"session\" = '{}'".format(_escape_string(session))
+        query += " ORDER BY time ASC LIMIT {}".format(limit)
+
+        # Times as integers, instead of RFC3339 strings to parse
+        return list(self.client.query(query, epoch="ns").get_points())
+
+    def retention_policies(self) -> Dict[str, int]:
+        return {
+            policy["name"]: _parse_duration(policy["duration"]) for policy in self.client.get_list_retention_policies()
+        }
+
+    def close(self) -> None:
+        self.client.close()
+        if isinstance(self.writer, InfluxUDPClient):
+            self.writer.close()
@@ -0,0 +1,273 @@
+import calendar
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from Piloton.Mixins.LoggingMixin import LoggingMixin
+from Piloton.Types.Storage import Storage
+
+
+def _quote(identifier: str) -> str:
+    """
+    Quote a table or column name
+
+    :param str identifier: Name to quote
+    :return: Quoted name
+    :rtype: str
+    """
+    return '"{}"'.format(identifier.replace('"', '""'))
+
+
+class SQLiteStorage(LoggingMixin, Storage):  # type: ignore
+    """
+    Store data points in an SQLite database file, with no separate service to run. Each measurement is a table
+    keyed by series (its sorted tags, as in Influx) and time, with a time index and a (tag, time) index per tag.
+    Tags and fields become columns as they're first seen. Points are buffered and inserted in batches, one
+    transaction per batch, in WAL mode so reads don't block writes. Writing a point at the same series and time as
+    an existing one updates its fields, as Influx does.
+    """
+
+    def __init__(self, path: str, batch_size: int = 5000, flush_interval: float = 1.0):
+        """
+        Initialize SQLite Storage
+
+        :param str path: Database file
+        :param int batch_size: Most points buffered before they're inserted
+        :param float flush_interval: Most seconds points are buffered before they're inserted
+        """
+        # Call to Super
+        super().__init__()
+
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+
+        # Autocommit, so each batch is exactly one explicit transaction
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        # Handlers write from the event loop, batches from executor threads
+        self._lock: threading.RLock = threading.RLock()
+        self._columns: Dict[str, Set[str]] = {}
+        self._pending: List[Dict] = []
+        self._last_flush: float = time.monotonic()
+
+        # Timestamps repeat for every point in the same second, so keep the last conversion
+        self._last_time: Tuple[Any, int] = (None, 0)
+
+    def _to_nanoseconds(self, value: Union[str, int, datetime]) -> int:
+        """
+        Convert a point's time to nanoseconds since the epoch
+
+        :param value: RFC3339 string, datetime, or nanoseconds
+        :return: Nanoseconds since the epoch
+        :rtype: int
+        """
+        if value == self._last_time[0]:
+            return self._last_time[1]
+
+        if isinstance(value, int):
+            nanoseconds: int = value
+        else:
+            moment: datetime
+            fraction: int
+            if isinstance(value, str):
+                # Before Python 3.11, fromisoformat only takes 3 or 6 fraction digits, so the fraction is parsed here
+                text: str = value.replace("Z", "+00:00")
+                fraction = 0
+                point: int = text.find(".")
+                if point != -1:
+                    end: int = point + 1
+                    while end < len(text) and text[end].isdigit():
+                        end += 1
+                    fraction = int(text[point + 1 : end][:9].ljust(9, "0"))
+                    text = text[:point] + text[end:]
+                moment = datetime.fromisoformat(text)
+            else:
+                moment = value
+                fraction = moment.microsecond * 1000
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            nanoseconds = calendar.timegm(moment.utctimetuple()) * 1_000_000_000 + fraction
+
+        self._last_time = (value, nanoseconds)
+        return nanoseconds
+
+    @staticmethod
+    def _to_rfc3339(nanoseconds: int) -> str:
+        """
+        Convert nanoseconds since the epoch to an RFC3339 string, as Influx returns times
+
+        :param int nanoseconds: Nanoseconds since the epoch
+        :return: RFC3339 time
+        :rtype: str
+        """
+        seconds, fraction = divmod(nanoseconds, 1_000_000_000)
+        text: str = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        if fraction:
+            text += ".{:09d}".format(fraction).rstrip("0")
+        return text + "Z"
+
+    def _table_columns(self, table: str) -> Set[str]:
+        """
+        Get a measurement table's columns, creating the table the first time
+
+        :param str table: Measurement
+        :return: Column names
+        :rtype: Set[str]
+        """
+        if table not in self._columns:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(table)} "
+                "(series TEXT NOT NULL, time INTEGER NOT NULL, PRIMARY KEY (series, time)) WITHOUT ROWID"
+            )
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'{table}_time')} ON {_quote(table)} (time)")
+            rows = self.connection.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+            self._columns[table] = {row[1] for row in rows}
+        return self._columns[table]
+
+    def _add_columns(self, table: str, tags: Tuple[str, ...], fields: Tuple[str, ...]) -> None:
+        """
+        Add columns for tags and fields seen for the first time. Tags are indexed by time.
+
+        :param str table: Measurement
+        :param Tuple[str, ...] tags: Tag keys
+        :param Tuple[str, ...] fields: Field keys
+        """
+        columns: Set[str] = self._table_columns(table)
+        for tag in tags:
+            if tag not in columns:
+                self.connection.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(tag)}")
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'{table}_{tag}_time')} "
+                    f"ON {_quote(table)} ({_quote(tag)}, time)"
+                )
+                columns.add(tag)
+        for field in fields:
+            if field not in columns:
+                self.connection.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(field)}")
+                columns.add(field)
+
+    def write_points(self, points: List[Dict], batch_size: Optional[int] = None) -> bool:
+        with self._lock:
+            self._pending.extend(points)
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+        return True
+
+    def flush(self) -> None:
+        """
+        Insert buffered points in one transaction
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+
+            points, self._pending = self._pending, []
+
+            # Points with the same measurement, tags and fields share one statement
+            def shape(point: Dict) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+                return point["measurement"], tuple(sorted(point["tags"] or {})), tuple(sorted(point["fields"]))
+
+            self.connection.execute("BEGIN")
+            try:
+                for (table, tags, fields), group in groupby(sorted(points, key=shape), key=shape):
+                    self._add_columns(table, tags, fields)
+                    columns: str = ", ".join(_quote(column) for column in ("series", "time") + tags + fields)
+                    updates: str = ", ".join(f"{_quote(field)} = excluded.{_quote(field)}" for field in fields)
+                    statement: str = (
+                        f"INSERT INTO {_quote(table)} ({columns}) VALUES ({', '.join('?' * (2 + len(tags + fields)))}) "
+                        f"ON CONFLICT (series, time) DO UPDATE SET {updates}"
+                    )
+                    self.connection.executemany(
+                        statement,
+                        (
+                            (
+                                ",".join(f"{tag}={point['tags'][tag]}" for tag in tags),
+                                self._to_nanoseconds(point["time"]),
+                                *(point["tags"][tag] for tag in tags),
+                                *(point["fields"][field] for field in fields),
+                            )
+                            for point in group
+                        ),
+                    )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def list_sessions(self, rider: Optional[str] = None) -> List[str]:
+        with self._lock:
+            self.flush()
+            columns: Set[str] = self._table_columns("session")
+            if "session" not in columns:
+                return []
+
+            query: str = 'SELECT DISTINCT "session" FROM "session"'
+            parameters: Tuple = ()
+            if rider is not None:
+                if "rider" not in columns:
+                    return []
+                query += ' WHERE "rider" = ?'
+                parameters = (rider,)
+
+            return sorted(row[0] for row in self.connection.execute(query, parameters))
+
+    def query_session(self, measurement: str, session: str, limit: int, offset: int = 0) -> List[Dict]:
+        with self._lock:
+            self.flush()
+            if "session" not in self._table_columns(measurement):
+                return []
+
+            cursor = self.connection.execute(
+                f'SELECT * FROM {_quote(measurement)} WHERE "session" = ? ORDER BY time LIMIT ? OFFSET ?',
+                (session, limit, offset),
+            )
+            names: List[str] = [description[0] for description in cursor.description]
+            points: List[Dict] = []
+            for row in cursor:
+                point: Dict = dict(zip(names, row))
+                del point["series"]
+                point["time"] = self._to_rfc3339(point["time"])
+                points.append(point)
+            return points
+
+    def query_range(
+        self,
+        measurement: str,
+        start: int,
+        end: int,
+        limit: int,
+        session: Optional[str] = None,
+        retention_policy: Optional[str] = None,
+    ) -> List[Dict]:
+        # Every point is kept, so there are no retention policies
+        with self._lock:
+            self.flush()
+            columns: Set[str] = self._table_columns(measurement)
+            query: str = f"SELECT * FROM {_quote(measurement)} WHERE time >= ? AND time < ?"
+            parameters: Tuple = (start, end)
+            if session is not None:
+                if "session" not in columns:
+                    return []
+                query += ' AND "session" = ?'
+                parameters += (session,)
+
+            cursor = self.connection.execute(query + " ORDER BY time LIMIT ?", parameters + (limit,))
+            names: List[str] = [description[0] for description in cursor.description]
+            points: List[Dict] = []
+            for row in cursor:
+                point: Dict = dict(zip(names, row))
+                del point["series"]
+                points.append(point)
+            return points
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self.connection.close()
@@ -0,0 +1,2 @@
+from Piloton.Storage.InfluxStorage import InfluxStorage
+from Piloton.Storage.SQLiteStorage import SQLiteStorage
@@ -0,0 +1,87 @@
+from typing import Optional
+
+
+class AutoPause:
+    """
+    Detect breaks in a ride. The ride pauses once cadence and power have both stayed at or below their thresholds
+    for a delay, counted from when they first dropped, and resumes on the first sample above either threshold.
+    Paused time is tracked so summaries can leave it out. It's counted from when the pause starts: samples in the
+    delay before it were recorded as moving, so the moving clock never goes back.
+    """
+
+    def __init__(self, delay: float = 5.0, min_cadence: int = 10, min_power: int = 10):
+        """
+        Initialize Auto Pause
+
+        :param float delay: Seconds stopped before pausing (0: never pause)
+        :param int min_cadence: Cadence (RPM) at or below which the rider counts as stopped
+        :param int min_power: Power (W) at or below which the rider counts as stopped
+        """
+        self.delay: float = delay
+        self.min_cadence: int = min_cadence
+        self.min_power: int = min_power
+        self.paused: bool = False
+        self.pauses: int = 0
+
+        # When the rider stopped, if they have, when the current pause started, and paused seconds before it
+        self._stopped_at: Optional[float] = None
+        self._paused_at: float = 0.0
+        self._paused_time: float = 0.0
+
+    def update(self, cadence: int, power: int, now: float) -> bool:
+        """
+        Update with a bike sample
+
+        :param int cadence: Cadence (RPM)
+        :param int power: Power (W)
+        :param float now: Monotonic time of the sample
+        :return: True, if paused. False, else.
+        :rtype: bool
+        """
+        if cadence > self.min_cadence or power > self.min_power:
+            if self.paused:
+                self._paused_time += now - self._paused_at
+                self.paused = False
+            self._stopped_at = None
+            return False
+
+        if self._stopped_at is None:
+            self._stopped_at = now
+        elif not self.paused and self.delay and now - self._stopped_at >= self.delay:
+            self.paused = True
+            self.pauses += 1
+            self._paused_at = now
+
+        return self.paused
+
+    def paused_time(self, now: float) -> float:
+        """
+        Seconds spent paused, including the current pause
+
+        :param float now: Monotonic time
+        :return: Paused seconds
+        :rtype: float
+        """
+        if self.paused:
+            return self._paused_time + now - self._paused_at
+        return self._paused_time
+
+    def moving_time(self, now: float) -> float:
+        """
+        Monotonic time with paused time taken out, for clocks that should stand still during breaks
+
+        :param float now: Monotonic time
+        :return: Moving clock time
+        :rtype: float
+        """
+        return now - self.paused_time(now)
+
+    def resume(self, paused_time: float, pauses: int) -> None:
+        """
+        Carry over paused time from earlier in the ride, e.g. when resuming an interrupted session
+
+        :param float paused_time: Paused seconds so far
+        :param int pauses: Pauses so far
+        """
+        self._paused_time = paused_time
+        self.pauses = pauses
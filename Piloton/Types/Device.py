@@ -1,5 +1,8 @@
 import asyncio
-from typing import Callable
+from typing import Callable, List
+
+from bleak import BleakScanner
+from bleak.backends.device import BLEDevice
 
 from Piloton.Mixins import BleakMixin, LoggingMixin
 from Piloton.Types.LoopStatus import LoopStatus
@@ -58,5 +61,21 @@ class Device(LoggingMixin, BleakMixin):  # type: ignore
         self.loop_status = LoopStatus.INACTIVE
         return result
 
+    @staticmethod
+    async def scan_all(devices: List["Device"]) -> None:
+        """
+        Asynchronously scan once for many devices, setting the BLE address of each device found by name
+
+        :param List[Device] devices: Devices to look for
+        """
+        # Scan for devices for about 5 seconds
+        found: List[BLEDevice] = await BleakScanner.discover(timeout=5)
+        addresses = {device.name: device.address for device in found}
+
+        for device in devices:
+            if device.name in addresses:
+                device.ble_address = addresses[device.name]
+                device.logger.info("Found devices (%s) at address (%s)", device.name, device.ble_address)
+
     def poll_device(self, data_handler: Callable, data_uuid: str = ""):
         return super().poll_device(data_handler, data_uuid)
@@ -0,0 +1,264 @@
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from rich.cells import cell_len
+from rich.color import ColorSystem
+from rich.console import COLOR_SYSTEMS, Console, RenderableType
+from rich.segment import Segment
+from rich.style import Style
+
+# One character cell: character ("" for the second half of a wide character) and style
+_Cell = Tuple[str, Optional[Style]]
+
+# Alternate screen on/off, cursor hidden/shown, clear screen, reset style
+_ENTER: str = "\x1b[?1049h\x1b[?25l"
+_EXIT: str = "\x1b[0m\x1b[?25h\x1b[?1049l"
+_CLEAR: str = "\x1b[2J"
+_RESET: str = "\x1b[0m"
+
+
+class _HeldRecords(logging.Handler):
+    """
+    Hold log records meant for the terminal while it's drawn on, keeping the latest few
+    """
+
+    def __init__(self, level: int, capacity: int):
+        super().__init__(level=level)
+        self.records: Deque[logging.LogRecord] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class DiffLive:
+    """
+    Drop-in for a full screen rich.live.Live that sends only the characters that changed since the last frame, each
+    run behind a cursor move, instead of repainting the whole screen. Frames are still laid out by Rich; only the
+    output differs. Meant for slow SSH and serial links, where full repaints of box-drawn panels fill the link.
+
+    Diffs assume nothing else writes to the screen, so log handlers writing to the terminal are held while the
+    display is up, and their latest records are logged when it closes. Anything else that writes to the screen is
+    drawn over by the next full repaint.
+    """
+
+    def __init__(
+        self,
+        renderable: RenderableType,
+        console: Optional[Console] = None,
+        min_gap: int = 4,
+        repaint_interval: int = 100,
+        held_records: int = 1000,
+    ):
+        """
+        Initialize Diff Live display
+
+        :param RenderableType renderable: First frame
+        :param Optional[Console] console: Console to draw on (default: a new one)
+        :param int min_gap: Unchanged cells between two changes at or below which they're sent as one run, as
+            that's cheaper than a second cursor move
+        :param int repaint_interval: Frames between full repaints (0: only when the terminal is resized)
+        :param int held_records: Most log records held while the display is up, newest kept
+        """
+        self.renderable: RenderableType = renderable
+        self.console: Console = console if console is not None else Console()
+        self.min_gap: int = min_gap
+        self.repaint_interval: int = repaint_interval
+        self.held_records: int = held_records
+        self.color_system: Optional[ColorSystem] = COLOR_SYSTEMS.get(self.console.color_system or "")
+        self.bytes_written: int = 0
+        self.frames: int = 0
+
+        # Cells on screen, and the escape code selecting each style seen so far
+        self._screen: Optional[List[List[_Cell]]] = None
+        self._size: Tuple[int, int] = (0, 0)
+        self._codes: Dict[Optional[Style], str] = {None: _RESET}
+
+        # Log handlers writing to the terminal, and their records while they're held
+        self._handlers: List[logging.Handler] = []
+        self._held: Optional[_HeldRecords] = None
+
+    def __enter__(self) -> "DiffLive":
+        self._hold_logs()
+        self._write(_ENTER)
+        self.refresh()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._write(_EXIT)
+        self._screen = None
+        self._release_logs()
+
+    def _hold_logs(self) -> None:
+        """
+        Hold records from the root logger's handlers that write to a terminal, so they don't scroll the screen
+        """
+        root: logging.Logger = logging.getLogger()
+        self._handlers = [
+            handler
+            for handler in root.handlers
+            if isinstance(handler, logging.StreamHandler) and getattr(handler.stream, "isatty", lambda: False)()
+        ]
+        if not self._handlers:
+            return
+
+        self._held = _HeldRecords(min(handler.level for handler in self._handlers), self.held_records)
+        for handler in self._handlers:
+            root.removeHandler(handler)
+        root.addHandler(self._held)
+
+    def _release_logs(self) -> None:
+        """
+        Give the terminal back to the held log handlers, and log the records they missed
+        """
+        if self._held is None:
+            return
+
+        root: logging.Logger = logging.getLogger()
+        root.removeHandler(self._held)
+        for handler in self._handlers:
+            root.addHandler(handler)
+        for record in self._held.records:
+            for handler in self._handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        self._handlers, self._held = [], None
+
+    def update(self, renderable: RenderableType, refresh: bool = False) -> None:
+        """
+        Replace the frame
+
+        :param RenderableType renderable: New frame
+        :param bool refresh: Draw it now
+        """
+        self.renderable = renderable
+        if refresh:
+            self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Draw the frame, sending only what changed on screen
+        """
+        size: Tuple[int, int] = tuple(self.console.size)  # type: ignore
+
+        # Start over from a blank screen when the terminal is resized, and every so often in case something else
+        # wrote to it
+        output: List[str] = []
+        repaint: bool = bool(self.repaint_interval) and self.frames > 0 and self.frames % self.repaint_interval == 0
+        if size != self._size or repaint:
+            self._screen = None
+            self._size = size
+            output.append(_CLEAR)
+
+        screen: List[List[_Cell]] = self._render(*size)
+        output.extend(self._diff(self._screen, screen))
+        self._screen = screen
+        self.frames += 1
+        self._write("".join(output))
+
+    def _render(self, width: int, height: int) -> List[List[_Cell]]:
+        """
+        Lay out the frame as rows of cells
+
+        :param int width: Terminal width
+        :param int height: Terminal height
+        :return: Rows of cells, each row the terminal's width
+        """
+        lines: List[List[Segment]] = self.console.render_lines(
+            self.renderable, self.console.options.update(width=width, height=height), pad=True
+        )
+
+        screen: List[List[_Cell]] = []
+        for line in lines[:height]:
+            row: List[_Cell] = []
+            for text, style, control in line:
+                if control:
+                    continue
+                style = style if style else None  # Plain text, however it's styled
+                for character in text:
+                    row.append((character, style))
+                    if cell_len(character) == 2:
+                        row.append(("", style))
+            del row[width:]
+            row.extend([(" ", None)] * (width - len(row)))
+            screen.append(row)
+        return screen
+
+    def _diff(self, old: Optional[List[List[_Cell]]], new: List[List[_Cell]]) -> List[str]:
+        """
+        Get the output that turns the old screen into the new one
+
+        :param Optional[List[List[_Cell]]] old: Cells on screen, or None if the screen is blank
+        :param List[List[_Cell]] new: Cells to show
+        :return: Escape codes and characters to write
+        """
+        output: List[str] = []
+        style: Optional[Style] = None
+        for y, row in enumerate(new):
+            old_row: Optional[List[_Cell]] = old[y] if old is not None and y < len(old) else None
+            if old_row is None:
+                changed: List[int] = [x for x, cell in enumerate(row) if cell != (" ", None)]
+            else:
+                changed = [x for x, cell in enumerate(row) if cell != old_row[x]]
+
+            for start, end in self._runs(changed, row):
+                output.append(f"\x1b[{y + 1};{start + 1}H")
+                for character, cell_style in row[start:end]:
+                    if not character:
+                        continue
+                    if cell_style != style:
+                        output.append(self._code(cell_style))
+                        style = cell_style
+                    output.append(character)
+
+        if style is not None:
+            output.append(_RESET)
+        return output
+
+    def _runs(self, changed: List[int], row: List[_Cell]) -> List[Tuple[int, int]]:
+        """
+        Group changed cells into runs, bridging short gaps of unchanged cells
+
+        :param List[int] changed: Columns that changed, in order
+        :param List[_Cell] row: Row being drawn
+        :return: Start and end (exclusive) columns of each run
+        """
+        runs: List[Tuple[int, int]] = []
+        for x in changed:
+            if runs and x - runs[-1][1] <= self.min_gap:
+                runs[-1] = (runs[-1][0], x + 1)
+            else:
+                runs.append((x, x + 1))
+
+        # A run can't start halfway through a wide character
+        return [(start - 1 if start and not row[start][0] else start, end) for start, end in runs]
+
+    def _code(self, style: Optional[Style]) -> str:
+        """
+        Get the escape code that resets the style and selects another
+
+        :param Optional[Style] style: Style, or None for the default
+        :return: Select Graphic Rendition escape code
+        """
+        code: Optional[str] = self._codes.get(style)
+        if code is None:
+            # The default style's code is seeded in _codes, so only real styles get here
+            assert style is not None
+
+            # Rich only exposes a style's codes wrapped around text
+            prefix: str = style.render("\0", color_system=self.color_system).split("\0")[0]
+            code = f"\x1b[0;{prefix[2:-1]}m" if prefix else _RESET
+            self._codes[style] = code
+        return code
+
+    def _write(self, output: str) -> None:
+        """
+        Write to the terminal and count bytes sent
+
+        :param str output: Output
+        """
+        if not output:
+            return
+        self.console.file.write(output)
+        self.console.file.flush()
+        self.bytes_written += len(output.encode("utf-8"))
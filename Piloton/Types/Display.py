@@ -1,6 +1,37 @@
+from typing import TYPE_CHECKING, Union
+
+from rich.console import RenderableType
+from rich.live import Live
+
+from Piloton.Types.DiffLive import DiffLive
+
+# Only import when type_checking
+if TYPE_CHECKING:
+    from Piloton.Piloton import Piloton
+
+
 class Display:
     """
     Display stub
     """
 
-    pass
+    # Piloton the display draws
+    piloton: "Piloton"
+
+    async def live_output(self) -> None:
+        """
+        Draw the display until its loop is stopped -- stub
+        """
+
+    def _live(self, renderable: RenderableType, screen: bool = True) -> Union[Live, DiffLive]:
+        """
+        Set up the live display for Piloton's terminal renderer: Rich repaints every frame in full, "diff" sends
+        only what changed, always full screen
+
+        :param RenderableType renderable: First frame
+        :param bool screen: Draw on the alternate screen (Rich only)
+        :return: Live display, to use as a context manager
+        """
+        if self.piloton.terminal_renderer == "diff":
+            return DiffLive(renderable)
+        return Live(renderable, auto_refresh=False, screen=screen)
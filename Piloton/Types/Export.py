@@ -0,0 +1,52 @@
+from typing import Dict, List, Tuple
+
+
+class Export:
+    """
+    File that recorded rides are exported to, written a chunk of rows at a time so exports of any size fit in
+    memory. Rows are dicts of COLUMNS, with bike and heart rate data joined on time: time is nanoseconds since the
+    epoch, and values a device didn't record are None.
+    """
+
+    COLUMNS: Tuple[str, ...] = (
+        "time",
+        "session",
+        "rider",
+        "speed",  # mph
+        "cadence",  # RPM
+        "power",  # W
+        "resistance",
+        "power_zone",
+        "heart_rate",  # BPM
+        "heart_zone",
+        "rmssd",  # ms
+        "sdnn",  # ms
+    )
+
+    def __init__(self, path: str):
+        """
+        Initialize Export
+
+        :param str path: File to write
+        """
+        self.path: str = path
+        self.rows: int = 0
+
+    def __enter__(self) -> "Export":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write_rows(self, rows: List[Dict]) -> None:
+        """
+        Write a chunk of rows, oldest first
+
+        :param List[Dict] rows: Rows of COLUMNS
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Finish the file
+        """
@@ -1,6 +1,10 @@
-from typing import Any, Tuple, Dict, Callable
+from typing import Any, Tuple, Dict, Callable, Optional, TYPE_CHECKING
 from rich.prompt import PromptType
 
+# Only import when type_checking
+if TYPE_CHECKING:
+    from Piloton.Piloton import Piloton
+
 
 class FormPrompt:
     """
@@ -43,3 +47,6 @@ class FormPrompt:
 
 class Form:
     __formname__ = "Form"
+
+    # Piloton the menus are shown for, so forms can list its data
+    piloton: Optional["Piloton"] = None
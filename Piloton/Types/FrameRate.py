@@ -0,0 +1,78 @@
+import time
+from math import inf
+from typing import Any
+
+
+class FrameRate:
+    """
+    Adapt a display's refresh rate to what frames cost to render. Frames are only rendered when the displayed
+    state changes (or when idle for a full minimum-rate period), and the interval between frames stretches so
+    that rendering uses at most a fraction of wall time.
+    """
+
+    def __init__(self, min_fps: float, max_fps: float, budget: float = 0.25, smoothing: float = 0.2):
+        """
+        Initialize Frame Rate
+
+        :param float min_fps: Slowest refresh rate, used when nothing changes
+        :param float max_fps: Fastest refresh rate
+        :param float budget: Fraction of wall time rendering may take
+        :param float smoothing: Weight of the newest frame in the average render time
+        """
+        self.min_interval: float = 1 / max_fps
+        self.max_interval: float = 1 / min_fps
+        self.budget: float = budget
+        self.smoothing: float = smoothing
+
+        self.interval: float = self.min_interval
+        self.render_time: float = 0.0  # Moving average (s)
+        self.frames: int = 0
+        self.dropped: int = 0
+
+        self._last_state: Any = None
+        self._last_frame: float = -inf
+        self._next_check: float = -inf
+
+    def should_render(self, state: Any) -> bool:
+        """
+        Decide whether a frame should be rendered for the displayed state
+
+        :param Any state: Comparable summary of everything the display shows
+        :return: True, if state changed or the display has idled for too long. False, else.
+        :rtype: bool
+        """
+        now: float = time.monotonic()
+
+        # Count frames that were due while the loop was busy elsewhere
+        if self._next_check != -inf and now - self._next_check > self.interval:
+            self.dropped += int((now - self._next_check) / self.interval)
+
+        if state != self._last_state or now - self._last_frame >= self.max_interval:
+            self._last_state = state
+            return True
+        return False
+
+    def record_frame(self, render_time: float) -> None:
+        """
+        Record the cost of a rendered frame and adapt the interval to it
+
+        :param float render_time: Seconds taken to render the frame
+        """
+        if self.frames:
+            self.render_time += self.smoothing * (render_time - self.render_time)
+        else:
+            self.render_time = render_time
+
+        self.interval = min(max(self.render_time / self.budget, self.min_interval), self.max_interval)
+        self.frames += 1
+        self._last_frame = time.monotonic()
+
+    def delay(self) -> float:
+        """
+        Seconds to wait before checking for the next frame
+
+        :return: Delay until next frame
+        :rtype: float
+        """
+        self._next_check = time.monotonic() + self.interval
+        return self.interval
@@ -0,0 +1,95 @@
+from collections import deque
+from math import sqrt
+from typing import Deque
+
+
+class HeartRateVariability:
+    """
+    Streaming Heart Rate Variability over a sliding window of RR-intervals. Each RR-interval updates running sums
+    in O(1), and sums are kept as integers in the characteristic's 1/1024 s units so they never drift, no matter
+    how long the session.
+
+    RMSSD: Root mean square of successive RR-interval differences
+    SDNN: Standard deviation of RR-intervals
+    """
+
+    # RR-intervals outside 300-2000 ms (200-30 BPM) are treated as artifacts
+    MIN_RR: int = 307  # 1/1024 s
+    MAX_RR: int = 2048  # 1/1024 s
+
+    def __init__(self, window: float = 60.0):
+        """
+        Initialize Heart Rate Variability
+
+        :param float window: Seconds of RR-intervals to calculate over
+        """
+        self.window: int = round(window * 1024)  # 1/1024 s
+
+        # RR-intervals in the window, and the squared differences between successive ones
+        self._intervals: Deque[int] = deque()
+        self._squared_differences: Deque[int] = deque()
+
+        # Running sums over the window
+        self._duration: int = 0
+        self._sum_squares: int = 0
+        self._sum_squared_differences: int = 0
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def clear(self) -> None:
+        """
+        Empty the window, so the next session's HRV doesn't include the last one's RR-intervals
+        """
+        self._intervals.clear()
+        self._squared_differences.clear()
+        self._duration = 0
+        self._sum_squares = 0
+        self._sum_squared_differences = 0
+
+    def update(self, rr_interval: int) -> None:
+        """
+        Add an RR-interval, dropping the intervals that fall out of the window
+
+        :param int rr_interval: RR-interval in 1/1024 s, as received from the Heart Rate Measurement
+        """
+        if not self.MIN_RR <= rr_interval <= self.MAX_RR:
+            return
+
+        if self._intervals:
+            squared_difference: int = (rr_interval - self._intervals[-1]) ** 2
+            self._squared_differences.append(squared_difference)
+            self._sum_squared_differences += squared_difference
+
+        self._intervals.append(rr_interval)
+        self._duration += rr_interval
+        self._sum_squares += rr_interval * rr_interval
+
+        # Slide window
+        while self._duration > self.window and len(self._intervals) > 2:
+            oldest: int = self._intervals.popleft()
+            self._duration -= oldest
+            self._sum_squares -= oldest * oldest
+            self._sum_squared_differences -= self._squared_differences.popleft()
+
+    @property
+    def rmssd(self) -> float:
+        """
+        RMSSD of the window in milliseconds (0 until there are two RR-intervals)
+        """
+        if not self._squared_differences:
+            return 0.0
+        return sqrt(self._sum_squared_differences / len(self._squared_differences)) * 1000 / 1024
+
+    @property
+    def sdnn(self) -> float:
+        """
+        SDNN of the window in milliseconds (0 until there are two RR-intervals)
+        """
+        count: int = len(self._intervals)
+        if count < 2:
+            return 0.0
+
+        # Sample variance from integer sums: (n * sum(x^2) - sum(x)^2) / (n * (n - 1))
+        variance: float = (count * self._sum_squares - self._duration ** 2) / (count * (count - 1))
+        return sqrt(max(variance, 0.0)) * 1000 / 1024
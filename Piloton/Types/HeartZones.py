@@ -1,7 +1,7 @@
 from math import inf
+from typing import cast
 
 from Piloton.Types.HeartZone import HeartZone
-from Piloton.Types.Zone import Zone
 from Piloton.Types.Zones import Zones
 
 
@@ -34,15 +34,16 @@ class HeartZones(Zones):
         self.maximum_heart_rate: float = 207 - (age * 0.7)
         super().__init__()
 
-    def calculate_heart_zone(self, heart_rate: int) -> Zone:
+    def calculate_heart_zone(self, heart_rate: int) -> HeartZone:
         """
         Figure out which heart zone user
 
         :param int heart_rate: Heart Rate as recorded by connected HRM
         :return: Current Heart Zone
-        :rtype: Zone
+        :rtype: HeartZone
         """
         # Calculate HR as % of MHR
         hr_percent = heart_rate / self.maximum_heart_rate
-        heart_zone: Zone = self.calculate_zone(hr_percent)
+        # ZONES is keyed by HeartZone, so the zone found is one
+        heart_zone: HeartZone = cast(HeartZone, self.calculate_zone(hr_percent))
         return heart_zone
@@ -0,0 +1,77 @@
+import socket
+from typing import Dict, List, Optional
+
+from influxdb.line_protocol import make_lines
+
+from Piloton.Mixins.LoggingMixin import LoggingMixin
+
+# IPv4 and UDP headers
+_HEADER_SIZE: int = 28
+
+
+class InfluxUDPClient(LoggingMixin):  # type: ignore
+    """
+    Fire-and-forget writer for InfluxDB 1.x's UDP listener. Points are encoded as line protocol and packed into as
+    few datagrams as fit the MTU, then sent without waiting for a response. Delivery isn't confirmed, and the
+    listener writes to the database it's configured with.
+    """
+
+    def __init__(self, host: str, port: int = 8089, mtu: int = 1500):
+        """
+        Initialize Influx UDP Client
+
+        :param str host: InfluxDB host
+        :param int port: InfluxDB UDP listener port
+        :param int mtu: Network MTU, the most bytes per datagram (including IPv4 and UDP headers)
+        """
+        # Call to Super
+        super().__init__()
+
+        self.address = (host, int(port))
+        self.payload_size: int = mtu - _HEADER_SIZE
+        self.packets: int = 0
+        self.dropped: int = 0  # Datagrams the OS refused to send
+
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def write_points(self, points: List[Dict], batch_size: Optional[int] = None, **kwargs) -> bool:
+        """
+        Send data points. Takes the same points as InfluxDBClient.write_points.
+
+        :param List[Dict] points: Data points with measurement, tags, time, and fields
+        :param Optional[int] batch_size: [Unused] Datagrams are sized by the MTU instead
+        :param kwargs: [Unused] Other InfluxDBClient.write_points arguments
+        :return: True
+        :rtype: bool
+        """
+        packet: bytearray = bytearray()
+        for line in make_lines({"points": points}).encode("utf-8").splitlines(keepends=True):
+            if packet and len(packet) + len(line) > self.payload_size:
+                self._send(packet)
+                packet = bytearray()
+            packet += line
+
+        if packet:
+            self._send(packet)
+
+        return True
+
+    def _send(self, packet: bytearray) -> None:
+        """
+        Send a datagram, counting it as dropped if the OS can't take it right now
+
+        :param bytearray packet: Line protocol lines
+        """
+        try:
+            self._socket.sendto(packet, self.address)
+            self.packets += 1
+        except OSError as error:
+            self.dropped += 1
+            self.logger.debug("Dropped UDP packet (%d bytes): %s", len(packet), error)
+
+    def close(self) -> None:
+        """
+        Close the socket
+        """
+        self._socket.close()
@@ -0,0 +1,21 @@
+from typing import NamedTuple
+
+from Piloton.Types.HeartZone import HeartZone
+from Piloton.Types.PowerZone import PowerZone
+
+
+class MetricsSnapshot(NamedTuple):
+    """
+    Immutable copy of the latest metrics. Handlers swap in a new snapshot on every notification, so displays
+    rendering on another thread never see a half-updated set of values.
+    """
+
+    cadence: int = 0  # rpm
+    resistance: int = 0
+    power: int = 0  # Watts
+    speed: float = 0.0  # mph
+    heart_rate: int = 0  # BPM
+    rmssd: float = 0.0  # ms
+    heart_zone: HeartZone = HeartZone.NO_ZONE
+    power_zone: PowerZone = PowerZone.NO_ZONE
+    paused: bool = False  # Auto-paused
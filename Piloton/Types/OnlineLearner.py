@@ -0,0 +1,173 @@
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sklearn.naive_bayes import GaussianNB
+
+from Piloton.Types.TrainingData import TrainingData
+
+
+class LearnerStatus(NamedTuple):
+    """
+    How well the online learner predicts held-out samples
+    """
+
+    resistances: np.ndarray  # Held-out samples' resistance
+    predictions: np.ndarray  # What the learner predicted for them
+    trained: int  # Samples the learner has been fit with
+
+    def __len__(self) -> int:
+        return len(self.resistances)
+
+    def samples(self, resistance: Optional[int] = None) -> int:
+        """
+        Count held-out samples
+
+        :param Optional[int] resistance: Only count samples at this resistance
+        :return: Number of samples
+        :rtype: int
+        """
+        if resistance is None:
+            return len(self.resistances)
+        return int(np.count_nonzero(self.resistances == resistance))
+
+    def accuracy(self, resistance: Optional[int] = None, tolerance: int = 0) -> float:
+        """
+        Fraction of held-out samples predicted correctly
+
+        :param Optional[int] resistance: Only score samples at this resistance
+        :param int tolerance: Count predictions this far off as correct
+        :return: Accuracy, or 0.0 without any samples
+        :rtype: float
+        """
+        errors: np.ndarray = np.abs(self.predictions - self.resistances)
+        if resistance is not None:
+            errors = errors[self.resistances == resistance]
+        return float(np.mean(errors <= tolerance)) if len(errors) else 0.0
+
+    def confusion(self, resistance: int, spread: int = 2) -> Tuple[Dict[int, float], float]:
+        """
+        What held-out samples at a resistance are predicted as, near it
+
+        :param int resistance: Actual resistance
+        :param int spread: Show predictions this far either side
+        :return: Fraction of samples predicted as each nearby resistance, and the fraction predicted further off
+        """
+        predictions: np.ndarray = self.predictions[self.resistances == resistance]
+        if not len(predictions):
+            return {}, 0.0
+
+        nearby: Dict[int, float] = {
+            predicted: float(np.mean(predictions == predicted))
+            for predicted in range(resistance - spread, resistance + spread + 1)
+        }
+        return nearby, float(np.mean(np.abs(predictions - resistance) > spread))
+
+
+class OnlineLearner:
+    """
+    Incremental resistance classifier for training sessions. A Gaussian Naive Bayes model is seeded with the saved
+    training data and updated with partial_fit as samples arrive, in small batches. Every few samples is held out
+    instead, and after each update the held-out samples are predicted again, so the training display can show
+    whether the model is still getting better at a resistance. Full refits of the bike's own classifier still happen
+    when a workout starts.
+    """
+
+    def __init__(
+        self,
+        training_data: Optional[TrainingData] = None,
+        holdout_every: int = 5,
+        holdout_size: int = 1000,
+        batch_size: int = 10,
+    ):
+        """
+        Initialize Online Learner
+
+        :param Optional[TrainingData] training_data: Saved training data to seed the model with
+        :param int holdout_every: Hold out one in this many samples
+        :param int holdout_size: Most held-out samples kept, newest first
+        :param int batch_size: Training samples per model update
+        """
+        self.holdout_every: int = holdout_every
+        self.batch_size: int = batch_size
+        self.classes: np.ndarray = np.array(TrainingData.RESISTANCES)
+        self.model: GaussianNB = GaussianNB()
+        self.trained: int = 0
+        self.seen: int = 0
+
+        # Held-out samples as (inputs, resistance), and training samples waiting for the next update
+        self._holdout: Deque[Tuple[Tuple[float, ...], int]] = deque(maxlen=holdout_size)
+        self._batch_inputs: List[Tuple[float, ...]] = []
+        self._batch_resistances: List[int] = []
+
+        # Replaced (never mutated) after each update, for displays on other threads
+        self.status: LearnerStatus = LearnerStatus(np.zeros(0, dtype=np.int16), np.zeros(0, dtype=np.int16), 0)
+
+        if training_data is not None and len(training_data):
+            inputs, resistances = training_data.matrices()
+            self._fit(self.features(inputs), resistances)
+
+    @staticmethod
+    def features(inputs: np.ndarray) -> np.ndarray:
+        """
+        Convert [Cadence, Power, Speed] rows to model features. Naive Bayes treats features as independent, but power
+        and speed both climb with cadence, so they're taken per pedal revolution instead.
+
+        :param np.ndarray inputs: Rows of [Cadence, Power, Speed]
+        :return: Rows of [Cadence, Power / Cadence, Speed / Cadence]
+        :rtype: np.ndarray
+        """
+        inputs = np.asarray(inputs, dtype=np.float64).reshape(-1, 3)
+        cadence: np.ndarray = np.maximum(inputs[:, 0], 1.0)
+        return np.column_stack((inputs[:, 0], inputs[:, 1] / cadence, inputs[:, 2] / cadence))
+
+    def _fit(self, features: np.ndarray, resistances: np.ndarray) -> None:
+        """
+        Update the model
+
+        :param np.ndarray features: Rows of model features
+        :param np.ndarray resistances: Resistance of each row
+        """
+        self.model.partial_fit(features, resistances, classes=self.classes if not self.trained else None)
+        self.trained += len(resistances)
+
+    def add(self, resistance: int, cadence: int, power: int, speed: float) -> None:
+        """
+        Add a sample, holding it out or training on it
+
+        :param int resistance: Resistance
+        :param int cadence: Cadence (RPM)
+        :param int power: Power (W)
+        :param float speed: Speed (mph)
+        """
+        if resistance not in TrainingData.RESISTANCES:
+            return
+
+        self.seen += 1
+        if self.seen % self.holdout_every == 0:
+            self._holdout.append(((cadence, power, speed), resistance))
+            return
+
+        self._batch_inputs.append((cadence, power, speed))
+        self._batch_resistances.append(resistance)
+        if len(self._batch_resistances) >= self.batch_size:
+            self.update()
+
+    def update(self) -> None:
+        """
+        Fit the model with waiting training samples, then score it on the held-out samples
+        """
+        if self._batch_resistances:
+            self._fit(self.features(np.array(self._batch_inputs)), np.array(self._batch_resistances))
+            self._batch_inputs, self._batch_resistances = [], []
+
+        if not self._holdout or not self.trained:
+            return
+
+        inputs, resistances = zip(*self._holdout)
+
+        # Resistances never trained on have no prior, which is fine: they're never predicted
+        with np.errstate(divide="ignore"):
+            predictions: np.ndarray = self.model.predict(self.features(np.array(inputs)))
+
+        self.status = LearnerStatus(np.array(resistances, dtype=np.int16), predictions.astype(np.int16), self.trained)
@@ -0,0 +1,142 @@
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class PowerCurve:
+    """
+    Mean-maximal power curve: the best average power held for each duration. Power is binned into one sample per
+    second, and each new second updates a sliding-window sum per duration in O(1), so the curve is always current
+    without rescanning the ride.
+    """
+
+    # Seconds: 1 s, 5 s, 10 s, 30 s, 1 min, 2 min, 5 min, 10 min, 20 min, 30 min, 60 min, 90 min, 2 hr
+    DURATIONS: Tuple[int, ...] = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600, 5400, 7200)
+
+    # FTP is estimated as 95% of the best 20 minutes
+    FTP_DURATION: int = 1200
+    FTP_FACTOR: float = 0.95
+
+    def __init__(self, durations: Tuple[int, ...] = DURATIONS):
+        """
+        Initialize Power Curve
+
+        :param Tuple[int, ...] durations: Seconds to track best average power over
+        """
+        self.durations: Tuple[int, ...] = durations
+        self.best: Dict[int, float] = {}  # Duration (s): Best average power (W)
+
+        # Power per second (W), and each duration's sum over its trailing window
+        self.series: array = array("H")
+        self._sums: Dict[int, int] = {duration: 0 for duration in durations}
+
+        # Samples within the second being binned
+        self._start: Optional[float] = None
+        self._second: int = 0
+        self._second_total: int = 0
+        self._second_count: int = 0
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def record(self, power: int, timestamp: float) -> None:
+        """
+        Record a power sample. Seconds without any samples count as 0 W.
+
+        :param int power: Power (W)
+        :param float timestamp: Monotonic timestamp of the sample, in seconds
+        """
+        # A curve rebuilt from a series continues from its last second
+        if self._start is None:
+            self._start = timestamp - self._second
+
+        second: int = int(timestamp - self._start)
+        while self._second < second:
+            self._close_second()
+
+        self._second_total += max(power, 0)
+        self._second_count += 1
+
+    def finish(self) -> None:
+        """
+        Close out the second being binned, at the end of a ride
+        """
+        if self._second_count:
+            self._close_second()
+
+    def _close_second(self) -> None:
+        """
+        Add the binned second's average power to the series and update every duration's best
+        """
+        power: int = min(self._second_total // self._second_count, 0xFFFF) if self._second_count else 0
+        self.series.append(power)
+        self._second += 1
+        self._second_total = 0
+        self._second_count = 0
+
+        length: int = len(self.series)
+        for duration in self.durations:
+            self._sums[duration] += power
+            if length > duration:
+                self._sums[duration] -= self.series[length - 1 - duration]
+            if length >= duration:
+                average: float = self._sums[duration] / duration
+                if average > self.best.get(duration, 0.0):
+                    self.best[duration] = average
+
+    @classmethod
+    def from_series(cls, series: Iterable[int]) -> "PowerCurve":
+        """
+        Rebuild a power curve from its power per second, e.g. to resume a ride, so new samples continue the series
+
+        :param Iterable[int] series: Power per second (W)
+        :return: Power curve
+        :rtype: PowerCurve
+        """
+        power_curve = cls()
+        for power in series:
+            power_curve._second_total, power_curve._second_count = power, 1
+            power_curve._close_second()
+        return power_curve
+
+    def ftp_estimate(self) -> Optional[int]:
+        """
+        Estimate Functional Threshold Power (FTP) from the best 20 minutes
+
+        :return: FTP estimate (W), if there's a 20 minute effort
+        :rtype: Optional[int]
+        """
+        if self.FTP_DURATION not in self.best:
+            return None
+        return round(self.best[self.FTP_DURATION] * self.FTP_FACTOR)
+
+    def merge(self, other: "PowerCurve") -> None:
+        """
+        Keep the better of this curve's and another curve's best efforts, e.g. to update an all-time curve
+
+        :param PowerCurve other: Power curve to merge in
+        """
+        for duration, power in other.best.items():
+            if power > self.best.get(duration, 0.0):
+                self.best[duration] = power
+
+    def to_json(self) -> Dict[str, float]:
+        """
+        Convert best efforts to a JSON-serializable dict
+
+        :return: Duration (s): Best average power (W)
+        :rtype: Dict[str, float]
+        """
+        return {str(duration): round(power, 1) for duration, power in sorted(self.best.items())}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, float]) -> "PowerCurve":
+        """
+        Load best efforts from a dict written by to_json
+
+        :param Dict[str, float] data: Duration (s): Best average power (W)
+        :return: Power curve
+        :rtype: PowerCurve
+        """
+        power_curve = cls()
+        power_curve.best = {int(duration): float(power) for duration, power in data.items()}
+        return power_curve
@@ -1,7 +1,7 @@
 from math import inf
+from typing import cast
 
 from Piloton.Types.PowerZone import PowerZone
-from Piloton.Types.Zone import Zone
 from Piloton.Types.Zones import Zones
 
 
@@ -37,15 +37,16 @@ class PowerZones(Zones):
         self.ftp = ftp
         super().__init__()
 
-    def calculate_power_zone(self, power: float) -> Zone:
+    def calculate_power_zone(self, power: float) -> PowerZone:
         """
         Calculate current Power Zone
 
         :param power: Power (W) from Indoor Bike Data
         :return: Current Power Zone
-        :rtype: Zone
+        :rtype: PowerZone
         """
         # Calculate Power as % of FTP
         power_percent: float = power / self.ftp
-        power_zone: Zone = self.calculate_zone(power_percent)
+        # ZONES is keyed by PowerZone, so the zone found is one
+        power_zone: PowerZone = cast(PowerZone, self.calculate_zone(power_percent))
         return power_zone
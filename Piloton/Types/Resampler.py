@@ -0,0 +1,113 @@
+import math
+import time
+from typing import Dict, Optional, Tuple, Union
+
+Number = Union[int, float]
+
+
+class Resampler:
+    """
+    Streaming resampler onto a fixed time grid. Samples from any number of devices are folded into the interval
+    they arrive in, and once a sample arrives for a later interval, the finished one comes out as a single data point
+    with the mean and max of every field seen in it: <field> (mean) and max_<field>. Devices' fields must be named
+    differently, as bike and HRM fields are.
+    """
+
+    # Fields whose values are categories, e.g. zones, where a mean means nothing. <field> is the interval's last value.
+    CATEGORICAL: Tuple[str, ...] = ("power_zone", "zone")
+
+    def __init__(self, interval: float, measurement: str, tags: Dict[str, str]):
+        """
+        Initialize Resampler
+
+        :param float interval: Seconds per grid interval, e.g. 1.0 for 1 Hz
+        :param str measurement: Measurement of the combined data points
+        :param Dict[str, str] tags: Tags of the combined data points
+        """
+        self.interval: float = interval
+        self.measurement: str = measurement
+        self.tags: Dict[str, str] = tags
+        self.samples: int = 0  # Samples folded in
+        self.points: int = 0  # Combined points produced
+
+        # Interval being filled, and its fields' running sums, counts, maxima, and last values
+        self._index: Optional[int] = None
+        self._sums: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._maxima: Dict[str, Number] = {}
+        self._last: Dict[str, Number] = {}
+
+    def add(self, fields: Dict[str, Number], timestamp: float) -> Optional[Dict]:
+        """
+        Fold a sample into its interval. Samples timestamped before the interval being filled (e.g. after the clock
+        steps back) are folded into it, so intervals only ever come out once, in order.
+
+        :param Dict[str, Number] fields: Sample's fields
+        :param float timestamp: Seconds since the epoch the sample arrived at
+        :return: Data point for the previous interval, if this sample finished it
+        :rtype: Optional[Dict]
+        """
+        index: int = math.floor(timestamp / self.interval)
+        point: Optional[Dict] = None
+        if self._index is None:
+            self._index = index
+        elif index > self._index:
+            point = self.flush()
+            self._index = index
+
+        for field, value in fields.items():
+            if field in self._counts:
+                self._sums[field] += value
+                self._counts[field] += 1
+                if value > self._maxima[field]:
+                    self._maxima[field] = value
+            else:
+                self._sums[field] = value
+                self._counts[field] = 1
+                self._maxima[field] = value
+            self._last[field] = value
+
+        self.samples += 1
+        return point
+
+    def flush(self) -> Optional[Dict]:
+        """
+        Finish the interval being filled, e.g. at the end of a ride
+
+        :return: Data point for the interval, or None if nothing was folded in
+        :rtype: Optional[Dict]
+        """
+        if self._index is None or not self._counts:
+            return None
+
+        fields: Dict[str, Number] = {}
+        for field, count in self._counts.items():
+            fields[field] = self._last[field] if field in self.CATEGORICAL else self._sums[field] / count
+            fields[f"max_{field}"] = self._maxima[field]
+
+        point: Dict = {
+            "measurement": self.measurement,
+            "tags": self.tags,
+            "time": self._format_time(self._index * self.interval),
+            "fields": fields,
+        }
+
+        self._sums, self._counts, self._maxima, self._last = {}, {}, {}, {}
+        self.points += 1
+        return point
+
+    @staticmethod
+    def _format_time(seconds: float) -> str:
+        """
+        Format an interval's start as an RFC3339 time, with milliseconds for sub-second grids
+
+        :param float seconds: Seconds since the epoch
+        :return: RFC3339 time
+        :rtype: str
+        """
+        whole: int = math.floor(seconds)
+        text: str = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(whole))
+        milliseconds: int = round((seconds - whole) * 1000)
+        if milliseconds:
+            text += ".{:03d}".format(milliseconds)
+        return text + "Z"
@@ -0,0 +1,95 @@
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from Piloton.Types.AutoPause import AutoPause
+from Piloton.Types.Device import Device
+from Piloton.Types.HeartZone import HeartZone
+from Piloton.Types.HeartZones import HeartZones
+from Piloton.Types.MetricsSnapshot import MetricsSnapshot
+from Piloton.Types.PowerCurve import PowerCurve
+from Piloton.Types.PowerZone import PowerZone
+from Piloton.Types.PowerZones import PowerZones
+from Piloton.Types.Resampler import Resampler
+from Piloton.Types.TrainingData import TrainingData
+
+# Only import when type_checking
+if TYPE_CHECKING:
+    from Piloton.Devices.Bike import Bike
+    from Piloton.Devices.HRM import HRM
+
+
+class Rider:
+    """
+    A rider in studio mode, with their own bike, heart rate monitor, zones, and resistance model
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bike: "Bike",
+        hrm: "HRM",
+        heart_zones: HeartZones,
+        power_zones: PowerZones,
+        training_data: TrainingData,
+    ):
+        """
+        Initialize Rider
+
+        :param str name: Rider name, used to tag their data points
+        :param Bike bike: Rider's bike
+        :param HRM hrm: Rider's heart rate monitor
+        :param HeartZones heart_zones: Rider's heart zones
+        :param PowerZones power_zones: Rider's power zones
+        :param TrainingData training_data: Training data for the rider's bike
+        """
+        self.name: str = name
+        self.bike: "Bike" = bike
+        self.hrm: "HRM" = hrm
+        self.heart_zone: HeartZone = HeartZone.NO_ZONE
+        self.heart_zones: HeartZones = heart_zones
+        self.power_zone: PowerZone = PowerZone.NO_ZONE
+        self.power_zones: PowerZones = power_zones
+        self.training_data: TrainingData = training_data
+        self.snapshot: MetricsSnapshot = MetricsSnapshot()
+        self.power_curve: PowerCurve = PowerCurve()
+
+        # Session tags, set when a studio session starts
+        self.session_id: str = ""
+        self.bike_tags: Dict[str, str] = {}
+        self.hrm_tags: Dict[str, str] = {}
+        self.resampler: Optional[Resampler] = None  # Combines bike and HRM samples, unless writing raw
+        self.auto_pause: AutoPause = AutoPause(0.0)
+
+    @property
+    def devices(self) -> List[Device]:
+        return [self.bike, self.hrm]
+
+    def start_session(self) -> str:
+        """
+        Start a new session, tagging the rider's data points with it
+
+        :return: Session ID
+        :rtype: str
+        """
+        self.session_id = uuid.uuid4().hex
+        self.power_curve = PowerCurve()
+        self.hrm.hrv.clear()
+        self.bike_tags = {"session": self.session_id, "rider": self.name, "device": self.bike.name}
+        self.hrm_tags = {"session": self.session_id, "rider": self.name, "device": self.hrm.name}
+        return self.session_id
+
+    def update_snapshot(self) -> None:
+        """
+        Swap in a new snapshot of the rider's latest metrics
+        """
+        self.snapshot = MetricsSnapshot(
+            cadence=self.bike.cadence,
+            resistance=self.bike.resistance,
+            power=self.bike.power,
+            speed=self.bike.speed,
+            heart_rate=self.hrm.heart_rate,
+            rmssd=self.hrm.hrv.rmssd,
+            heart_zone=self.heart_zone,
+            power_zone=self.power_zone,
+            paused=self.auto_pause.paused,
+        )
@@ -0,0 +1,62 @@
+from typing import Tuple, Union
+
+
+class BikeSample:
+    """
+    One Indoor Bike Data notification. Slotted, so the many created a second each cost one small allocation.
+    """
+
+    __slots__ = ("timestamp", "cadence", "power", "speed", "resistance")
+
+    def __init__(self, timestamp: float, cadence: int, power: int, speed: float, resistance: int):
+        """
+        Initialize Bike Sample
+
+        :param float timestamp: Seconds since the epoch the notification arrived at
+        :param int cadence: Cadence (RPM)
+        :param int power: Power (W)
+        :param float speed: Speed (mph)
+        :param int resistance: Predicted resistance, or 0 if the bike isn't trained
+        """
+        self.timestamp: float = timestamp
+        self.cadence: int = cadence
+        self.power: int = power
+        self.speed: float = speed
+        self.resistance: int = resistance
+
+    def __repr__(self) -> str:
+        return (
+            f"BikeSample(timestamp={self.timestamp!r}, cadence={self.cadence!r}, power={self.power!r}, "
+            f"speed={self.speed!r}, resistance={self.resistance!r})"
+        )
+
+
+class HeartRateSample:
+    """
+    One Heart Rate Measurement notification. Slotted, like BikeSample.
+    """
+
+    __slots__ = ("timestamp", "heart_rate", "rr_intervals", "rmssd")
+
+    def __init__(self, timestamp: float, heart_rate: int, rr_intervals: Tuple[int, ...], rmssd: float):
+        """
+        Initialize Heart Rate Sample
+
+        :param float timestamp: Seconds since the epoch the notification arrived at
+        :param int heart_rate: Heart rate (BPM)
+        :param Tuple[int, ...] rr_intervals: RR-intervals in this notification (1/1024 s), oldest first
+        :param float rmssd: RMSSD over the HRV window so far (ms)
+        """
+        self.timestamp: float = timestamp
+        self.heart_rate: int = heart_rate
+        self.rr_intervals: Tuple[int, ...] = rr_intervals
+        self.rmssd: float = rmssd
+
+    def __repr__(self) -> str:
+        return (
+            f"HeartRateSample(timestamp={self.timestamp!r}, heart_rate={self.heart_rate!r}, "
+            f"rr_intervals={self.rr_intervals!r}, rmssd={self.rmssd!r})"
+        )
+
+
+Sample = Union[BikeSample, HeartRateSample]
@@ -0,0 +1,176 @@
+import math
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from Piloton.Types.HeartZone import HeartZone
+from Piloton.Types.MetricsSnapshot import MetricsSnapshot
+from Piloton.Types.PowerZone import PowerZone
+
+
+class SampleRing:
+    """
+    Fixed-size ring of samples in shared memory, written by one process and read by any number of others, each at
+    its own pace. Every record has the same layout (RECORD), so writing one is a single copy into a numpy structured
+    array, with no pickling or locks. Readers that fall more than a ring behind lose the oldest samples, and the
+    writer never waits for them.
+
+    Each record carries its sequence number. A reader copies what's new, then checks which of the copied records
+    could have been overwritten while it was copying, and drops them.
+    """
+
+    # Which device a sample came from
+    BIKE: int = 1
+    HRM: int = 2
+
+    RECORD: np.dtype = np.dtype(
+        [
+            ("seq", "<u8"),
+            ("timestamp", "<f8"),  # Seconds since the epoch
+            ("speed", "<f4"),  # mph
+            ("rmssd", "<f4"),  # ms
+            ("sdnn", "<f4"),  # ms, NaN until there are enough RR-intervals for HRV
+            ("cadence", "<u2"),  # RPM
+            ("power", "<i2"),  # W, signed as the bike sends it
+            ("resistance", "<u2"),
+            ("heart_rate", "<u2"),  # BPM
+            ("kind", "u1"),  # BIKE or HRM
+            ("paused", "u1"),
+            ("heart_zone", "u1"),
+            ("power_zone", "u1"),
+        ]
+    )
+
+    # Header: next sequence number, closed flag, and capacity, padded to a cache line
+    _HEADER_SIZE: int = 64
+
+    def __init__(self, capacity: int = 4096, name: Optional[str] = None):
+        """
+        Initialize Sample Ring, creating it or attaching to one another process created
+
+        :param int capacity: Most samples held (ignored when attaching)
+        :param Optional[str] name: Shared memory name of a ring to attach to, or None to create one
+        """
+        self.owner: bool = name is None
+        if self.owner:
+            self._memory: SharedMemory = SharedMemory(
+                create=True, size=self._HEADER_SIZE + capacity * self.RECORD.itemsize
+            )
+        else:
+            self._memory = SharedMemory(name=name)
+
+        self._header: np.ndarray = np.ndarray((3,), dtype="<u8", buffer=self._memory.buf)
+        if self.owner:
+            self._header[:] = (0, 0, capacity)
+        self.capacity: int = int(self._header[2])
+        self._records: np.ndarray = np.ndarray(
+            (self.capacity,), dtype=self.RECORD, buffer=self._memory.buf, offset=self._HEADER_SIZE
+        )
+
+        # Writer's next sequence number
+        self._seq: int = int(self._header[0])
+
+    @property
+    def name(self) -> str:
+        """
+        Shared memory name, for other processes to attach with
+        """
+        return self._memory.name
+
+    @property
+    def closed(self) -> bool:
+        """
+        True, once the writer has written its last sample
+        """
+        return bool(self._header[1])
+
+    def write(self, kind: int, timestamp: float, snapshot: MetricsSnapshot, sdnn: float = math.nan) -> None:
+        """
+        Write a sample, overwriting the oldest once the ring is full
+
+        :param int kind: BIKE or HRM
+        :param float timestamp: Seconds since the epoch the sample arrived at
+        :param MetricsSnapshot snapshot: Metrics after the sample
+        :param float sdnn: SDNN (ms), or NaN without HRV
+        """
+        seq: int = self._seq
+        self._records[seq % self.capacity] = (
+            seq,
+            timestamp,
+            snapshot.speed,
+            snapshot.rmssd,
+            sdnn,
+            snapshot.cadence,
+            snapshot.power,
+            snapshot.resistance,
+            snapshot.heart_rate,
+            kind,
+            snapshot.paused,
+            snapshot.heart_zone.value,
+            snapshot.power_zone.value,
+        )
+
+        # Publish the record only once it's written
+        self._seq = seq + 1
+        self._header[0] = self._seq
+
+    def read(self, cursor: int) -> Tuple[np.ndarray, int, int]:
+        """
+        Read the samples written since a cursor
+
+        :param int cursor: Sequence number of the first sample wanted (0: from the start)
+        :return: Copies of the samples, oldest first, the cursor to read from next, and how many samples were lost
+            to falling behind
+        """
+        end: int = int(self._header[0])
+        start: int = max(cursor, end - self.capacity)
+        if start >= end:
+            return self._records[:0].copy(), end, start - cursor
+
+        expected: np.ndarray = np.arange(start, end, dtype=np.uint64)
+        records: np.ndarray = self._records[expected % self.capacity]
+
+        # The writer may have lapped the oldest records while they were being copied
+        oldest: int = int(self._header[0]) - self.capacity + 1
+        valid: np.ndarray = (records["seq"] == expected) & (expected >= max(oldest, 0))
+        if not valid.all():
+            records = records[valid]
+        return records, end, start - cursor + int(np.count_nonzero(~valid))
+
+    @staticmethod
+    def to_snapshot(record: np.void) -> MetricsSnapshot:
+        """
+        Convert a record back to a metrics snapshot, e.g. for a display in another process
+
+        :param np.void record: Sample record
+        :return: Metrics snapshot
+        :rtype: MetricsSnapshot
+        """
+        return MetricsSnapshot(
+            cadence=int(record["cadence"]),
+            resistance=int(record["resistance"]),
+            power=int(record["power"]),
+            speed=float(record["speed"]),
+            heart_rate=int(record["heart_rate"]),
+            rmssd=float(record["rmssd"]),
+            heart_zone=HeartZone(int(record["heart_zone"])),
+            power_zone=PowerZone(int(record["power_zone"])),
+            paused=bool(record["paused"]),
+        )
+
+    def close(self) -> None:
+        """
+        Mark the ring closed, telling readers no more samples are coming
+        """
+        self._header[1] = 1
+
+    def release(self) -> None:
+        """
+        Detach from the shared memory, freeing it if this process created the ring
+        """
+        # Views of the buffer have to go before it can be closed
+        del self._header, self._records
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import base64
+import binascii
+import tempfile
+from array import array
+from typing import Any, Dict, List, Optional
+
+from Piloton.Types.AutoPause import AutoPause
+from Piloton.Types.Device import Device
+from Piloton.Types.PowerCurve import PowerCurve
+from Piloton.Types.WorkoutPlan import WorkoutPlan
+from Piloton.Types.WorkoutScheduler import WorkoutScheduler
+
+
+class SessionCheckpoint:
+    """
+    Running state of a workout in progress, saved every few seconds so a crash or reboot doesn't lose the ride. It's
+    kept compact: the power curve is stored as its per-second series (2 bytes a second, base64 encoded) and rebuilt
+    on resume, and everything else is a handful of numbers. Device addresses are kept too, so resuming reconnects
+    without scanning.
+    """
+
+    VERSION: int = 1
+
+    def __init__(
+        self,
+        session_id: str,
+        rider: str,
+        elapsed: float,
+        paused: float = 0.0,
+        pauses: int = 0,
+        series: Optional[array] = None,
+        addresses: Optional[Dict[str, str]] = None,
+        plan: Optional[Dict[str, Any]] = None,
+        workout_elapsed: float = 0.0,
+        samples: Optional[List[int]] = None,
+        on_target: Optional[List[int]] = None,
+        saved: Optional[float] = None,
+    ):
+        """
+        Initialize Session Checkpoint
+
+        :param str session_id: Session ID
+        :param str rider: Rider name
+        :param float elapsed: Seconds since the session started, not counting time Piloton wasn't running
+        :param float paused: Seconds of elapsed spent auto-paused
+        :param int pauses: Number of auto-pauses
+        :param Optional[array] series: Power curve's power per second (W)
+        :param Optional[Dict[str, str]] addresses: Device name: BLE address
+        :param Optional[Dict[str, Any]] plan: Structured workout, as WorkoutPlan.to_json, if one is running
+        :param float workout_elapsed: Seconds since the structured workout started
+        :param Optional[List[int]] samples: Power samples per structured workout step
+        :param Optional[List[int]] on_target: Power samples on target per structured workout step
+        :param Optional[float] saved: Seconds since the epoch the checkpoint was taken at (default: now)
+        """
+        self.session_id: str = session_id
+        self.rider: str = rider
+        self.elapsed: float = elapsed
+        self.paused: float = paused
+        self.pauses: int = pauses
+        self.series: array = series if series is not None else array("H")
+        self.addresses: Dict[str, str] = addresses or {}
+        self.plan: Optional[Dict[str, Any]] = plan
+        self.workout_elapsed: float = workout_elapsed
+        self.samples: List[int] = samples or []
+        self.on_target: List[int] = on_target or []
+        self.saved: float = saved if saved is not None else time.time()
+
+    @classmethod
+    def capture(
+        cls,
+        session_id: str,
+        rider: str,
+        started: float,
+        now: float,
+        auto_pause: AutoPause,
+        power_curve: PowerCurve,
+        devices: List[Device],
+        workout: Optional[WorkoutScheduler] = None,
+    ) -> "SessionCheckpoint":
+        """
+        Take a checkpoint of a running workout
+
+        :param str session_id: Session ID
+        :param str rider: Rider name
+        :param float started: Monotonic time the session started at
+        :param float now: Monotonic time
+        :param AutoPause auto_pause: Session's auto-pause
+        :param PowerCurve power_curve: Session's power curve
+        :param List[Device] devices: Devices the session is using
+        :param Optional[WorkoutScheduler] workout: Structured workout, if one is running
+        :return: Session checkpoint
+        :rtype: SessionCheckpoint
+        """
+        checkpoint = cls(
+            session_id,
+            rider,
+            now - started,
+            auto_pause.paused_time(now),
+            auto_pause.pauses,
+            array("H", power_curve.series),
+            {device.name: device.ble_address for device in devices if device.ble_address},
+        )
+        if workout is not None and workout.started is not None:
+            checkpoint.plan = workout.plan.to_json()
+            checkpoint.workout_elapsed = now - workout.started
+            checkpoint.samples = list(workout.samples)
+            checkpoint.on_target = list(workout.on_target)
+        return checkpoint
+
+    def power_curve(self) -> PowerCurve:
+        """
+        Rebuild the session's power curve
+
+        :return: Power curve, continuing from the checkpoint's last second
+        :rtype: PowerCurve
+        """
+        return PowerCurve.from_series(self.series)
+
+    def workout(self, now: float) -> Optional[WorkoutScheduler]:
+        """
+        Rebuild the structured workout, started so its clock picks up where it left off
+
+        :param float now: Monotonic time
+        :return: Workout scheduler, if a structured workout was running
+        :rtype: Optional[WorkoutScheduler]
+        """
+        if self.plan is None:
+            return None
+
+        workout = WorkoutScheduler(WorkoutPlan.from_json(self.plan))
+        workout.start(now - self.workout_elapsed)
+        if len(self.samples) == len(workout.plan) and len(self.on_target) == len(workout.plan):
+            workout.samples, workout.on_target = list(self.samples), list(self.on_target)
+        return workout
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Convert to a JSON-serializable dict
+
+        :return: Checkpoint
+        :rtype: Dict[str, Any]
+        """
+        workout: Optional[Dict[str, Any]] = None
+        if self.plan is not None:
+            workout = {
+                "plan": self.plan,
+                "elapsed": round(self.workout_elapsed, 3),
+                "samples": self.samples,
+                "on_target": self.on_target,
+            }
+
+        return {
+            "version": self.VERSION,
+            "saved": self.saved,
+            "session": self.session_id,
+            "rider": self.rider,
+            "elapsed": round(self.elapsed, 3),
+            "paused": round(self.paused, 3),
+            "pauses": self.pauses,
+            "power": base64.b64encode(self.series.tobytes()).decode("ascii"),
+            "addresses": self.addresses,
+            "workout": workout,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SessionCheckpoint":
+        """
+        Load a checkpoint from a dict written by to_json
+
+        :param Dict[str, Any] data: Checkpoint
+        :return: Session checkpoint
+        :rtype: SessionCheckpoint
+        :raises ValueError: If the checkpoint is from a different version
+        """
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported checkpoint version ({data.get('version')})")
+
+        series: array = array("H")
+        series.frombytes(base64.b64decode(data["power"]))
+        workout: Dict[str, Any] = data.get("workout") or {}
+        return cls(
+            data["session"],
+            data["rider"],
+            float(data["elapsed"]),
+            float(data["paused"]),
+            int(data["pauses"]),
+            series,
+            dict(data["addresses"]),
+            workout.get("plan"),
+            float(workout.get("elapsed", 0.0)),
+            list(workout.get("samples", [])),
+            list(workout.get("on_target", [])),
+            float(data["saved"]),
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the checkpoint to a temporary file and swap it in, so a crash mid-write leaves the last checkpoint
+        intact
+
+        :param str path: Checkpoint file path
+        """
+        fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".checkpoint-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(self.to_json(), fh, separators=(",", ":"))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SessionCheckpoint"]:
+        """
+        Read a checkpoint file
+
+        :param str path: Checkpoint file path
+        :return: Session checkpoint, or None if there isn't one
+        :rtype: Optional[SessionCheckpoint]
+        :raises ValueError: If the file is unreadable
+        """
+        try:
+            with open(path, "r") as fh:
+                data: Dict[str, Any] = json.load(fh)
+        except FileNotFoundError:
+            return None
+
+        try:
+            return cls.from_json(data)
+        except (KeyError, TypeError, binascii.Error) as error:
+            raise ValueError(f"Malformed checkpoint: {error!r}") from error
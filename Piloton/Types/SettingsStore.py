@@ -0,0 +1,192 @@
+import os
+import json
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Any, Callable, ClassVar, DefaultDict, Dict, List, Optional
+
+from Piloton.Mixins import LoggingMixin
+
+
+class SettingsStore(LoggingMixin):  # type: ignore
+    """
+    In-memory copy of a JSON settings file. Changes are written back atomically, and only the fields that actually
+    changed are passed to their subscribers, whether they were changed by a form or by editing the file.
+    """
+
+    # One store per file, so forms and Piloton share the same settings
+    _stores: ClassVar[Dict[str, "SettingsStore"]] = {}
+    _stores_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: str):
+        """
+        Initialize Settings Store. Use SettingsStore.open to share a store for the same file.
+
+        :param str path: Path to JSON settings file
+        """
+        # Call to Super
+        super().__init__()
+
+        self.path: str = os.path.abspath(path)
+        self._lock: threading.RLock = threading.RLock()
+        self._subscribers: DefaultDict[str, List[Callable[[Any], None]]] = defaultdict(list)
+        self._watcher: Optional[threading.Thread] = None
+        self._watching: threading.Event = threading.Event()
+
+        # Load settings
+        self._mtime: int = os.stat(self.path).st_mtime_ns
+        with open(self.path, "r") as fh:
+            self._settings: Dict[str, Any] = json.load(fh)
+
+    @classmethod
+    def open(cls, path: str) -> "SettingsStore":
+        """
+        Get the store for a settings file, loading it the first time
+
+        :param str path: Path to JSON settings file
+        :return: Settings store
+        :rtype: SettingsStore
+        """
+        key: str = os.path.abspath(path)
+        with cls._stores_lock:
+            if key not in cls._stores:
+                cls._stores[key] = cls(key)
+            return cls._stores[key]
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            return self._settings[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a setting
+
+        :param str key: Setting name
+        :param Any default: Value if the setting is missing
+        :return: Setting value
+        """
+        with self._lock:
+            return self._settings.get(key, default)
+
+    def subscribe(self, key: str, callback: Callable[[Any], None]) -> None:
+        """
+        Call callback with the new value whenever a setting changes
+
+        :param str key: Setting name
+        :param Callable callback: Called with the new value
+        """
+        with self._lock:
+            self._subscribers[key].append(callback)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Change a setting, writing it back to the settings file
+
+        :param str key: Setting name
+        :param Any value: New value
+        """
+        self.update({key: value})
+
+    def update(self, settings: Dict[str, Any]) -> None:
+        """
+        Change settings, writing them back to the settings file
+
+        :param Dict[str, Any] settings: Setting names and new values
+        """
+        with self._lock:
+            changed: Dict[str, Any] = self._apply(settings)
+            if changed:
+                self._write()
+
+    def reload(self) -> bool:
+        """
+        Reread the settings file, if it has changed on disk, and apply the fields that differ
+
+        :return: True, if the file had changed. False, else.
+        :rtype: bool
+        """
+        with self._lock:
+            try:
+                mtime: int = os.stat(self.path).st_mtime_ns
+                if mtime == self._mtime:
+                    return False
+
+                with open(self.path, "r") as fh:
+                    settings: Dict[str, Any] = json.load(fh)
+            except (OSError, ValueError) as error:
+                # Likely mid-save in an editor; try again on the next poll
+                self.logger.warning("Unable to reload settings (%s): %s", self.path, error)
+                return False
+
+            self._mtime = mtime
+            changed: Dict[str, Any] = self._apply(settings)
+            if changed:
+                self.logger.info("Settings reloaded (%s): %s", os.path.basename(self.path), ", ".join(changed))
+            return True
+
+    def _apply(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store settings and notify the subscribers of the fields that changed
+
+        :param Dict[str, Any] settings: Setting names and values
+        :return: Settings that changed
+        :rtype: Dict[str, Any]
+        """
+        changed: Dict[str, Any] = {
+            key: value for key, value in settings.items() if key not in self._settings or self._settings[key] != value
+        }
+        self._settings.update(changed)
+
+        for key, value in changed.items():
+            for callback in self._subscribers[key]:
+                callback(value)
+
+        return changed
+
+    def _write(self) -> None:
+        """
+        Write settings to a temporary file and swap it in, so the settings file is never half-written
+        """
+        directory: str = os.path.dirname(self.path)
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".settings-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(self._settings, fh, indent=4)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.chmod(temporary_path, os.stat(self.path).st_mode)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+        # Don't reload our own write
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def watch(self, interval: float = 1.0) -> None:
+        """
+        Start a background thread that reloads the settings file when it changes on disk
+
+        :param float interval: Seconds between checks
+        """
+        if self._watcher is not None:
+            return
+
+        def _watch() -> None:
+            while not self._watching.wait(interval):
+                self.reload()
+
+        self._watcher = threading.Thread(target=_watch, name=f"settings-{os.path.basename(self.path)}", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """
+        Stop the background watcher
+        """
+        if self._watcher is None:
+            return
+
+        self._watching.set()
+        self._watcher.join()
+        self._watcher = None
+        self._watching.clear()
@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional
+
+
+class Storage:
+    """
+    Where Piloton records data points. Points are dicts of measurement, tags, time, and fields, as written to
+    InfluxDBClient.write_points.
+    """
+
+    def write_points(self, points: List[Dict], batch_size: Optional[int] = None) -> bool:
+        """
+        Write data points
+
+        :param List[Dict] points: Data points with measurement, tags, time, and fields
+        :param Optional[int] batch_size: Most points per write
+        :return: True, if written
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+    def list_sessions(self, rider: Optional[str] = None) -> List[str]:
+        """
+        List recorded sessions
+
+        :param Optional[str] rider: Only list this rider's sessions
+        :return: Session IDs
+        :rtype: List[str]
+        """
+        raise NotImplementedError
+
+    def query_session(self, measurement: str, session: str, limit: int, offset: int = 0) -> List[Dict]:
+        """
+        Read a page of a session's points, oldest first
+
+        :param str measurement: Measurement to read
+        :param str session: Session ID
+        :param int limit: Most points to read
+        :param int offset: Points to skip
+        :return: Points as dicts of time (RFC3339), tags, and fields
+        :rtype: List[Dict]
+        """
+        raise NotImplementedError
+
+    def query_range(
+        self,
+        measurement: str,
+        start: int,
+        end: int,
+        limit: int,
+        session: Optional[str] = None,
+        retention_policy: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Read a page of the points in a time range, oldest first. Page through a range by starting the next page at
+        the last time read.
+
+        :param str measurement: Measurement to read
+        :param int start: First time (nanoseconds since the epoch)
+        :param int end: Time to read up to, not included (nanoseconds since the epoch)
+        :param int limit: Most points to read
+        :param Optional[str] session: Only read this session's points
+        :param Optional[str] retention_policy: Retention policy to read, for storage that has them (default: the
+            default policy)
+        :return: Points as dicts of time (nanoseconds since the epoch), tags, and fields
+        :rtype: List[Dict]
+        """
+        raise NotImplementedError
+
+    def retention_policies(self) -> Dict[str, int]:
+        """
+        List the retention policies points are kept in, for storage that has them
+
+        :return: How long each policy keeps points (nanoseconds, 0: forever), by name
+        :rtype: Dict[str, int]
+        """
+        return {}
+
+    def flush(self) -> None:
+        """
+        Write any buffered points now
+        """
+
+    def close(self) -> None:
+        """
+        Write anything pending and release the backend
+        """
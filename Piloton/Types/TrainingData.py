@@ -0,0 +1,154 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class TrainingData:
+    """
+    Samples of (Cadence, Power, Speed) collected at a known Resistance, used to train the resistance classifier.
+    Samples are stored as rows of preallocated arrays, so the classifier inputs and classifications can be handed
+    to the classifier as views without copying. A resistance x cadence x sample-slot index of rows keeps per
+    resistance-cadence lookups cheap.
+    """
+
+    RESISTANCES: range = range(0, 100)
+    CADENCES: range = range(20, 131)
+
+    # To somewhat curb overfitting, there's a hard limit of samples per resistance-cadence.
+    SAMPLE_LIMIT: int = 26
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Initialize Training Data
+
+        :param int capacity: Number of samples to allocate room for up front. Grows as needed.
+        """
+        self.size: int = 0
+
+        # Rows of [Cadence, Power, Speed] => Resistance
+        self._inputs: np.ndarray = np.zeros((capacity, 3), dtype=np.float64)
+        self._classifications: np.ndarray = np.zeros(capacity, dtype=np.int16)
+
+        # Number of samples and their rows, by resistance-cadence
+        shape: Tuple[int, int] = (len(self.RESISTANCES), len(self.CADENCES))
+        self._counts: np.ndarray = np.zeros(shape, dtype=np.int16)
+        self._rows: np.ndarray = np.zeros(shape + (self.SAMPLE_LIMIT,), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _index(self, resistance: int, cadence: int) -> Tuple[int, int]:
+        """
+        Convert resistance and cadence to an index into the count and row arrays
+
+        :param int resistance: Resistance
+        :param int cadence: Cadence (RPM)
+        :return: Index, or (-1, -1) if either value is out of range
+        """
+        if resistance in self.RESISTANCES and cadence in self.CADENCES:
+            return resistance - self.RESISTANCES.start, cadence - self.CADENCES.start
+        return -1, -1
+
+    def count(self, resistance: int, cadence: int) -> int:
+        """
+        Count samples collected for a resistance-cadence
+
+        :param int resistance: Resistance
+        :param int cadence: Cadence (RPM)
+        :return: Number of samples
+        :rtype: int
+        """
+        r, c = self._index(resistance, cadence)
+        if r < 0:
+            return 0
+        return int(self._counts[r, c])
+
+    def cadence_counts(self, resistance: int) -> Dict[int, int]:
+        """
+        Count samples collected for every cadence at a resistance, as a copy another thread can read
+
+        :param int resistance: Resistance
+        :return: Number of samples, by cadence
+        :rtype: Dict[int, int]
+        """
+        if resistance not in self.RESISTANCES:
+            return {}
+        return dict(zip(self.CADENCES, self._counts[resistance - self.RESISTANCES.start].tolist()))
+
+    def append(self, resistance: int, cadence: int, power: float, speed: float) -> bool:
+        """
+        Add a sample, unless the resistance-cadence is out of range or full
+
+        :param int resistance: Resistance
+        :param int cadence: Cadence (RPM)
+        :param float power: Power (W)
+        :param float speed: Speed (mph)
+        :return: True, if the sample was added. False, else.
+        :rtype: bool
+        """
+        r, c = self._index(resistance, cadence)
+        if r < 0 or self._counts[r, c] >= self.SAMPLE_LIMIT:
+            return False
+
+        # Double capacity when full
+        if self.size == len(self._classifications):
+            self._inputs = np.concatenate((self._inputs, np.zeros_like(self._inputs)))
+            self._classifications = np.concatenate((self._classifications, np.zeros_like(self._classifications)))
+
+        self._inputs[self.size] = (cadence, power, speed)
+        self._classifications[self.size] = resistance
+        self._rows[r, c, self._counts[r, c]] = self.size
+        self._counts[r, c] += 1
+        self.size += 1
+        return True
+
+    def samples(self, resistance: int, cadence: int) -> List[Tuple[int, float]]:
+        """
+        Get the samples collected for a resistance-cadence
+
+        :param int resistance: Resistance
+        :param int cadence: Cadence (RPM)
+        :return: (Power, Speed) samples
+        """
+        r, c = self._index(resistance, cadence)
+        if r < 0:
+            return []
+
+        rows: np.ndarray = self._rows[r, c, : self._counts[r, c]]
+        return [(int(power), float(speed)) for power, speed in self._inputs[rows, 1:]]
+
+    def matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get classifier inputs and classifications. These are views of the underlying arrays, not copies.
+
+        :return: Inputs of [Cadence, Power, Speed] and Resistance classifications
+        """
+        return self._inputs[: self.size], self._classifications[: self.size]
+
+    def to_json(self) -> Dict[str, Dict[str, List[Tuple[int, float]]]]:
+        """
+        Convert to the training.json layout: {resistance: {cadence: [[power, speed], ...]}}
+
+        :return: JSON-serializable training data
+        """
+        return {
+            str(resistance): {str(cadence): self.samples(resistance, cadence) for cadence in self.CADENCES}
+            for resistance in self.RESISTANCES
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Dict[str, List[List[float]]]]) -> "TrainingData":
+        """
+        Load from the training.json layout
+
+        :param data: Training data as loaded from json
+        :return: Training Data
+        :rtype: TrainingData
+        """
+        training_data = cls()
+        for resistance, cadences in data.items():
+            for cadence, power_speed_readings in cadences.items():
+                for power, speed in power_speed_readings:
+                    training_data.append(int(resistance), int(cadence), power, speed)
+
+        return training_data
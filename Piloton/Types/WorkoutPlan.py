@@ -0,0 +1,123 @@
+from math import isfinite
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from Piloton.Types.PowerZone import PowerZone
+from Piloton.Types.PowerZones import PowerZones
+
+
+class WorkoutStep(NamedTuple):
+    """
+    One step of a structured workout, with a power target either relative to FTP or in Watts
+    """
+
+    name: str
+    duration: int  # Seconds
+    low: float  # Fraction of FTP, or Watts
+    high: float  # Fraction of FTP, or Watts
+    relative: bool = True  # True, if low and high are fractions of FTP
+
+    def target(self, ftp: int) -> Tuple[int, float]:
+        """
+        Get the step's power target
+
+        :param int ftp: User Functional Threshold Power (FTP)
+        :return: Lowest and highest power (W) on target. Highest is inf for an open-ended target.
+        :rtype: Tuple[int, float]
+        """
+        scale: int = ftp if self.relative else 1
+        high: float = self.high * scale
+        return round(self.low * scale), round(high) if isfinite(high) else high
+
+
+class WorkoutPlan:
+    """
+    Structured workout: warm-up, intervals, recovery, and so on, loaded from a workout file. Each step has a
+    duration and one target:
+
+        {"name": "Warm Up", "duration": 300, "zone": "ENDURANCE"}
+        {"name": "Interval", "duration": 120, "ftp": [1.05, 1.20]}
+        {"name": "Sprint", "duration": 30, "power": [400, 600]}
+    """
+
+    def __init__(self, name: str, steps: List[WorkoutStep]):
+        """
+        Initialize Workout Plan
+
+        :param str name: Workout name
+        :param List[WorkoutStep] steps: Workout steps, in order
+        """
+        self.name: str = name
+        self.steps: List[WorkoutStep] = steps
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    @property
+    def duration(self) -> int:
+        """
+        Total workout length in seconds
+        """
+        return sum(step.duration for step in self.steps)
+
+    @staticmethod
+    def _zone_target(zone_name: str) -> Tuple[float, float]:
+        """
+        Get a power zone's range as fractions of FTP
+
+        :param str zone_name: Power zone name, e.g. "TEMPO"
+        :return: Lowest and highest fraction of FTP in the zone
+        :rtype: Tuple[float, float]
+        """
+        zone: PowerZone = PowerZone[zone_name.upper()]
+        if zone == PowerZone.NO_ZONE:
+            raise ValueError("A step's zone can't be NO_ZONE")
+
+        low: float = max(PowerZones.ZONES[PowerZone(zone.value - 1)], 0.0)
+        high: float = PowerZones.ZONES[zone]
+        return low, high
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "WorkoutPlan":
+        """
+        Load a workout plan from a workout file's contents
+
+        :param Dict[str, Any] data: Workout name and steps
+        :return: Workout plan
+        :rtype: WorkoutPlan
+        """
+        steps: List[WorkoutStep] = []
+        for step in data["steps"]:
+            if "zone" in step:
+                low, high = cls._zone_target(step["zone"])
+                steps.append(WorkoutStep(step["name"], int(step["duration"]), low, high))
+            elif "ftp" in step or "power" in step:
+                # Targets are a [low, high] pair, of fractions of FTP or watts
+                relative: bool = "ftp" in step
+                target: List[float] = step["ftp"] if relative else step["power"]
+                if not isinstance(target, list) or len(target) != 2:
+                    raise ValueError(f"Workout step ({step['name']}) target must be [low, high]")
+                low, high = target
+                steps.append(WorkoutStep(step["name"], int(step["duration"]), float(low), float(high), relative))
+            else:
+                raise ValueError(f"Workout step ({step['name']}) has no zone, ftp, or power target")
+
+        return cls(data["name"], steps)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Convert to a workout file's contents. Zone targets are written as the fractions of FTP they stand for.
+
+        :return: Workout name and steps
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "name": self.name,
+            "steps": [
+                {
+                    "name": step.name,
+                    "duration": step.duration,
+                    "ftp" if step.relative else "power": [step.low, step.high],
+                }
+                for step in self.steps
+            ],
+        }
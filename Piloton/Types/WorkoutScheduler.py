@@ -0,0 +1,120 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, NamedTuple, Optional
+
+from Piloton.Types.WorkoutPlan import WorkoutPlan, WorkoutStep
+
+
+class WorkoutStatus(NamedTuple):
+    """
+    Where a structured workout is at
+    """
+
+    step_index: int  # Current step, or len(plan) when finished
+    step: Optional[WorkoutStep]  # None, when finished
+    remaining: float  # Seconds left in the current step
+    compliance: float  # Fraction of the current step's samples on target
+
+    @property
+    def finished(self) -> bool:
+        return self.step is None
+
+
+class WorkoutScheduler:
+    """
+    Runs a workout plan against the monotonic clock. The current step is always computed from the time since the
+    workout started, never by counting sleeps, so step transitions don't drift when the event loop is busy.
+    """
+
+    def __init__(self, plan: WorkoutPlan):
+        """
+        Initialize Workout Scheduler
+
+        :param WorkoutPlan plan: Workout to run
+        """
+        self.plan: WorkoutPlan = plan
+
+        # Seconds from the start of the workout to the end of each step
+        self.boundaries: List[int] = list(accumulate(step.duration for step in plan.steps))
+        self.started: Optional[float] = None
+
+        # Power samples per step, and how many were on target
+        self.samples: List[int] = [0] * len(plan)
+        self.on_target: List[int] = [0] * len(plan)
+
+    def start(self, now: float) -> None:
+        """
+        Start the workout
+
+        :param float now: Monotonic time the workout starts at
+        """
+        self.started = now
+
+    def step_index(self, now: float) -> int:
+        """
+        Get the step the workout is on
+
+        :param float now: Monotonic time
+        :return: Index of the current step, or len(plan) when finished
+        :rtype: int
+        """
+        if self.started is None:
+            return 0
+        return bisect_right(self.boundaries, now - self.started)
+
+    def next_transition(self, now: float) -> Optional[float]:
+        """
+        Get when the current step ends
+
+        :param float now: Monotonic time
+        :return: Monotonic time the current step ends, or None when finished or not started
+        :rtype: Optional[float]
+        """
+        index: int = self.step_index(now)
+        if self.started is None or index >= len(self.plan):
+            return None
+        return self.started + self.boundaries[index]
+
+    def record(self, power: int, now: float, ftp: int) -> None:
+        """
+        Record a power sample against the current step's target
+
+        :param int power: Power (W)
+        :param float now: Monotonic time of the sample
+        :param int ftp: User Functional Threshold Power (FTP), for targets relative to it
+        """
+        index: int = self.step_index(now)
+        if self.started is None or index >= len(self.plan):
+            return
+
+        low, high = self.plan.steps[index].target(ftp)
+        self.samples[index] += 1
+        if low <= power <= high:
+            self.on_target[index] += 1
+
+    def compliance(self, index: int) -> float:
+        """
+        Get a step's target compliance
+
+        :param int index: Step index
+        :return: Fraction of the step's samples on target (0 before any samples)
+        :rtype: float
+        """
+        if not self.samples[index]:
+            return 0.0
+        return self.on_target[index] / self.samples[index]
+
+    def status(self, now: float) -> WorkoutStatus:
+        """
+        Get the current step, time remaining in it, and its target compliance so far
+
+        :param float now: Monotonic time
+        :return: Workout status
+        :rtype: WorkoutStatus
+        """
+        index: int = self.step_index(now)
+        if index >= len(self.plan):
+            return WorkoutStatus(index, None, 0.0, 0.0)
+
+        elapsed: float = 0.0 if self.started is None else now - self.started
+        return WorkoutStatus(index, self.plan.steps[index], self.boundaries[index] - elapsed, self.compliance(index))
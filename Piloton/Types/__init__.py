@@ -1,11 +1,30 @@
+from Piloton.Types.AutoPause import AutoPause
 from Piloton.Types.Device import Device
+from Piloton.Types.DiffLive import DiffLive
 from Piloton.Types.Display import Display
+from Piloton.Types.Export import Export
 from Piloton.Types.Form import Form, FormPrompt
+from Piloton.Types.FrameRate import FrameRate
+from Piloton.Types.HeartRateVariability import HeartRateVariability
 from Piloton.Types.HeartZone import HeartZone
 from Piloton.Types.HeartZones import HeartZones
+from Piloton.Types.InfluxUDPClient import InfluxUDPClient
 from Piloton.Types.LoopStatus import LoopStatus
 from Piloton.Types.Menu import Menu
+from Piloton.Types.MetricsSnapshot import MetricsSnapshot
+from Piloton.Types.OnlineLearner import LearnerStatus, OnlineLearner
+from Piloton.Types.PowerCurve import PowerCurve
 from Piloton.Types.PowerZone import PowerZone
 from Piloton.Types.PowerZones import PowerZones
+from Piloton.Types.Resampler import Resampler
+from Piloton.Types.Rider import Rider
+from Piloton.Types.Sample import BikeSample, HeartRateSample, Sample
+from Piloton.Types.SampleRing import SampleRing
+from Piloton.Types.SessionCheckpoint import SessionCheckpoint
+from Piloton.Types.SettingsStore import SettingsStore
+from Piloton.Types.Storage import Storage
+from Piloton.Types.TrainingData import TrainingData
+from Piloton.Types.WorkoutPlan import WorkoutPlan, WorkoutStep
+from Piloton.Types.WorkoutScheduler import WorkoutScheduler, WorkoutStatus
 from Piloton.Types.Zone import Zone
 from Piloton.Types.Zones import Zones
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List, Tuple
+
+from rich import box
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from Piloton.Types import Display, FrameRate, LoopStatus, MetricsSnapshot, Rider
+
+
+class Leaderboard(Display):
+    def __init__(self, piloton, riders: List[Rider]):
+        """
+        Initialize Leaderboard display: one compact row per studio rider, ranked by power
+
+        :param Piloton piloton: Piloton object to pass data through
+        :param List[Rider] riders: Riders in the studio session
+        """
+        self.piloton = piloton
+        self.riders: List[Rider] = riders
+
+    def _generate_state(self) -> Tuple[Tuple[str, MetricsSnapshot], ...]:
+        """
+        Generate a summary of everything shown, to detect when a new frame is needed
+
+        :return: Each rider's name and latest snapshot
+        """
+        return tuple((rider.name, rider.snapshot._replace(speed=0.0, rmssd=0.0)) for rider in self.riders)
+
+    def _generate_table(self, state: Tuple[Tuple[str, MetricsSnapshot], ...]) -> Table:
+        """
+        Generate the leaderboard table
+
+        :param state: Each rider's name and latest snapshot
+        :return: Leaderboard table
+        """
+        table = Table(box=box.SIMPLE_HEAVY, expand=True)
+        table.add_column("#", justify="right")
+        table.add_column("Rider")
+        table.add_column("Power (W)", justify="right")
+        table.add_column("Cadence", justify="right")
+        table.add_column("Resistance", justify="right")
+        table.add_column("Heart Rate", justify="right")
+        table.add_column("Power Zone")
+        table.add_column("Heart Zone")
+
+        # Zone colors are the same for every rider
+        power_colors = self.piloton.power_zones.COLORS
+        heart_colors = self.piloton.heart_zones.COLORS
+
+        ranked = sorted(state, key=lambda rider: rider[1].power, reverse=True)
+        for place, (name, snapshot) in enumerate(ranked, start=1):
+            table.add_row(
+                str(place),
+                name,
+                Text(str(round(snapshot.power)), style="bold white"),
+                str(round(snapshot.cadence)),
+                str(snapshot.resistance),
+                str(snapshot.heart_rate),
+                Text(str(snapshot.power_zone), style=f"bold {power_colors[snapshot.power_zone]}"),
+                Text(str(snapshot.heart_zone), style=f"bold {heart_colors[snapshot.heart_zone]}"),
+            )
+
+        return table
+
+    def generate_layout(self, state: Tuple[Tuple[str, MetricsSnapshot], ...]) -> Panel:
+        """
+        Generate layout on refresh
+
+        :param state: Each rider's name and latest snapshot
+        :return: Leaderboard panel
+        """
+        return Panel(self._generate_table(state), title="Studio", box=box.HEAVY, border_style="#85AAD5")
+
+    def _render_frame(self, live: Live, frame_rate: FrameRate) -> None:
+        """
+        Render a frame, if anything shown has changed
+
+        :param Live live: Live display
+        :param FrameRate frame_rate: Frame rate controller
+        """
+        state = self._generate_state()
+        if frame_rate.should_render(state):
+            start: float = time.perf_counter()
+            live.update(self.generate_layout(state), refresh=True)
+            frame_rate.record_frame(time.perf_counter() - start)
+
+    def _render_loop(self, func_name: str, live: Live, frame_rate: FrameRate) -> None:
+        """
+        Render frames on the display thread until signal interrupt
+
+        :param str func_name: Loop tracker name
+        :param Live live: Live display
+        :param FrameRate frame_rate: Frame rate controller
+        """
+        while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+            self._render_frame(live, frame_rate)
+            time.sleep(frame_rate.delay())
+
+    async def live_output(self):
+        """
+        Leaderboard Output Loop. Will continue until signal interrupt.
+        """
+        # Get function name
+        func_name = "_leaderboard_live_output"
+
+        # Set status to active
+        self.piloton.loop_tracker[func_name] = LoopStatus.ACTIVE
+
+        # Stop the render thread however this ends, e.g. when another task in the gather fails
+        try:
+            # Refresh only when metrics change, as often as render cost allows
+            frame_rate = FrameRate(
+                self.piloton.display_min_fps, self.piloton.display_max_fps, self.piloton.display_render_budget
+            )
+            with self._live(self.generate_layout(self._generate_state())) as live:
+                if self.piloton.render_in_thread:
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, self._render_loop, func_name, live, frame_rate
+                    )
+                else:
+                    while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+                        self._render_frame(live, frame_rate)
+                        await asyncio.sleep(frame_rate.delay())
+        finally:
+            self.piloton.loop_tracker[func_name] = LoopStatus.INACTIVE
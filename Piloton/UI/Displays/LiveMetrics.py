@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from math import inf
 from typing import Tuple, List, Optional, Union
 
-from Piloton.Types import Display, HeartZone, PowerZone, LoopStatus
+from Piloton.Types import Display, FrameRate, HeartZone, LoopStatus, MetricsSnapshot, PowerZone, WorkoutStatus
 
 
 from rich import box
@@ -17,41 +18,45 @@ from rich.text import Text
 class LiveMetrics(Display):
     def __init__(self, piloton):
         """
-        Initialize Live Metrics display
+        Initialize Live Metrics display. Frames are generated from Piloton's latest metrics snapshot.
 
         :param Piloton piloton: Piloton object to pass data through
         """
         self.piloton = piloton
 
-    def _generate_cadence_panel(self) -> Panel:
+    def _generate_cadence_panel(self, snapshot: MetricsSnapshot) -> Panel:
         """
         Generate cadence readout
 
+        :param MetricsSnapshot snapshot: Metrics to display
         :return: Cadence readout
         """
-        text = Text(f"\n{round(self.piloton.bike.cadence)}\n", justify="center")
+        text = Text(f"\n{round(snapshot.cadence)}\n", justify="center")
         text.stylize("bold white")
-        panel = Panel(text, title="Cadence (RPM)", box=box.HEAVY, border_style="#BF211E")
+        title: str = "Cadence (RPM) - Paused" if snapshot.paused else "Cadence (RPM)"
+        panel = Panel(text, title=title, box=box.HEAVY, border_style="#BF211E")
         return panel
 
-    def _generate_resistance_panel(self) -> Panel:
+    def _generate_resistance_panel(self, snapshot: MetricsSnapshot) -> Panel:
         """
         Generate resistance readout
 
+        :param MetricsSnapshot snapshot: Metrics to display
         :return: Resistance readout
         """
-        text = Text(f"\n{self.piloton.bike.resistance}\n", justify="center")
+        text = Text(f"\n{snapshot.resistance}\n", justify="center")
         text.stylize("bold white")
         panel = Panel(text, title="Resistance", box=box.HEAVY, border_style="#E9CE2C")
         return panel
 
-    def _generate_power_panel(self) -> Panel:
+    def _generate_power_panel(self, snapshot: MetricsSnapshot) -> Panel:
         """
         Generate Power readout
 
+        :param MetricsSnapshot snapshot: Metrics to display
         :return: Power readout
         """
-        text = Text(f"\n{round(self.piloton.bike.power)}\n", justify="center")
+        text = Text(f"\n{round(snapshot.power)}\n", justify="center")
         text.stylize("bold white")
         panel = Panel(text, title="Power (W)", box=box.HEAVY, border_style="#E89005")
         return panel
@@ -85,20 +90,22 @@ class LiveMetrics(Display):
 
         return bar
 
-    def _generate_heart_rate_panel(self) -> Panel:
+    def _generate_heart_rate_panel(self, snapshot: MetricsSnapshot) -> Panel:
         """
         Generate Heart Zone panel: Heart Zone, Progress Bar, and HRM readout
 
+        :param MetricsSnapshot snapshot: Metrics to display
         :return: Heart rate Panel
         """
         text = Text.assemble(
-            self._generate_heart_zone_header(self.piloton.heart_zone),
-            *self._generate_heart_zone_progress_bar(self.piloton.heart_zone),
-            (f"{self.piloton.hrm.heart_rate}", "bold white"),
+            self._generate_heart_zone_header(snapshot.heart_zone),
+            *self._generate_heart_zone_progress_bar(snapshot.heart_zone),
+            (f"{snapshot.heart_rate}", "bold white"),
+            (f"  HRV {round(snapshot.rmssd)} ms" if snapshot.rmssd else "", "white"),
             justify="center",
         )
 
-        current_color: str = self.piloton.heart_zones.COLORS[self.piloton.heart_zone]
+        current_color: str = self.piloton.heart_zones.COLORS[snapshot.heart_zone]
         panel = Panel(text, title="Heart Rate (BPM)", box=box.HEAVY, border_style=current_color)
         return panel
 
@@ -161,30 +168,32 @@ class LiveMetrics(Display):
             (f"{up_limit}", up_color),
         ]
 
-    def _generate_power_zone_panel(self) -> Panel:
+    def _generate_power_zone_panel(self, snapshot: MetricsSnapshot) -> Panel:
         """
         Generate the Power Zone panel from the current bike reading
 
+        :param MetricsSnapshot snapshot: Metrics to display
         :return: Power Zone panel
         """
         # Calculate FTP percent
         ftp: int = self.piloton.power_zones.ftp
-        ftp_percent: float = self.piloton.bike.power / ftp * 100
+        ftp_percent: float = snapshot.power / ftp * 100
+        power_zone: PowerZone = snapshot.power_zone
 
         # Set up lower and upper limits
         lower_zone: PowerZone = PowerZone(0)
         upper_zone: PowerZone = PowerZone(1)
 
-        if self.piloton.power_zone != PowerZone.NO_ZONE:
-            lower_zone = PowerZone(self.piloton.power_zone.value - 1)
-            upper_zone = PowerZone(self.piloton.power_zone.value)
+        if power_zone != PowerZone.NO_ZONE:
+            lower_zone = PowerZone(power_zone.value - 1)
+            upper_zone = PowerZone(power_zone.value)
 
         # Get upper and lower limits
         lower_limit: Optional[int] = 0
         upper_limit: Optional[Union[int, float]]
-        if self.piloton.power_zone in [PowerZone.NO_ZONE, PowerZone.ACTIVE_RECOVERY]:
+        if power_zone in [PowerZone.NO_ZONE, PowerZone.ACTIVE_RECOVERY]:
             upper_limit = round(ftp * self.piloton.power_zones.ZONES[upper_zone])
-        elif self.piloton.power_zone == PowerZone.NEUROMUSCULAR_POWER:
+        elif power_zone == PowerZone.NEUROMUSCULAR_POWER:
             lower_limit = round(ftp * self.piloton.power_zones.ZONES[lower_zone])
             upper_limit = inf
         else:
@@ -196,16 +205,16 @@ class LiveMetrics(Display):
         current_color: str = self.piloton.power_zones.COLORS[upper_zone]
         next_color: str = current_color
         if upper_zone != PowerZone.NEUROMUSCULAR_POWER:
-            next_color = self.piloton.power_zones.COLORS[PowerZone(self.piloton.power_zone.value + 1)]
+            next_color = self.piloton.power_zones.COLORS[PowerZone(power_zone.value + 1)]
 
         # Set text output
         text = Text.assemble(
-            *self._generate_power_zone_header(self.piloton.power_zone.value, self.piloton.power_zone, ftp_percent),
-            *self._generate_power_zone_bar(self.piloton.power_zone),
+            *self._generate_power_zone_header(power_zone.value, power_zone, ftp_percent),
+            *self._generate_power_zone_bar(power_zone),
             *self._generate_power_zone_footer(
                 lower_limit,
                 lower_color,
-                self.piloton.bike.power,
+                snapshot.power,
                 current_color,
                 upper_limit,
                 next_color,
@@ -215,10 +224,53 @@ class LiveMetrics(Display):
         panel = Panel(text, title="Power Zone", box=box.HEAVY, border_style=current_color)
         return panel
 
-    def generate_layout(self) -> Layout:
+    def _generate_workout_panel(self, snapshot: MetricsSnapshot, status: WorkoutStatus) -> Panel:
+        """
+        Generate structured workout panel: current step, time left, target, and compliance
+
+        :param MetricsSnapshot snapshot: Metrics to display
+        :param WorkoutStatus status: Structured workout status
+        :return: Workout panel
+        """
+        if status.step is None:
+            text = Text("\nWorkout complete!\n", justify="center", style="bold white")
+            return Panel(text, title="Workout", box=box.HEAVY, border_style="#85AAD5")
+
+        # A status only exists while a workout is running
+        workout = self.piloton.workout
+        assert workout is not None
+
+        # Color the target by whether power is on it right now
+        low, high = status.step.target(self.piloton.power_zones.ftp)
+        minutes, seconds = divmod(max(round(status.remaining), 0), 60)
+        target_color: str = "#47BAAB" if low <= snapshot.power <= high else "#DF5054"
+
+        text = Text.assemble(
+            (f"{status.step_index + 1}/{len(workout.plan)} - ", "white"),
+            (f"{status.step.name}", "bold white"),
+            (f" - {minutes:02d}:{seconds:02d}\n", "white"),
+            ("Target ", "white"),
+            (f"{low} - {high} W", f"bold {target_color}"),
+            (f" - {round(status.compliance * 100)}% on target", "white"),
+            justify="center",
+        )
+        return Panel(text, title=workout.plan.name, box=box.HEAVY, border_style=target_color)
+
+    def _workout_status(self) -> Optional[WorkoutStatus]:
+        """
+        Get the structured workout's status, if one is running
+
+        :return: Structured workout status
+        """
+        workout = self.piloton.workout
+        return workout.status(time.monotonic()) if workout is not None else None
+
+    def generate_layout(self, snapshot: MetricsSnapshot, status: Optional[WorkoutStatus] = None) -> Layout:
         """
         Generate layout on refresh
 
+        :param MetricsSnapshot snapshot: Metrics to display
+        :param Optional[WorkoutStatus] status: Structured workout status, if one is running
         :return: Piloton Layout
         """
         # Split layout
@@ -227,32 +279,86 @@ class LiveMetrics(Display):
             Layout(name="upper", size=5),
             Layout(name="hz", size=5),
             Layout(name="pz", size=5),
+            *([Layout(name="workout", size=4)] if status is not None else []),
         )
 
         # Add upper panels
         layout["upper"].split(
-            Layout(self._generate_cadence_panel(), name="cadence"),
-            Layout(self._generate_resistance_panel(), name="resistance"),
-            Layout(self._generate_power_panel(), name="power"),
+            Layout(self._generate_cadence_panel(snapshot), name="cadence"),
+            Layout(self._generate_resistance_panel(snapshot), name="resistance"),
+            Layout(self._generate_power_panel(snapshot), name="power"),
             direction="horizontal",
         )
 
         # Add lower panels
         layout["hz"].split(
-            Layout(self._generate_heart_rate_panel(), name="heart_rate"),
+            Layout(self._generate_heart_rate_panel(snapshot), name="heart_rate"),
             direction="horizontal",
         )
 
         layout["pz"].split(
-            Layout(self._generate_power_zone_panel(), name="power_zone"),
+            Layout(self._generate_power_zone_panel(snapshot), name="power_zone"),
             direction="horizontal",
         )
 
+        if status is not None:
+            layout["workout"].update(self._generate_workout_panel(snapshot, status))
+
         return layout
 
+    def _generate_state(self, snapshot: MetricsSnapshot, status: Optional[WorkoutStatus] = None) -> Tuple:
+        """
+        Generate a summary of everything shown, to detect when a new frame is needed
+
+        :param MetricsSnapshot snapshot: Metrics to display
+        :param Optional[WorkoutStatus] status: Structured workout status, if one is running
+        :return: Displayed values
+        """
+        state = snapshot._replace(speed=0.0, rmssd=round(snapshot.rmssd))
+        if status is None:
+            return state
+        return state, status.step_index, round(status.remaining), round(status.compliance * 100)
+
+    def _render_frame(self, live: Live, frame_rate: FrameRate) -> None:
+        """
+        Render a frame from the latest snapshot, if anything shown has changed
+
+        :param Live live: Live display
+        :param FrameRate frame_rate: Frame rate controller
+        """
+        snapshot: MetricsSnapshot = self.piloton.snapshot
+        status: Optional[WorkoutStatus] = self._workout_status()
+        if frame_rate.should_render(self._generate_state(snapshot, status)):
+            start: float = time.perf_counter()
+            live.update(self.generate_layout(snapshot, status), refresh=True)
+            frame_rate.record_frame(time.perf_counter() - start)
+
+    def _frame_delay(self, frame_rate: FrameRate) -> float:
+        """
+        Seconds to wait before checking for the next frame. While auto-paused, frames slow to the minimum rate.
+
+        :param FrameRate frame_rate: Frame rate controller
+        :return: Delay until next frame
+        """
+        delay: float = frame_rate.delay()
+        return max(delay, frame_rate.max_interval) if self.piloton.snapshot.paused else delay
+
+    def _render_loop(self, func_name: str, live: Live, frame_rate: FrameRate) -> None:
+        """
+        Render frames on the display thread until signal interrupt
+
+        :param str func_name: Loop tracker name
+        :param Live live: Live display
+        :param FrameRate frame_rate: Frame rate controller
+        """
+        while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+            self._render_frame(live, frame_rate)
+            time.sleep(self._frame_delay(frame_rate))
+
     async def live_output(self):
         """
-        Live Metrics Output Loop. Will continue until signal interrupt.
+        Live Metrics Output Loop. Will continue until signal interrupt. Rendering happens on a separate thread
+        (unless render_in_thread is off), so slow frames don't delay BLE notifications on the event loop.
         """
         # Get function name
         func_name = "__live_output"
@@ -260,8 +366,28 @@ class LiveMetrics(Display):
         # Set status to active
         self.piloton.loop_tracker[func_name] = LoopStatus.ACTIVE
 
-        # Raise notification and link it to the handler
-        with Live(self.generate_layout(), refresh_per_second=4, screen=True) as live:
-            while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
-                live.update(self.generate_layout())
-                await asyncio.sleep(0.4)
+        # Stop the render thread however this ends, e.g. when another task in the gather fails
+        try:
+            # Refresh only when metrics change, as often as render cost allows
+            frame_rate = FrameRate(
+                self.piloton.display_min_fps, self.piloton.display_max_fps, self.piloton.display_render_budget
+            )
+            layout: Layout = self.generate_layout(self.piloton.snapshot, self._workout_status())
+            with self._live(layout) as live:
+                if self.piloton.render_in_thread:
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, self._render_loop, func_name, live, frame_rate
+                    )
+                else:
+                    while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+                        self._render_frame(live, frame_rate)
+                        await asyncio.sleep(self._frame_delay(frame_rate))
+        finally:
+            self.piloton.loop_tracker[func_name] = LoopStatus.INACTIVE
+
+        self.piloton.logger.debug(
+            "Rendered %d frames (%d dropped) averaging %.1f ms",
+            frame_rate.frames,
+            frame_rate.dropped,
+            frame_rate.render_time * 1000,
+        )
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Dict, List, Union
+
+from Piloton.Types import Display, LoopStatus, MetricsSnapshot
+
+# Minimal page for viewing the stream from a browser (e.g. a tablet on the same network)
+_INDEX_PAGE: str = """<!DOCTYPE html>
+<html>
+<head><meta name="viewport" content="width=device-width, initial-scale=1"><title>Piloton</title></head>
+<body style="background:#111;color:#eee;font-family:sans-serif;font-size:2em">
+<table id="metrics"></table>
+<script>
+const metrics = {};
+const source = new EventSource("/metrics");
+source.onmessage = (event) => {
+    Object.assign(metrics, JSON.parse(event.data));
+    document.getElementById("metrics").innerHTML = Object.entries(metrics)
+        .map(([key, value]) => `<tr><td>${key}</td><td><b>${value}</b></td></tr>`).join("");
+};
+</script>
+</body>
+</html>
+"""
+
+
+class _StreamClient:
+    """
+    Connected stream client. Changes are merged into pending so a slow client receives the latest values
+    instead of a growing backlog.
+    """
+
+    __slots__ = ("pending", "event")
+
+    def __init__(self):
+        self.pending: Dict[str, Union[int, float, str]] = {}
+        self.event: asyncio.Event = asyncio.Event()
+
+
+class MetricsStream(Display):
+    def __init__(self, piloton):
+        """
+        Initialize Metrics Stream display. Serves live metrics as Server-Sent Events instead of drawing them.
+
+        :param Piloton piloton: Piloton object to pass data through
+        """
+        self.piloton = piloton
+        self.host: str = piloton.stream_host
+        self.port: int = piloton.stream_port
+        self.interval: float = 1 / piloton.stream_rate
+        self._clients: List[_StreamClient] = []
+        self._last_sample: Dict[str, Union[int, float, str]] = {}
+        self._active: bool = False
+
+    def _generate_sample(self) -> Dict[str, Union[int, float, str]]:
+        """
+        Generate the current metrics
+
+        :return: Current metrics by field
+        """
+        snapshot: MetricsSnapshot = self.piloton.snapshot
+        return {
+            "cadence": round(snapshot.cadence),
+            "resistance": snapshot.resistance,
+            "power": round(snapshot.power),
+            "speed": round(snapshot.speed, 1),
+            "heart_rate": snapshot.heart_rate,
+            "rmssd": round(snapshot.rmssd),
+            "heart_zone": str(snapshot.heart_zone),
+            "power_zone": str(snapshot.power_zone),
+            "paused": int(snapshot.paused),
+        }
+
+    def _generate_changes(self) -> Dict[str, Union[int, float, str]]:
+        """
+        Generate the metrics that have changed since the last push
+
+        :return: Changed metrics by field
+        """
+        sample = self._generate_sample()
+        changes = {field: value for field, value in sample.items() if self._last_sample.get(field) != value}
+        self._last_sample = sample
+        return changes
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Handle an HTTP connection: "/" serves the viewer page, "/metrics" the event stream
+
+        :param asyncio.StreamReader reader: Connection reader
+        :param asyncio.StreamWriter writer: Connection writer
+        """
+        try:
+            # Read request line and discard headers
+            request_line: bytes = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+
+            parts: List[str] = request_line.decode("latin-1").split()
+            path: str = parts[1] if len(parts) > 1 else ""
+
+            if path == "/":
+                body: bytes = _INDEX_PAGE.encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nConnection: close\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+            elif path == "/metrics":
+                await self._stream(writer)
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Push changed metrics to a client until the workout ends or the client disconnects
+
+        :param asyncio.StreamWriter writer: Connection writer
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\n\r\n"
+        )
+
+        # New clients start with the full set of metrics
+        client = _StreamClient()
+        client.pending.update(self._last_sample or self._generate_sample())
+        client.event.set()
+
+        self._clients.append(client)
+        self.piloton.logger.info("Metrics stream client connected (%d total)", len(self._clients))
+        try:
+            while self._active:
+                await client.event.wait()
+                client.event.clear()
+                if not client.pending:
+                    continue
+
+                writer.write(f"data: {json.dumps(client.pending)}\n\n".encode())
+                client.pending.clear()
+                await writer.drain()
+        finally:
+            self._clients.remove(client)
+
+    async def live_output(self):
+        """
+        Metrics Stream Output Loop. Pushes changes at most stream_rate times per second until signal interrupt.
+        """
+        # Get function name
+        func_name = "_stream_live_output"
+
+        # Set status to active
+        self.piloton.loop_tracker[func_name] = LoopStatus.ACTIVE
+        self._active = True
+
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.piloton.logger.info("Streaming metrics on http://%s:%d/", self.host, self.port)
+        try:
+            while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+                # Only wake clients when something has changed
+                changes = self._generate_changes()
+                if changes:
+                    for client in self._clients:
+                        client.pending.update(changes)
+                        client.event.set()
+
+                await asyncio.sleep(self.interval)
+        finally:
+            # Release waiting clients so their connections close
+            self._active = False
+            for client in self._clients:
+                client.event.set()
+
+            server.close()
+            await server.wait_closed()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import asyncio
-from typing import List, Tuple
+import time
+from typing import Dict, List, Tuple
 
 from rich import box
 from rich.layout import Layout
@@ -8,7 +9,7 @@ from rich.live import Live
 from rich.panel import Panel
 from rich.text import Text
 
-from Piloton.Types import Display, LoopStatus
+from Piloton.Types import Display, FrameRate, LearnerStatus, LoopStatus, MetricsSnapshot
 
 
 class TrainingMetrics(Display):
@@ -20,20 +21,23 @@ class TrainingMetrics(Display):
         :param int resistance: Bike resistance to set for testing
         """
         self.piloton = piloton
+        self.resistance: int = resistance
         self.piloton.bike.resistance = resistance
 
-    def _generate_cadence_readout(self, cadence) -> List[Tuple[str, str]]:
+        # Frames render from copies, swapped in on the event loop
+        self.piloton.training_counts = self.piloton.training_data.cadence_counts(resistance)
+        self.piloton._update_snapshot()
+
+    @staticmethod
+    def _generate_cadence_readout(number_data_points: int) -> List[Tuple[str, str]]:
         """
         Generate a readout based on how many samples a given cadence has at the current training resistance
 
-        :param cadence:
+        :param int number_data_points: Samples at the cadence
         :return: Read out of the current cadence's readout
         """
         text = []
 
-        # Look up number of data points for given resistance and cadence
-        number_data_points: int = len(self.piloton.training_data[self.piloton.bike.resistance][cadence])
-
         # Create readout based on sample size
         if number_data_points > 15:
             text.extend([("█", "green"), ("█", "yellow"), ("█", "red")])
@@ -47,10 +51,11 @@ class TrainingMetrics(Display):
 
         return text
 
-    def _generate_grid(self) -> List[Tuple[str, str]]:
+    def _generate_grid(self, counts: Dict[int, int]) -> List[Tuple[str, str]]:
         """
         Generate the grid of cadence readouts
 
+        :param Dict[int, int] counts: Samples per cadence at the training resistance
         :return: Grid of cadence readouts
         """
         text = []
@@ -58,24 +63,85 @@ class TrainingMetrics(Display):
         for cadence_bucket in range(120, 10, -10):
             text.append((f"\n  {cadence_bucket:3d}    ", "white"))
             for cadence in range(cadence_bucket, cadence_bucket + 10):
-                text.extend(self._generate_cadence_readout(cadence))
+                text.extend(self._generate_cadence_readout(counts.get(cadence, 0)))
 
         return text
 
-    def _generate_training_panel(self) -> Panel:
+    def _generate_training_panel(self, snapshot: MetricsSnapshot, counts: Dict[int, int]) -> Panel:
         """
         Generate the Training panel for this display
 
+        :param MetricsSnapshot snapshot: Metrics to show
+        :param Dict[int, int] counts: Samples per cadence at the training resistance
         :return: Display of training data
         """
         text = Text.assemble(
             ("  Cad.    0   1   2   3   4   5   6   7   8   9    ", "white"),
-            *self._generate_grid(),
-            (f"\n  Resistance: {self.piloton.bike.resistance}  -  Cadence: {self.piloton.bike.cadence} RPM", "white"),
+            *self._generate_grid(counts),
+            (f"\n  Resistance: {snapshot.resistance}  -  Cadence: {snapshot.cadence} RPM", "white"),
         )
         panel = Panel(text, title="Training", box=box.HEAVY, border_style="#85AAD5")
         return panel
 
+    @staticmethod
+    def _accuracy_style(accuracy: float) -> str:
+        """
+        Color an accuracy
+
+        :param float accuracy: Fraction predicted correctly
+        :return: Style
+        """
+        if accuracy >= 0.9:
+            return "green"
+        elif accuracy >= 0.7:
+            return "yellow"
+        return "red"
+
+    def _generate_model_panel(self) -> Panel:
+        """
+        Generate the Model panel: how well the online learner predicts held-out samples at the training resistance,
+        and what it mistakes them for
+
+        :return: Display of model accuracy
+        """
+        # Training sets up the online learner before showing this display
+        learner = self.piloton.online_learner
+        assert learner is not None
+
+        resistance: int = self.resistance
+        status: LearnerStatus = learner.status
+        samples: int = status.samples(resistance)
+
+        if not samples:
+            text = Text.assemble(
+                (f"  Resistance {resistance} accuracy: collecting held-out samples...", "white"),
+                (f"\n  All resistances: {status.accuracy():.0%} of {len(status)} held-out samples", "white"),
+            )
+            return Panel(text, title="Model", box=box.HEAVY, border_style="#85AAD5")
+
+        accuracy: float = status.accuracy(resistance)
+        nearby, other = status.confusion(resistance)
+        predicted: List[Tuple[str, str]] = [("\n  Predicted as  ", "white")]
+        for predicted_resistance, fraction in nearby.items():
+            style: str = self._accuracy_style(fraction) if predicted_resistance == resistance else "white"
+            predicted.append((f" {predicted_resistance}: {fraction:.0%} ", style))
+        predicted.append((f" Other: {other:.0%}", "white"))
+
+        # Enough samples predicted well: time to move on
+        if accuracy >= 0.9 and samples >= 20:
+            advice: Tuple[str, str] = ("\n  Resistance is well covered. Try another.", "green")
+        else:
+            advice = ("\n  Keep riding at this resistance, across cadences.", "yellow")
+
+        text = Text.assemble(
+            (f"  Resistance {resistance} accuracy: ", "white"),
+            (f"{accuracy:.0%}", self._accuracy_style(accuracy)),
+            (f" of {samples} held-out samples (all: {status.accuracy():.0%} of {len(status)})", "white"),
+            *predicted,
+            advice,
+        )
+        return Panel(text, title="Model", box=box.HEAVY, border_style="#85AAD5")
+
     def generate_layout(self) -> Layout:
         """
         Generate layout on refresh
@@ -84,18 +150,57 @@ class TrainingMetrics(Display):
         """
         # Split layout
         layout = Layout()
-        layout.split(Layout(name="main", size=15))
+        layout.split(Layout(name="main", size=15), Layout(name="model", size=5))
 
-        # Add main panel
+        # Add main panel, from one snapshot of what's shown
         layout["main"].split(
-            Layout(self._generate_training_panel(), name="training"),
+            Layout(self._generate_training_panel(self.piloton.snapshot, self.piloton.training_counts), name="training"),
         )
+        layout["model"].update(self._generate_model_panel())
 
         return layout
 
+    def _generate_state(self) -> Tuple[int, int, int, int]:
+        """
+        Generate a summary of everything shown, to detect when a new frame is needed
+
+        :return: Resistance, cadence, samples at that resistance-cadence, and samples the model's been fit with
+        """
+        learner = self.piloton.online_learner
+        assert learner is not None
+
+        snapshot: MetricsSnapshot = self.piloton.snapshot
+        trained: int = learner.status.trained
+        return snapshot.resistance, snapshot.cadence, self.piloton.training_counts.get(snapshot.cadence, 0), trained
+
+    def _render_frame(self, live: Live, frame_rate: FrameRate) -> None:
+        """
+        Render a frame, if anything shown has changed
+
+        :param Live live: Live display
+        :param FrameRate frame_rate: Frame rate controller
+        """
+        if frame_rate.should_render(self._generate_state()):
+            start: float = time.perf_counter()
+            live.update(self.generate_layout(), refresh=True)
+            frame_rate.record_frame(time.perf_counter() - start)
+
+    def _render_loop(self, func_name: str, live: Live, frame_rate: FrameRate) -> None:
+        """
+        Render frames on the display thread until signal interrupt
+
+        :param str func_name: Loop tracker name
+        :param Live live: Live display
+        :param FrameRate frame_rate: Frame rate controller
+        """
+        while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+            self._render_frame(live, frame_rate)
+            time.sleep(frame_rate.delay())
+
     async def live_output(self):
         """
-        Live Training Metrics Output Loop. Will continue until signal interrupt.
+        Live Training Metrics Output Loop. Will continue until signal interrupt. Rendering happens on a separate
+        thread (unless render_in_thread is off), so slow frames don't delay BLE notifications on the event loop.
         """
         # Get function name
         func_name = "_training_live_output"
@@ -103,13 +208,25 @@ class TrainingMetrics(Display):
         # Set status to active
         self.piloton.loop_tracker[func_name] = LoopStatus.ACTIVE
 
-        # Block until device threads connect
-        for loop, status in self.piloton.loop_tracker.items():
-            while status == LoopStatus.CONNECTING:
-                await asyncio.sleep(1)
-
-        # Raise notification and link it to the handler
-        with Live(self.generate_layout(), refresh_per_second=4) as live:
-            while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
-                live.update(self.generate_layout())
-                await asyncio.sleep(0.4)
+        # Stop the render thread however this ends, e.g. when another task in the gather fails
+        try:
+            # Block until device threads connect
+            for loop, status in self.piloton.loop_tracker.items():
+                while status == LoopStatus.CONNECTING:
+                    await asyncio.sleep(1)
+
+            # Refresh only when samples come in, as often as render cost allows
+            frame_rate = FrameRate(
+                self.piloton.display_min_fps, self.piloton.display_max_fps, self.piloton.display_render_budget
+            )
+            with self._live(self.generate_layout(), screen=False) as live:
+                if self.piloton.render_in_thread:
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, self._render_loop, func_name, live, frame_rate
+                    )
+                else:
+                    while self.piloton.loop_tracker[func_name] == LoopStatus.ACTIVE:
+                        self._render_frame(live, frame_rate)
+                        await asyncio.sleep(frame_rate.delay())
+        finally:
+            self.piloton.loop_tracker[func_name] = LoopStatus.INACTIVE
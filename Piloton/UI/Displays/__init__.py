@@ -1,2 +1,4 @@
+from Piloton.UI.Displays.Leaderboard import Leaderboard
 from Piloton.UI.Displays.LiveMetrics import LiveMetrics
 from Piloton.UI.Displays.TrainingMetrics import TrainingMetrics
+from Piloton.UI.Displays.MetricsStream import MetricsStream
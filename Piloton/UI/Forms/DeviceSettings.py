@@ -1,4 +1,3 @@
-import json
 from rich.prompt import Prompt
 
 from Piloton.Types import Form, FormPrompt
@@ -14,17 +13,9 @@ class DeviceSettings(Form):
 
     @staticmethod
     def _update_bike_name(response):
-        # Open JSON
-        with open("data/devices.json", "r") as fh:
-            # Load JSON
-            data = json.load(fh)
-
-        # Set Name
-        data["bike"] = response
-
-        with open("data/devices.json", "w") as fh:
-            # Write
-            json.dump(data, fh, indent=4)
+        # Set Name in the store Piloton watches, writing it back and applying it
+        if DeviceSettings.piloton is not None:
+            DeviceSettings.piloton.device_settings.set("bike", response)
 
     @staticmethod
     def update_hrm_name():
@@ -32,14 +23,6 @@ class DeviceSettings(Form):
 
     @staticmethod
     def _update_hrm_name(response):
-        # Open JSON
-        with open("data/devices.json", "r") as fh:
-            # Load JSON
-            data = json.load(fh)
-
-        # Set Name
-        data["hrm"] = response
-
-        with open("data/devices.json", "w") as fh:
-            # Write
-            json.dump(data, fh, indent=4)
+        # Set Name in the store Piloton watches, writing it back and applying it
+        if DeviceSettings.piloton is not None:
+            DeviceSettings.piloton.device_settings.set("hrm", response)
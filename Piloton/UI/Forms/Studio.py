@@ -0,0 +1,25 @@
+from rich.prompt import Confirm
+from Piloton.Types import Form, FormPrompt
+
+
+class Studio(Form):
+
+    __formname__ = "Studio"
+
+    @staticmethod
+    def start_studio():
+        return [
+            FormPrompt(
+                Confirm,
+                Studio._start_studio,
+                "Start a studio session with every rider in riders.json?",
+            )
+        ]
+
+    @staticmethod
+    def _start_studio(response):
+        # Return if user signaled quitting
+        if not response:
+            return
+
+        return "studio", response
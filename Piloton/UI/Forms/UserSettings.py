@@ -1,4 +1,3 @@
-import json
 from rich.prompt import Prompt, IntPrompt
 
 
@@ -15,17 +14,9 @@ class UserSettings(Form):
 
     @staticmethod
     def _update_name(response):
-        # Open JSON
-        with open("data/users.json", "r") as fh:
-            # Load JSON
-            data = json.load(fh)
-
-        # Set Name
-        data["name"] = response
-
-        with open("data/users.json", "w") as fh:
-            # Write
-            json.dump(data, fh, indent=4)
+        # Set Name in the store Piloton watches, writing it back and applying it
+        if UserSettings.piloton is not None:
+            UserSettings.piloton.user_settings.set("name", response)
 
     @staticmethod
     def update_age():
@@ -33,17 +24,9 @@ class UserSettings(Form):
 
     @staticmethod
     def _update_age(response):
-        # Open JSON
-        with open("data/users.json", "r") as fh:
-            # Load JSON
-            data = json.load(fh)
-
-        # Set age
-        data["age"] = response
-
-        with open("data/users.json", "w") as fh:
-            # Write
-            json.dump(data, fh, indent=4)
+        # Set age in the store Piloton watches, writing it back and applying it
+        if UserSettings.piloton is not None:
+            UserSettings.piloton.user_settings.set("age", response)
 
     @staticmethod
     def update_ftp():
@@ -51,14 +34,6 @@ class UserSettings(Form):
 
     @staticmethod
     def _update_ftp(response):
-        # Open JSON
-        with open("data/users.json", "r") as fh:
-            # Load JSON
-            data = json.load(fh)
-
-        # Set ftp
-        data["ftp"] = response
-
-        with open("data/users.json", "w") as fh:
-            # Write
-            json.dump(data, fh, indent=4)
+        # Set ftp in the store Piloton watches, writing it back and applying it
+        if UserSettings.piloton is not None:
+            UserSettings.piloton.user_settings.set("ftp", response)
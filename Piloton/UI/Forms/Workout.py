@@ -1,5 +1,5 @@
 from typing import List, Tuple, Union
-from rich.prompt import IntPrompt
+from rich.prompt import IntPrompt, Prompt
 from Piloton.Types import Form, FormPrompt
 from Piloton.UI.Menus import MainMenu
 
@@ -25,3 +25,25 @@ class Workout(Form):
             return
 
         return "workout", response
+
+    @staticmethod
+    def start_workout_plan() -> List[FormPrompt]:
+        # List workout files
+        plans: List[str] = Workout.piloton.list_workout_plans() if Workout.piloton is not None else []
+
+        return [
+            FormPrompt(
+                Prompt,
+                Workout._start_workout_plan,
+                "Enter Structured Workout (-1: Main Menu)",
+                choices=plans + ["-1"],
+            )
+        ]
+
+    @staticmethod
+    def _start_workout_plan(response):
+        # Return if user signaled quitting
+        if response == "-1":
+            return
+
+        return "workout_plan", response
@@ -1,4 +1,5 @@
 from Piloton.UI.Forms.DeviceSettings import DeviceSettings
+from Piloton.UI.Forms.Studio import Studio
 from Piloton.UI.Forms.Training import Training
 from Piloton.UI.Forms.UserSettings import UserSettings
 from Piloton.UI.Forms.Workout import Workout
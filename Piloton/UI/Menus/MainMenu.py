@@ -1,7 +1,7 @@
 from Piloton.Types.Menu import Menu
 from Piloton.UI.Menus import DeviceSettings
 from Piloton.UI.Menus import UserSettings
-from Piloton.UI.Forms import Workout, Training
+from Piloton.UI.Forms import Studio, Workout, Training
 
 
 class MainMenu(Menu):
@@ -11,9 +11,11 @@ class MainMenu(Menu):
     def __init__(self):
         options = {
             "Workout": Workout.start_workout,
+            "Structured Workout": Workout.start_workout_plan,
             "User Settings": UserSettings.UserSettings,
             "Device Settings": DeviceSettings.DeviceSettings,
             "Training": Training.start_training,
+            "Studio": Studio.start_studio,
             "Quit": None,
         }
         super().__init__(options)
@@ -1 +1,2 @@
 from Piloton.Piloton import Piloton
+from Piloton.PilotonSession import PilotonSession
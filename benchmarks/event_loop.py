@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare the asyncio and uvloop event loops on the simulated notification path: notification latency and process
+CPU usage during a headless workout at a high notification rate. uvloop is skipped if it isn't installed.
+
+    python -m benchmarks.event_loop --duration 30 --rate 200
+"""
+import argparse
+import importlib.util
+import time
+from typing import Dict
+
+from benchmarks.simulation import latency_summary, simulated_piloton
+from utils import LoopLagMonitor
+
+
+def run_workout(event_loop: str, duration: float, rate: float) -> Dict[str, str]:
+    """
+    Run a simulated headless workout and measure latency and CPU usage
+
+    :param str event_loop: Event loop implementation
+    :param float duration: Seconds to run
+    :param float rate: Notifications per second per device
+    :return: Latency, lag and CPU summaries
+    """
+    piloton, clients = simulated_piloton(rate, headless=True, event_loop=event_loop)
+    piloton.stream_host = "127.0.0.1"
+
+    monitor = LoopLagMonitor()
+    monitor.start(piloton._loop)
+    piloton._loop.call_later(duration, piloton.stop)
+
+    # Model training happens before the loop runs, so time only the loop
+    cpu: float = 0.0
+    wall: float = 0.0
+
+    def mark_start() -> None:
+        nonlocal cpu, wall
+        cpu, wall = time.process_time(), time.monotonic()
+
+    piloton._loop.call_soon(mark_start)
+    piloton.start_workout()
+    cpu, wall = time.process_time() - cpu, time.monotonic() - wall
+    monitor.stop()
+
+    notifications: int = max(sum(client.notifications for client in clients), 1)
+    return {
+        "latency": latency_summary(clients),
+        "lag": monitor.summary(),
+        "cpu": f"{cpu / wall * 100:.2f}% ({cpu / notifications * 1e6:.1f} us per notification)",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per event loop")
+    parser.add_argument("--rate", type=float, default=200.0, help="Notifications per second per device")
+    args = parser.parse_args()
+
+    event_loops = ["asyncio"]
+    if importlib.util.find_spec("uvloop"):
+        event_loops.append("uvloop")
+    else:
+        print("uvloop is not installed, only measuring asyncio")
+
+    results = {event_loop: run_workout(event_loop, args.duration, args.rate) for event_loop in event_loops}
+    for event_loop, result in results.items():
+        print(f"{event_loop}:")
+        print(f"    Notification latency: {result['latency']}")
+        print(f"    Loop lag:             {result['lag']}")
+        print(f"    CPU:                  {result['cpu']}")
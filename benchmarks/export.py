@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Export a year of rides to each format and measure export rate and peak memory. Storage is filled with a ride a day
+of raw bike and heart rate data points, one of each per second. Peak memory is traced for a quarter of the year and
+the whole year: chunked exports should peak at about the same for both. SQLite is always measured; InfluxDB is
+measured if a server is reachable at localhost:8086 (in a throwaway piloton_benchmark database). Parquet is measured
+if pyarrow is installed.
+
+    python -m benchmarks.export --days 365 --ride-length 3600
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Type
+
+from benchmarks.storage import influx_storage, session_points
+from Piloton import Piloton
+from Piloton.Export import CSVExport, FITExport, ParquetExport
+from Piloton.Storage import SQLiteStorage
+from Piloton.Types import Export, Storage
+
+# Rides start at this time of day, from this day
+_FIRST_RIDE: datetime = datetime(2020, 1, 1, 18)
+
+
+def fill(storage: Storage, days: int, length: int) -> int:
+    """
+    Write a ride a day
+
+    :param Storage storage: Storage backend
+    :param int days: Number of days
+    :param int length: Seconds per ride
+    :return: Number of points written
+    """
+    written: int = 0
+    for day in range(days):
+        start: int = int((_FIRST_RIDE + timedelta(days=day) - datetime(1970, 1, 1)).total_seconds())
+        points: List[Dict] = []
+        for point in session_points(uuid.uuid4().hex, start, length):
+            points.append(point)
+            if len(points) == 10000:
+                storage.write_points(points, batch_size=5000)
+                written += len(points)
+                points = []
+        storage.write_points(points, batch_size=5000)
+        written += len(points)
+    storage.flush()
+    return written
+
+
+def export(piloton: Piloton, export_class: Type[Export], path: str, days: int, traced: bool) -> Dict[str, float]:
+    """
+    Export the first days of rides
+
+    :param Piloton piloton: Piloton, with filled storage
+    :param Type[Export] export_class: Export format
+    :param str path: File to export to
+    :param int days: Days to export
+    :param bool traced: Trace peak memory, which slows the export down
+    :return: Rows, seconds, file size (bytes), and peak traced memory (bytes, if traced)
+    """
+    if traced:
+        tracemalloc.start()
+
+    started: float = time.perf_counter()
+    with export_class(path) as file:
+        rows: int = piloton.export_rides(file, start=_FIRST_RIDE, end=_FIRST_RIDE + timedelta(days=days))
+    elapsed: float = time.perf_counter() - started
+
+    peak: int = 0
+    if traced:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    size: int = os.path.getsize(path)
+    os.remove(path)
+    return {"rows": rows, "seconds": elapsed, "size": size, "peak": peak}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365, help="Days of rides, one a day")
+    parser.add_argument("--ride-length", type=int, default=3600, help="Seconds per ride")
+    args = parser.parse_args()
+
+    formats: Dict[str, Type[Export]] = {".csv": CSVExport, ".fit": FITExport}
+    try:
+        import pyarrow  # noqa: F401
+
+        formats[".parquet"] = ParquetExport
+    except ImportError:
+        print("pyarrow is not installed, not measuring Parquet")
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_path: str = shutil.copytree("data", os.path.join(directory, "data")) + os.sep
+        piloton: Piloton = Piloton(storage_backend="sqlite", data_path=data_path)
+
+        backends: Dict[str, Callable[[], Storage]] = {
+            "sqlite": lambda: SQLiteStorage(os.path.join(directory, "benchmark.sqlite")),
+        }
+        influx = influx_storage()
+        if influx is not None:
+            backends["influx"] = influx
+        else:
+            print("InfluxDB is not reachable at localhost:8086, only measuring SQLite")
+
+        for name, create in backends.items():
+            piloton.storage.close()
+            piloton.storage = create()
+
+            started: float = time.perf_counter()
+            points: int = fill(piloton.storage, args.days, args.ride_length)
+            print(f"{name}: {points} points over {args.days} days, written in {time.perf_counter() - started:.1f} s")
+
+            for extension, export_class in formats.items():
+                path: str = os.path.join(directory, f"export{extension}")
+                result: Dict[str, float] = export(piloton, export_class, path, args.days, traced=False)
+                quarter: Dict[str, float] = export(piloton, export_class, path, max(args.days // 4, 1), traced=True)
+                year: Dict[str, float] = export(piloton, export_class, path, args.days, traced=True)
+                print(
+                    f"    {extension[1:]:>7}: {result['rows']:.0f} rows in {result['seconds']:.1f} s "
+                    f"({result['rows'] / result['seconds']:.0f} rows/s), {result['size'] / 2 ** 20:.1f} MiB, "
+                    f"peak memory {quarter['peak'] / 2 ** 20:.1f} MiB for a quarter, "
+                    f"{year['peak'] / 2 ** 20:.1f} MiB for the whole range"
+                )
+
+        piloton.storage.close()
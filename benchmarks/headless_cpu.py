@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compare process CPU usage of the terminal display (LiveMetrics) against headless streaming (MetricsStream)
+during a simulated workout. Influx writes are disabled so only the display cost differs between runs.
+
+    python -m benchmarks.headless_cpu --duration 60 --clients 1
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from benchmarks.simulation import simulated_piloton
+
+
+async def consume_stream(host: str, port: int, received: List[int]) -> None:
+    """
+    Read the metrics stream like a browser would, counting events
+
+    :param str host: Stream host
+    :param int port: Stream port
+    :param List[int] received: Single-item counter of received events
+    """
+    # Wait for the server to come up
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            break
+        except ConnectionError:
+            await asyncio.sleep(0.1)
+
+    writer.write(b"GET /metrics HTTP/1.1\r\nHost: piloton\r\n\r\n")
+    while True:
+        line: bytes = await reader.readline()
+        if not line:
+            break
+        if line.startswith(b"data:"):
+            received[0] += 1
+
+
+def run_workout(headless: bool, duration: float, warmup: float, clients: int) -> Dict[str, float]:
+    """
+    Run a simulated workout and measure CPU usage after warm up
+
+    :param bool headless: Stream metrics instead of drawing them
+    :param float duration: Measured seconds
+    :param float warmup: Seconds to run before measuring
+    :param int clients: Number of stream clients to connect (headless only)
+    :return: CPU usage and stream events received
+    """
+    piloton, _ = simulated_piloton(headless=headless)
+    piloton.stream_host = "127.0.0.1"
+
+    # Mark measurement window on the loop itself so model training before the workout isn't counted
+    marks: Dict[str, float] = {}
+
+    def mark_start() -> None:
+        marks["cpu"], marks["wall"] = time.process_time(), time.monotonic()
+
+    def mark_stop() -> None:
+        marks["cpu"], marks["wall"] = time.process_time() - marks["cpu"], time.monotonic() - marks["wall"]
+        piloton.stop()
+
+    piloton._loop.call_later(warmup, mark_start)
+    piloton._loop.call_later(warmup + duration, mark_stop)
+
+    received: List[int] = [0]
+    consumers: List[asyncio.Task] = []
+    if headless:
+        for _ in range(clients):
+            consumers.append(
+                piloton._loop.create_task(consume_stream(piloton.stream_host, piloton.stream_port, received))
+            )
+
+    piloton.start_workout()
+    for consumer in consumers:
+        consumer.cancel()
+
+    return {"cpu_percent": marks["cpu"] / marks["wall"] * 100, "events": received[0]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per mode")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds to run before measuring")
+    parser.add_argument("--clients", type=int, default=1, help="Stream clients to connect in headless mode")
+    args = parser.parse_args()
+
+    terminal = run_workout(False, args.duration, args.warmup, 0)
+    headless = run_workout(True, args.duration, args.warmup, args.clients)
+
+    print(f"Terminal display:  {terminal['cpu_percent']:6.2f}% CPU")
+    print(f"Headless stream:   {headless['cpu_percent']:6.2f}% CPU ({headless['events']} events received)")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Compare writing data points to Influx over HTTP and over UDP: sustained write throughput, and data handler time
+during a simulated headless workout. Local stand-ins take the place of InfluxDB's HTTP API and UDP listener and
+count the points they receive, so no database is needed.
+
+    python -m benchmarks.influx_transport --duration 10 --rate 100
+"""
+import argparse
+import socket
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+from influxdb import InfluxDBClient
+
+from benchmarks.simulation import handler_summary, simulated_piloton
+from Piloton import Piloton
+from Piloton.Storage import InfluxStorage
+from Piloton.Types import InfluxUDPClient
+
+
+class HTTPStandIn:
+    """
+    Stand-in for InfluxDB's HTTP write endpoint: accepts every write and counts its lines
+    """
+
+    def __init__(self):
+        self.points: int = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stand_in.points += body.count(b"\n") + (not body.endswith(b"\n") and bool(body))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port: int = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+class UDPStandIn:
+    """
+    Stand-in for InfluxDB's UDP listener: counts the lines and packets it receives
+    """
+
+    def __init__(self):
+        self.points: int = 0
+        self.packets: int = 0
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.socket.bind(("127.0.0.1", 0))
+        self.port: int = self.socket.getsockname()[1]
+        threading.Thread(target=self._receive, daemon=True).start()
+
+    def _receive(self) -> None:
+        while True:
+            packet: bytes = self.socket.recv(65535)
+            self.packets += 1
+            self.points += packet.count(b"\n")
+
+
+def use_transport(piloton: Piloton, transport: str, http: HTTPStandIn, udp: UDPStandIn) -> None:
+    """
+    Point Piloton's Influx writes at a stand-in
+
+    :param Piloton piloton: Piloton
+    :param str transport: "http" or "udp"
+    :param HTTPStandIn http: HTTP stand-in
+    :param UDPStandIn udp: UDP stand-in
+    """
+    client = InfluxDBClient(host="127.0.0.1", port=http.port, database=piloton.influx_database)
+    writer = InfluxUDPClient("127.0.0.1", udp.port, piloton.influx_udp_mtu) if transport == "udp" else None
+    piloton.storage = InfluxStorage(client, writer)
+
+
+def throughput(transport: str, duration: float, http: HTTPStandIn, udp: UDPStandIn) -> Tuple[float, int]:
+    """
+    Write bike data points one at a time, as the workout handler does, as fast as possible
+
+    :param str transport: "http" or "udp"
+    :param float duration: Seconds to write for
+    :param HTTPStandIn http: HTTP stand-in
+    :param UDPStandIn udp: UDP stand-in
+    :return: Points written per second, and points the stand-in received
+    """
+    piloton, _ = simulated_piloton(persist=True)
+    use_transport(piloton, transport, http, udp)
+    stand_in = udp if transport == "udp" else http
+    received: int = stand_in.points
+
+    fields: Dict = {"speed": 17.5, "cadence": 80, "power": 150, "resistance": 35, "power_zone": 2}
+    tags: Dict = {"session": "benchmark", "rider": "Benchmark", "device": "IC Bike"}
+    written: int = 0
+    start: float = time.monotonic()
+    while time.monotonic() - start < duration:
+        now: str = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        piloton.write_data_point(measurement="indoor_bike_data", tags=tags, time=now, fields=fields)
+        written += 1
+    elapsed: float = time.monotonic() - start
+
+    # Give the stand-in a moment to catch up
+    time.sleep(0.5)
+    return written / elapsed, stand_in.points - received
+
+
+def handler_time(transport: str, duration: float, rate: float, http: HTTPStandIn, udp: UDPStandIn) -> str:
+    """
+    Run a simulated headless workout, writing every data point through the transport
+
+    :param str transport: "http" or "udp"
+    :param float duration: Seconds to run
+    :param float rate: Notifications per second per device
+    :param HTTPStandIn http: HTTP stand-in
+    :param UDPStandIn udp: UDP stand-in
+    :return: Data handler time summary
+    """
+    piloton, clients = simulated_piloton(rate, persist=True, headless=True)
+    piloton.stream_host = "127.0.0.1"
+    use_transport(piloton, transport, http, udp)
+
+    piloton._loop.call_later(duration, piloton.stop)
+    piloton.start_workout()
+    return handler_summary(clients)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per measurement")
+    parser.add_argument("--rate", type=float, default=100.0, help="Notifications per second per device")
+    args = parser.parse_args()
+
+    http_stand_in = HTTPStandIn()
+    udp_stand_in = UDPStandIn()
+
+    for name in ("http", "udp"):
+        points_per_second, received = throughput(name, args.duration, http_stand_in, udp_stand_in)
+        handlers: str = handler_time(name, args.duration, args.rate, http_stand_in, udp_stand_in)
+        print(f"{name}:")
+        print(f"    Throughput:   {points_per_second:.0f} points/s ({received} received)")
+        print(f"    Handler time: {handlers}")
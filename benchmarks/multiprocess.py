@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measure event loop lag, notification latency, and handler time during a simulated workout with storage writes and
+LiveMetrics rendering in the BLE process versus in their own processes, fed by the shared memory sample ring. Data
+points are written to a throwaway SQLite database, so both modes do the same storage work. Run it in a real
+terminal: rendering cost depends on it.
+
+    python -m benchmarks.multiprocess --duration 30 --rate 50
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from typing import Dict
+
+from benchmarks.simulation import handler_summary, latency_summary, simulated_piloton
+from utils import LoopLagMonitor
+
+
+def run_workout(multiprocess: bool, duration: float, rate: float, max_fps: float) -> Dict[str, str]:
+    """
+    Run a simulated workout and measure loop lag, notification latency, and handler time
+
+    :param bool multiprocess: Write to storage and render from their own processes
+    :param float duration: Seconds to run
+    :param float rate: Notifications per second per device
+    :param float max_fps: Fastest display refresh rate
+    :return: Lag, latency, and handler time summaries
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        data_path: str = shutil.copytree("data", os.path.join(directory, "data")) + os.sep
+        piloton, clients = simulated_piloton(
+            rate, persist=True, data_path=data_path, storage_backend="sqlite", multiprocess=multiprocess
+        )
+        piloton.display_max_fps = max_fps
+        piloton.checkpoint_interval = 0.0
+
+        monitor = LoopLagMonitor()
+        monitor.start(piloton._loop)
+        piloton._loop.call_later(duration, piloton.stop)
+        piloton.start_workout()
+        monitor.stop()
+        piloton.storage.close()
+
+    return {
+        "lag": monitor.summary(),
+        "latency": latency_summary(clients),
+        "handler": handler_summary(clients),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per mode")
+    parser.add_argument("--rate", type=float, default=50.0, help="Notifications per second per device")
+    parser.add_argument("--max-fps", type=float, default=10.0, help="Fastest display refresh rate")
+    args = parser.parse_args()
+
+    results = {
+        "one process": run_workout(False, args.duration, args.rate, args.max_fps),
+        "worker processes": run_workout(True, args.duration, args.rate, args.max_fps),
+    }
+
+    for mode, result in results.items():
+        print(f"Storage and rendering in {mode}:")
+        print(f"    Loop lag:             {result['lag']}")
+        print(f"    Notification latency: {result['latency']}")
+        print(f"    Handler time:         {result['handler']}")
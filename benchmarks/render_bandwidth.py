@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Measure bytes written to the terminal by the workout screen with Rich repainting every frame versus the diff
+renderer sending only changed characters. The same simulated ride is drawn by both onto an in-memory terminal of a
+fixed size, so results don't depend on the terminal it's run in, and bytes per second are compared against the
+capacity of common serial links.
+
+    python -m benchmarks.render_bandwidth --duration 60 --fps 4
+"""
+import argparse
+import io
+import math
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+from rich.console import Console
+from rich.live import Live
+
+from Piloton.Types import DiffLive, HeartZones, MetricsSnapshot, PowerZones
+from Piloton.UI.Displays import LiveMetrics
+
+# Serial link speeds (baud), at 10 bits per byte
+_LINKS: Dict[str, int] = {"9600 baud": 9600, "115200 baud": 115200}
+
+
+class _CountingFile(io.StringIO):
+    """
+    Terminal stand-in that counts the bytes written to it, then throws them away
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bytes: int = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode("utf-8"))
+        return len(text)
+
+    def isatty(self) -> bool:
+        return True
+
+
+def simulated_ride(frames: int, fps: float) -> List[MetricsSnapshot]:
+    """
+    Generate a ride's snapshots, one per frame: cadence and power drifting, and heart rate climbing slowly
+
+    :param int frames: Number of frames
+    :param float fps: Frames per second
+    :return: Snapshots
+    """
+    heart_zones = HeartZones(age=30)
+    power_zones = PowerZones(ftp=200)
+    snapshots: List[MetricsSnapshot] = []
+    for frame in range(frames):
+        seconds: float = frame / fps
+        cadence: int = round(85 + 10 * math.sin(seconds / 7))
+        power: int = round(180 + 60 * math.sin(seconds / 11) + (frame * 7919 % 9))
+        heart_rate: int = min(round(110 + seconds / 4), 185)
+        snapshots.append(
+            MetricsSnapshot(
+                cadence=cadence,
+                resistance=30 + round(seconds / 60) % 10,
+                power=power,
+                speed=cadence / 4,
+                heart_rate=heart_rate,
+                rmssd=40 - seconds / 30,
+                heart_zone=heart_zones.calculate_heart_zone(heart_rate),
+                power_zone=power_zones.calculate_power_zone(power),
+            )
+        )
+    return snapshots
+
+
+def measure(renderer: str, snapshots: List[MetricsSnapshot], width: int, height: int) -> Dict[str, float]:
+    """
+    Draw every snapshot and count the bytes written
+
+    :param str renderer: "rich" or "diff"
+    :param List[MetricsSnapshot] snapshots: Frames to draw
+    :param int width: Terminal columns
+    :param int height: Terminal rows
+    :return: Total bytes, and mean render time per frame (s)
+    """
+    terminal = _CountingFile()
+    console = Console(file=terminal, width=width, height=height, force_terminal=True, color_system="truecolor")
+    display = LiveMetrics(
+        SimpleNamespace(heart_zones=HeartZones(age=30), power_zones=PowerZones(ftp=200), workout=None)
+    )
+
+    layout = display.generate_layout(snapshots[0])
+    live = DiffLive(layout, console=console) if renderer == "diff" else Live(layout, console=console, screen=True)
+    started: float = time.perf_counter()
+    with live:
+        for snapshot in snapshots:
+            live.update(display.generate_layout(snapshot), refresh=True)
+    elapsed: float = time.perf_counter() - started
+
+    return {"bytes": terminal.bytes, "render": elapsed / len(snapshots)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of ride to draw")
+    parser.add_argument("--fps", type=float, default=4.0, help="Frames per second, as at display_max_fps")
+    parser.add_argument("--width", type=int, default=80, help="Terminal columns")
+    parser.add_argument("--height", type=int, default=24, help="Terminal rows")
+    args = parser.parse_args()
+
+    ride: List[MetricsSnapshot] = simulated_ride(max(round(args.duration * args.fps), 1), args.fps)
+    results: Dict[str, Dict[str, float]] = {
+        "rich": measure("rich", ride, args.width, args.height),
+        "diff": measure("diff", ride, args.width, args.height),
+    }
+
+    print(f"{len(ride)} frames at {args.fps:g} fps on a {args.width}x{args.height} terminal:")
+    for renderer, result in results.items():
+        rate: float = result["bytes"] / args.duration
+        links: str = ", ".join(f"{rate * 10 / baud:.0%} of {name}" for name, baud in _LINKS.items())
+        print(
+            f"    {renderer:>4}: {result['bytes'] / len(ride):8.0f} bytes/frame  {rate / 1024:7.1f} KiB/s  "
+            f"({links})  render {result['render'] * 1000:5.1f} ms/frame"
+        )
+    print(f"    diff sends {results['diff']['bytes'] / results['rich']['bytes']:.1%} of rich's bytes")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Measure event loop lag and notification latency during a simulated workout with LiveMetrics rendering on the
+event loop versus on its own thread. Influx writes are disabled so only rendering competes with notifications.
+Run it in a real terminal: rendering cost depends on it.
+
+    python -m benchmarks.render_lag --duration 30
+"""
+import argparse
+from typing import Dict
+
+from benchmarks.simulation import latency_summary, simulated_piloton
+from utils import LoopLagMonitor
+
+
+def run_workout(render_in_thread: bool, duration: float, rate: float, max_fps: float) -> Dict[str, str]:
+    """
+    Run a simulated workout and measure loop lag and notification latency
+
+    :param bool render_in_thread: Render on a separate thread
+    :param float duration: Seconds to run
+    :param float rate: Notifications per second per device
+    :param float max_fps: Fastest display refresh rate
+    :return: Lag and latency summaries
+    """
+    piloton, clients = simulated_piloton(rate)
+    piloton.render_in_thread = render_in_thread
+    piloton.display_max_fps = max_fps
+    piloton.display_render_budget = 1.0  # Render as often as allowed so both modes draw the same frames
+
+    monitor = LoopLagMonitor()
+    monitor.start(piloton._loop)
+    piloton._loop.call_later(duration, piloton.stop)
+    piloton.start_workout()
+    monitor.stop()
+
+    return {"lag": monitor.summary(), "latency": latency_summary(clients)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per mode")
+    parser.add_argument("--rate", type=float, default=20.0, help="Notifications per second per device")
+    parser.add_argument("--max-fps", type=float, default=10.0, help="Fastest display refresh rate")
+    args = parser.parse_args()
+
+    results = {
+        "event loop": run_workout(False, args.duration, args.rate, args.max_fps),
+        "render thread": run_workout(True, args.duration, args.rate, args.max_fps),
+    }
+
+    for mode, result in results.items():
+        print(f"Rendering on {mode}:")
+        print(f"    Loop lag:             {result['lag']}")
+        print(f"    Notification latency: {result['latency']}")
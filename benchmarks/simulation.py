@@ -0,0 +1,80 @@
+from typing import Callable, List, Tuple
+
+from Piloton import Piloton
+from Piloton.Devices import Bike, HRM, SimulatedClient
+from Piloton.Types import HeartZones, PowerCurve, PowerZones, Rider
+
+
+def simulated_piloton(
+    rate: float = 0.0, persist: bool = False, riders: int = 0, **kwargs
+) -> Tuple[Piloton, List[SimulatedClient]]:
+    """
+    Set up Piloton with simulated devices
+
+    :param float rate: Notifications per second per device (0: device default)
+    :param bool persist: Keep writing data points. Off by default so benchmarks don't need a database.
+    :param int riders: Number of studio riders to set up, replacing any from riders.json
+    :param kwargs: Arguments for Piloton
+    :return: Piloton and the list its simulated clients are added to as they connect
+    """
+    piloton: Piloton = Piloton(**kwargs)
+
+    if riders:
+        piloton.riders = [
+            Rider(
+                name=f"Rider {number}",
+                bike=Bike(f"Bike {number}"),
+                hrm=HRM(f"HRM {number}"),
+                heart_zones=HeartZones(age=20 + number),
+                power_zones=PowerZones(ftp=150 + 10 * number),
+                training_data=piloton.training_data,
+            )
+            for number in range(1, riders + 1)
+        ]
+
+    piloton.simulate_devices(rate)
+
+    # Benchmark rides don't belong in the rider's power curve
+    piloton.save_power_curve = lambda *args, **kwargs: PowerCurve()  # type: ignore
+
+    if not persist:
+        piloton.write_data_point = lambda *args, **kwargs: None  # type: ignore
+        piloton.storage.write_points = lambda *args, **kwargs: True  # type: ignore
+
+    # Keep hold of the simulated clients for their latency statistics
+    clients: List[SimulatedClient] = []
+    for device in piloton.devices + [device for rider in piloton.riders for device in rider.devices]:
+
+        def capture(address: str, client_class: Callable = device.client_class) -> SimulatedClient:
+            clients.append(client_class(address))
+            return clients[-1]
+
+        device.client_class = capture
+
+    return piloton, clients
+
+
+def latency_summary(clients: List[SimulatedClient]) -> str:
+    """
+    Summarize notification latency of simulated clients
+
+    :param List[SimulatedClient] clients: Simulated clients
+    :return: Mean and max latency in milliseconds
+    """
+    notifications: int = sum(client.notifications for client in clients)
+    mean_latency: float = sum(client.total_latency for client in clients) / max(notifications, 1)
+    max_latency: float = max((client.max_latency for client in clients), default=0.0)
+    return f"mean {mean_latency * 1000:.2f} ms, max {max_latency * 1000:.2f} ms over {notifications} notifications"
+
+
+def handler_summary(clients: List[SimulatedClient]) -> str:
+    """
+    Summarize how long the data handlers of simulated clients took
+
+    :param List[SimulatedClient] clients: Simulated clients
+    :return: Mean and max handler time in microseconds
+    """
+    notifications: int = sum(client.notifications for client in clients)
+    mean_time: float = sum(client.total_handler_time for client in clients) / max(notifications, 1)
+    max_time: float = max((client.max_handler_time for client in clients), default=0.0)
+    return f"mean {mean_time * 1e6:.0f} us, max {max_time * 1e6:.0f} us over {notifications} notifications"
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Soak test a workout: simulated bike and HRM notifications at an accelerated rate until the equivalent of a long
+ride has been handled, sampling RSS, traced Python memory, event loop lag, and notification latency and handler
+time as it goes. After a warm up, growth is checked against thresholds and the top growing allocation sites are
+listed. Exits with status 1 if anything grew past its threshold.
+
+At the default 200 notifications per second per device, 24 ride hours (at the bike's real 4 Hz) take about
+30 minutes. Tracing allocations roughly triples handler time, so keep the rate low enough that the loop isn't
+saturated, or latency swings will fail the run. Run it in a real terminal to include LiveMetrics rendering, or
+pass --headless.
+
+    python -m benchmarks.soak --hours 24 --rate 200
+"""
+import argparse
+import asyncio
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, NamedTuple, Optional
+
+from benchmarks.simulation import simulated_piloton
+from Piloton import Piloton
+from Piloton.Devices import SimulatedClient
+from utils import LoopLagMonitor
+
+# Real bike notifications per second, to convert notifications handled to ride time
+_BIKE_RATE: float = 4.0
+
+
+class SoakSample(NamedTuple):
+    """
+    Measurements over one sampling window
+    """
+
+    ride_hours: float  # Equivalent ride time handled so far
+    rss: int  # Resident set size (bytes)
+    traced: int  # Memory allocated by Python and still alive (bytes), or 0 without tracemalloc
+    lag: float  # Mean event loop lag (s)
+    lag_max: float  # Max event loop lag (s)
+    latency: float  # Mean notification latency (s)
+    handler: float  # Mean handler time (s)
+
+
+def rss_bytes() -> int:
+    """
+    Get the process's current resident set size, or its peak where current isn't available
+
+    :return: Bytes
+    """
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Kilobytes on Linux, bytes on macOS
+        peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SoakSampler:
+    """
+    Sample measurements every interval on the event loop, stopping Piloton once enough notifications are handled
+    """
+
+    def __init__(self, piloton: Piloton, clients: List[SimulatedClient], hours: float, interval: float):
+        """
+        Initialize Soak Sampler
+
+        :param Piloton piloton: Piloton running the workout
+        :param List[SimulatedClient] clients: Simulated clients, to read notification statistics from
+        :param float hours: Equivalent ride hours to run for
+        :param float interval: Seconds between samples
+        """
+        self.piloton: Piloton = piloton
+        self.clients: List[SimulatedClient] = clients
+        self.target: int = round(hours * 3600 * _BIKE_RATE)
+        self.interval: float = interval
+        self.samples: List[SoakSample] = []
+        self.monitor: LoopLagMonitor = LoopLagMonitor()
+
+        # Sample taken at the end of warm up, and allocations at that point
+        self.baseline: Optional[int] = None
+        self.warm_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def notifications(self) -> int:
+        """
+        Count notifications handled per device. Both devices notify at the same rate, so this counts bike
+        notifications whichever connected first.
+
+        :return: Notifications
+        """
+        return max((client.notifications for client in self.clients), default=0)
+
+    def sample(self, totals: List[float]) -> SoakSample:
+        """
+        Take a sample, with means over the window since the last one
+
+        :param List[float] totals: Running totals [notifications, latency, handler time, lag samples, lag total],
+            updated in place
+        :return: Sample
+        """
+        notifications: int = sum(client.notifications for client in self.clients)
+        latency: float = sum(client.total_latency for client in self.clients)
+        handler: float = sum(client.total_handler_time for client in self.clients)
+        count: int = max(notifications - int(totals[0]), 1)
+        lag_count: int = max(self.monitor.samples - int(totals[3]), 1)
+
+        sample = SoakSample(
+            ride_hours=self.notifications() / _BIKE_RATE / 3600,
+            rss=rss_bytes(),
+            traced=tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0,
+            lag=(self.monitor.total - totals[4]) / lag_count,
+            lag_max=self.monitor.max,
+            latency=(latency - totals[1]) / count,
+            handler=(handler - totals[2]) / count,
+        )
+        totals[:] = [notifications, latency, handler, self.monitor.samples, self.monitor.total]
+
+        # Lag max is per window, so restart it
+        self.monitor.max = 0.0
+        return sample
+
+    async def run(self, warmup: float) -> None:
+        """
+        Sample until the target ride time, then stop the workout
+
+        :param float warmup: Fraction of the run after which the baseline is taken
+        """
+        totals: List[float] = [0.0] * 5
+        while self.notifications() < self.target:
+            await asyncio.sleep(self.interval)
+            sample: SoakSample = self.sample(totals)
+            self.samples.append(sample)
+
+            if self.baseline is None and self.notifications() >= self.target * warmup:
+                self.baseline = len(self.samples) - 1
+                if tracemalloc.is_tracing():
+                    self.warm_snapshot = tracemalloc.take_snapshot()
+
+            print(
+                f"{sample.ride_hours:6.2f} h  RSS {sample.rss / 2 ** 20:7.1f} MB  "
+                f"traced {sample.traced / 2 ** 20:7.1f} MB  lag {sample.lag * 1000:6.2f} ms "
+                f"(max {sample.lag_max * 1000:7.2f})  latency {sample.latency * 1000:6.2f} ms  "
+                f"handler {sample.handler * 1e6:5.0f} us",
+                file=sys.stderr,
+                flush=True,
+            )
+
+        self.piloton.stop()
+
+
+def check_growth(
+    samples: List[SoakSample], baseline: Optional[int], max_rss: float, max_traced: float, max_latency_growth: float
+) -> List[str]:
+    """
+    Compare the end of the run against the baseline taken after warm up
+
+    :param List[SoakSample] samples: Samples
+    :param Optional[int] baseline: Index of the sample taken at the end of warm up
+    :param float max_rss: Most RSS growth allowed (MB)
+    :param float max_traced: Most traced memory growth allowed (MB)
+    :param float max_latency_growth: Most growth allowed in mean lag, latency, and handler time over the last
+        quarter versus the quarter after warm up, as a fraction (plus 1 ms of slack for timer noise)
+    :return: Failures
+    """
+    failure: str = "Not enough samples after warm up; lower --interval or raise --hours"
+    if baseline is None:
+        return [failure]
+
+    measured: List[SoakSample] = samples[baseline + 1 :]
+    if len(measured) < 4:
+        return [failure]
+
+    warm: SoakSample = samples[baseline]
+    final: SoakSample = measured[-1]
+    failures: List[str] = []
+
+    rss_growth: float = (final.rss - warm.rss) / 2 ** 20
+    if rss_growth > max_rss:
+        failures.append(f"RSS grew {rss_growth:.1f} MB (limit {max_rss} MB)")
+
+    traced_growth: float = (final.traced - warm.traced) / 2 ** 20
+    if traced_growth > max_traced:
+        failures.append(f"Traced memory grew {traced_growth:.1f} MB (limit {max_traced} MB)")
+
+    quarter: int = len(measured) // 4
+    for name in ("lag", "latency", "handler"):
+        early: float = sum(getattr(sample, name) for sample in measured[:quarter]) / quarter
+        late: float = sum(getattr(sample, name) for sample in measured[-quarter:]) / quarter
+        if late > early * (1 + max_latency_growth) + 0.001:
+            failures.append(f"Mean {name} grew from {early * 1000:.3f} ms to {late * 1000:.3f} ms")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=24.0, help="Equivalent ride hours to run for")
+    parser.add_argument("--rate", type=float, default=200.0, help="Notifications per second per device")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between samples")
+    parser.add_argument("--warmup", type=float, default=0.1, help="Fraction of the run before the baseline")
+    parser.add_argument("--headless", action="store_true", help="Stream metrics instead of drawing them")
+    parser.add_argument("--sqlite", action="store_true", help="Store data points in a throwaway SQLite database")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip tracing allocations, which is slow")
+    parser.add_argument("--max-rss-growth", type=float, default=20.0, help="MB of RSS growth allowed")
+    parser.add_argument("--max-traced-growth", type=float, default=10.0, help="MB of traced memory growth allowed")
+    parser.add_argument(
+        "--max-latency-growth", type=float, default=0.5, help="Fraction of lag and latency growth allowed"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Growing allocation sites to list")
+    args = parser.parse_args()
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    # Run from a copy of the data directory, so nothing the ride saves is kept
+    with tempfile.TemporaryDirectory() as directory:
+        data_path: str = shutil.copytree("data", os.path.join(directory, "data")) + os.sep
+        storage_backend: str = "sqlite" if args.sqlite else "influx"
+        piloton, clients = simulated_piloton(
+            args.rate, persist=args.sqlite, headless=args.headless, data_path=data_path, storage_backend=storage_backend
+        )
+
+        sampler = SoakSampler(piloton, clients, args.hours, args.interval)
+        sampler.monitor.start(piloton._loop)
+        task = piloton._loop.create_task(sampler.run(args.warmup))
+
+        started: float = time.monotonic()
+        piloton.start_workout()
+        elapsed: float = time.monotonic() - started
+        sampler.monitor.stop()
+        task.cancel()
+        piloton.storage.close()
+
+    failures: List[str] = check_growth(
+        sampler.samples, sampler.baseline, args.max_rss_growth, args.max_traced_growth, args.max_latency_growth
+    )
+
+    print(f"Soaked {sampler.notifications() / _BIKE_RATE / 3600:.2f} ride hours in {elapsed / 60:.1f} minutes")
+    if sampler.warm_snapshot is not None:
+        print(f"Top {args.top} allocation sites by growth since warm up:")
+        growth = tracemalloc.take_snapshot().compare_to(sampler.warm_snapshot, "lineno")
+        for statistic in growth[: args.top]:
+            print(f"    {statistic}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("PASS")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Compare storage backends: sustained insert rate of data points written one at a time, as the workout handlers
+write them, and the time to read back one whole session from a database holding many. SQLite is always measured;
+InfluxDB is measured if a server is reachable at localhost:8086 (in a throwaway piloton_benchmark database).
+
+    python -m benchmarks.storage --duration 10 --sessions 20 --session-length 3600
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional
+
+from influxdb import InfluxDBClient
+from requests.exceptions import ConnectionError
+
+from Piloton.Storage import InfluxStorage, SQLiteStorage
+from Piloton.Types import Storage
+
+# Points start from here, one second apart
+_EPOCH: int = 1_600_000_000
+
+
+def session_points(session: str, start: int, length: int) -> Iterator[Dict]:
+    """
+    Generate a session's data points: bike and heart rate data every second
+
+    :param str session: Session ID
+    :param int start: Seconds since the epoch the session starts at
+    :param int length: Seconds the session lasts
+    :return: Data points
+    """
+    bike_tags: Dict[str, str] = {"session": session, "rider": "Benchmark", "device": "IC Bike"}
+    hrm_tags: Dict[str, str] = {"session": session, "rider": "Benchmark", "device": "HRM"}
+    for second in range(start, start + length):
+        timestamp: str = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        fields: Dict = {"speed": 17.5, "cadence": 80, "power": 150 + second % 50, "resistance": 35, "power_zone": 2}
+        yield {"measurement": "indoor_bike_data", "tags": bike_tags, "time": timestamp, "fields": fields}
+        fields = {"heart_rate": 120 + second % 30, "zone": 2}
+        yield {"measurement": "heart_rate_monitor", "tags": hrm_tags, "time": timestamp, "fields": fields}
+
+
+def insert_rate(storage: Storage, duration: float) -> float:
+    """
+    Write data points one at a time for duration seconds
+
+    :param Storage storage: Storage backend
+    :param float duration: Seconds to write for
+    :return: Points per second
+    """
+    points: Iterator[Dict] = session_points(uuid.uuid4().hex, _EPOCH, 10 ** 8)
+    written: int = 0
+    start: float = time.monotonic()
+    while time.monotonic() - start < duration:
+        storage.write_points([next(points)])
+        written += 1
+    storage.flush()
+    return written / (time.monotonic() - start)
+
+
+def query_time(storage: Storage, sessions: int, length: int, page: int = 10000) -> float:
+    """
+    Fill storage with sessions, then read one back in pages
+
+    :param Storage storage: Storage backend
+    :param int sessions: Number of sessions to fill storage with
+    :param int length: Seconds per session
+    :param int page: Points per read
+    :return: Seconds to read one session
+    """
+    ids: List[str] = [uuid.uuid4().hex for _ in range(sessions)]
+    for number, session in enumerate(ids):
+        start: int = _EPOCH + 10 ** 7 + number * length
+        storage.write_points(list(session_points(session, start, length)), batch_size=5000)
+        marker: Dict = {
+            "measurement": "session",
+            "tags": {"session": session, "rider": "Benchmark"},
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(start)),
+            "fields": {"event": "start"},
+        }
+        storage.write_points([marker])
+    storage.flush()
+
+    # Read the middle session
+    started: float = time.perf_counter()
+    offset: int = 0
+    while True:
+        points: List[Dict] = storage.query_session("indoor_bike_data", ids[sessions // 2], page, offset)
+        offset += len(points)
+        if len(points) < page:
+            break
+    elapsed: float = time.perf_counter() - started
+
+    assert offset == length, f"Read {offset} points, expected {length}"
+    return elapsed
+
+
+def influx_storage() -> Optional[Callable[[], Storage]]:
+    """
+    Get a factory for storage in a throwaway Influx database, if Influx is reachable
+
+    :return: Factory, or None if no Influx server
+    """
+    try:
+        InfluxDBClient(host="localhost", port=8086).ping()
+    except ConnectionError:
+        return None
+
+    def factory() -> Storage:
+        client = InfluxDBClient(host="localhost", port=8086, database="piloton_benchmark")
+        client.drop_database("piloton_benchmark")
+        client.create_database("piloton_benchmark")
+        return InfluxStorage(client)
+
+    return factory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to insert for")
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions in the database when querying")
+    parser.add_argument("--session-length", type=int, default=3600, help="Seconds per session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backends: Dict[str, Callable[[], Storage]] = {
+            "sqlite": lambda: SQLiteStorage(os.path.join(directory, f"{uuid.uuid4().hex}.sqlite")),
+        }
+        influx = influx_storage()
+        if influx is not None:
+            backends["influx"] = influx
+        else:
+            print("InfluxDB is not reachable at localhost:8086, only measuring SQLite")
+
+        for name, create in backends.items():
+            storage: Storage = create()
+            rate: float = insert_rate(storage, args.duration)
+            storage.close()
+
+            storage = create()
+            elapsed: float = query_time(storage, args.sessions, args.session_length)
+            storage.close()
+
+            print(f"{name}:")
+            print(f"    Insert rate: {rate:.0f} points/s, one point per write")
+            print(f"    Query time:  {elapsed * 1000:.1f} ms for a {args.session_length} s session of {args.sessions}")
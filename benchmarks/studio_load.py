@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Load test studio mode: N simulated riders (a bike and an HRM each) polled on one event loop with the leaderboard
+and batched Influx writes. Writes are counted rather than sent, so no database is needed. Run it in a real
+terminal to include leaderboard rendering.
+
+    python -m benchmarks.studio_load --riders 10 --duration 60
+"""
+import argparse
+import time
+from typing import List
+
+from benchmarks.simulation import latency_summary, simulated_piloton
+from utils import LoopLagMonitor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--riders", type=int, default=10, help="Number of riders")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--rate", type=float, default=0.0, help="Notifications per second per device (0: default)")
+    args = parser.parse_args()
+
+    piloton, clients = simulated_piloton(args.rate, riders=args.riders)
+
+    # Count batched writes instead of sending them
+    batches: List[int] = []
+    piloton.storage.write_points = lambda points, **kwargs: batches.append(len(points))  # type: ignore
+
+    monitor = LoopLagMonitor()
+    monitor.start(piloton._loop)
+    piloton._loop.call_later(args.duration, piloton.stop)
+
+    cpu: float = time.process_time()
+    wall: float = time.monotonic()
+    piloton.start_studio()
+    cpu, wall = time.process_time() - cpu, time.monotonic() - wall
+    monitor.stop()
+
+    print(f"Riders:               {args.riders} ({len(clients)} devices)")
+    print(f"Notification latency: {latency_summary(clients)}")
+    print(f"Loop lag:             {monitor.summary()}")
+    print(f"CPU:                  {cpu / wall * 100:.2f}% (including model training)")
+    print(f"Influx writes:        {sum(batches)} points in {len(batches)} batches")
@@ -1,10 +1,97 @@
 #!/usr/bin/env python3
+import argparse
 import logging
+import os
+from datetime import datetime
 
 from Piloton import Piloton
-from utils import setup_logger, set_logger_level
+from Piloton.Export import CSVExport, FITExport, ParquetExport
+from utils import SamplingProfiler, setup_logger, set_logger_level
 
 if __name__ == "__main__":
+    # Parse command line options
+    parser = argparse.ArgumentParser(description="A Digital Assistant for Your Spin Bike")
+    parser.add_argument(
+        "--headless", action="store_true", help="Stream workout metrics over HTTP instead of drawing them"
+    )
+    parser.add_argument(
+        "--event-loop",
+        choices=("asyncio", "uvloop"),
+        default="asyncio",
+        help="Event loop implementation. uvloop is used only if installed (poetry install -E uvloop)",
+    )
+    parser.add_argument(
+        "--influx-transport",
+        choices=("http", "udp"),
+        default="http",
+        help="Write data points over HTTP, or fire-and-forget over UDP to InfluxDB's UDP listener",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=("influx", "sqlite"),
+        default="influx",
+        help="Store data points in InfluxDB, or in data/piloton.sqlite with no database server",
+    )
+    parser.add_argument(
+        "--resample-interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Combine bike and HRM data into one data point per interval, with means and maxima (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="Write every bike and HRM notification as its own data point, for debugging"
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=("rich", "diff"),
+        default="rich",
+        help="Repaint displays in full with Rich, or send only the characters that changed, for slow SSH or serial links",
+    )
+    parser.add_argument(
+        "--multiprocess",
+        action="store_true",
+        help="Write workout data to storage and draw the workout screen from their own processes, off the BLE process",
+    )
+    parser.add_argument(
+        "--simulate", action="store_true", help="Replay simulated bike and HRM notifications instead of using BLE"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume a workout interrupted by a crash or reboot, if there is one, without asking first",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="piloton.collapsed",
+        metavar="OUTPUT",
+        help="Profile workouts and training sessions, writing collapsed stacks to OUTPUT (default: %(const)s) "
+        "and printing a summary on exit",
+    )
+    parser.add_argument(
+        "--repredict",
+        action="store_true",
+        help="Re-predict resistance for every recorded session with the current training data, then exit",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="Export recorded rides to FILE, as CSV, FIT or Parquet by its extension (.csv, .fit, .parquet), then exit",
+    )
+    parser.add_argument("--session", help="Only export this session")
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, metavar="DATE", help="Export rides from DATE (UTC, e.g. 2021-01-31)"
+    )
+    parser.add_argument(
+        "--until", type=datetime.fromisoformat, metavar="DATE", help="Export rides up to DATE, not included (UTC)"
+    )
+    args = parser.parse_args()
+
+    exports = {".csv": CSVExport, ".fit": FITExport, ".parquet": ParquetExport}
+    if args.export and os.path.splitext(args.export)[1].lower() not in exports:
+        parser.error(f"--export needs a {', '.join(exports)} file")
+
     # Set up root logger
     logger = setup_logger(logging_level=logging.DEBUG)
     set_logger_level("bleak", logging_level=logging.WARNING)
@@ -12,7 +99,47 @@ if __name__ == "__main__":
     set_logger_level("asyncio", logging_level=logging.WARNING)
 
     # Set up Piloton
-    piloton: Piloton = Piloton()
+    piloton: Piloton = Piloton(
+        headless=args.headless,
+        event_loop=args.event_loop,
+        influx_transport=args.influx_transport,
+        storage_backend=args.storage,
+        resample_interval=0.0 if args.raw else args.resample_interval,
+        terminal_renderer=args.renderer,
+        multiprocess=args.multiprocess,
+    )
+
+    # Replace devices with simulated ones
+    if args.simulate:
+        piloton.simulate_devices()
+
+    # Pick up an interrupted workout before showing the menus
+    if args.resume:
+        checkpoint = piloton.load_checkpoint()
+        if checkpoint is not None:
+            piloton.resume_workout(checkpoint)
 
     # Run Piloton
-    piloton.app()
+    if args.export:
+        try:
+            with exports[os.path.splitext(args.export)[1].lower()](args.export) as export:
+                rows = piloton.export_rides(export, start=args.since, end=args.until, session=args.session)
+            logger.info("Exported (%d) rows to %s", rows, args.export)
+        except ImportError as error:
+            logger.error("Unable to export: %s", error)
+    elif args.repredict:
+        piloton.bike.train(piloton.training_data)
+        logger.info("Re-predicted resistance for (%d) points", piloton.repredict_resistance(piloton.bike))
+    elif args.profile:
+        profiler = SamplingProfiler()
+        profiler.start(piloton._loop)
+        piloton.loop_lag_monitor = profiler.lag
+        try:
+            piloton.app()
+        finally:
+            profiler.stop()
+            profiler.write_collapsed(args.profile)
+            print(profiler.summary())
+            print(f"Collapsed stacks written to {args.profile}")
+    else:
+        piloton.app()
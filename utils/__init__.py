@@ -1 +1,3 @@
+from utils.lag import LoopLagMonitor
 from utils.logging import set_logger_level, setup_logger
+from utils.profiling import SamplingProfiler
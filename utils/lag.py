@@ -0,0 +1,93 @@
+import asyncio
+import bisect
+import time
+from typing import List, Optional
+
+# Upper bounds (s) of the lag histogram buckets
+_BUCKETS: List[float] = [0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, float("inf")]
+
+
+class LoopLagMonitor:
+    """
+    Measure event loop lag: how much later than requested a periodic sleep wakes up. Lag is whatever time the
+    loop spent running other callbacks, so it's the delay a BLE notification would see. Lags are kept in a fixed
+    histogram so the monitor can run for hours in constant memory.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Initialize Loop Lag Monitor
+
+        :param float interval: Seconds between lag samples
+        """
+        self.interval: float = interval
+        self.samples: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.histogram: List[int] = [0] * len(_BUCKETS)
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag: float) -> None:
+        """
+        Record a lag sample
+
+        :param float lag: Lag (s)
+        """
+        self.samples += 1
+        self.total += lag
+        self.max = max(self.max, lag)
+        self.histogram[bisect.bisect_left(_BUCKETS, lag)] += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a lag percentile as the upper bound of the bucket containing it
+
+        :param float percent: Percentile (0-100)
+        :return: Lag (s)
+        :rtype: float
+        """
+        threshold: float = self.samples * percent / 100
+        seen: int = 0
+        for bound, count in zip(_BUCKETS, self.histogram):
+            seen += count
+            if seen >= threshold:
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+    async def _run(self) -> None:
+        while True:
+            start: float = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.monotonic() - start - self.interval))
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Start sampling on loop
+
+        :param asyncio.AbstractEventLoop loop: Loop to monitor
+        """
+        self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        """
+        Stop sampling
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def summary(self) -> str:
+        """
+        Summarize lag
+
+        :return: Mean, p99 and max lag in milliseconds
+        :rtype: str
+        """
+        return (
+            f"mean {self.mean * 1000:.2f} ms, p99 <= {self.percentile(99) * 1000:.2f} ms, "
+            f"max {self.max * 1000:.2f} ms over {self.samples} samples"
+        )
@@ -0,0 +1,205 @@
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Counter as CounterType, List, Optional, Tuple
+
+from utils.lag import LoopLagMonitor
+
+# Event loop and thread machinery between run_until_complete (or a thread's start) and the coroutine or callback
+# being run. Dropped from stacks, so each sample starts at what the loop was running instead of how it got there.
+_LOOP_FRAMES = {
+    ("threading.py", "_bootstrap"),
+    ("threading.py", "_bootstrap_inner"),
+    ("threading.py", "run"),
+    ("thread.py", "_worker"),
+    ("thread.py", "run"),
+    ("base_events.py", "run_until_complete"),
+    ("base_events.py", "run_forever"),
+    ("base_events.py", "_run_once"),
+    ("events.py", "_run"),
+    ("tasks.py", "__step"),
+    ("tasks.py", "__step_run_and_handle_result"),
+    ("tasks.py", "__wakeup"),
+}
+
+# Where an idle event loop waits for I/O, and idle threads wait for work
+_IDLE_FRAMES = {("selectors.py", "select"), ("selectors.py", "poll"), ("threading.py", "wait")}
+
+
+class _SlowCallbackCounter(logging.Handler):
+    """
+    Count asyncio's debug mode warnings about callbacks that held the event loop too long
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.count: int = 0
+        self.first: List[str] = []  # First few warnings, as examples
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message: str = record.getMessage()
+        if message.startswith("Executing"):
+            self.count += 1
+            if len(self.first) < 5:
+                self.first.append(message)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for Piloton's event loop. A background thread samples every thread's stack at a fixed
+    interval while the loop is running. Event loop machinery is dropped and coroutine frames are marked, so
+    samples read as the coroutines and callbacks the loop was running rather than as one deep _run_once, and time
+    spent waiting for I/O or work is counted as idle. Slow-callback warnings are recorded alongside, and loop lag in
+    lag, which the caller starts and stops around each run of the loop: between runs, the loop sits stopped in
+    menus and prompts, and that time would count as lag.
+    """
+
+    def __init__(self, interval: float = 0.005, slow_callback: float = 0.05):
+        """
+        Initialize Sampling Profiler
+
+        :param float interval: Seconds between stack samples
+        :param float slow_callback: Callbacks holding the loop longer than this (s) are counted as slow
+        """
+        self.interval: float = interval
+        self.slow_callback: float = slow_callback
+        self.stacks: CounterType[Tuple[str, ...]] = Counter()
+        self.samples: int = 0
+        self.lag: LoopLagMonitor = LoopLagMonitor()
+        self.slow_callbacks: _SlowCallbackCounter = _SlowCallbackCounter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: str = ""
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+
+    @staticmethod
+    def _label(frame: FrameType) -> str:
+        code = frame.f_code
+        prefix: str = "async " if code.co_flags & inspect.CO_COROUTINE else ""
+        return f"{prefix}{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _collapse(self, thread_name: str, frame: Optional[FrameType]) -> Tuple[str, ...]:
+        """
+        Convert a thread's stack to a root-first tuple of frame labels
+
+        :param str thread_name: Name of the sampled thread
+        :param frame: Innermost frame of the thread
+        :return: Collapsed stack
+        """
+        stack: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            key: Tuple[str, str] = (os.path.basename(code.co_filename), code.co_name)
+            if key in _IDLE_FRAMES:
+                return thread_name, "(idle)"
+            if key not in _LOOP_FRAMES:
+                stack.append(self._label(frame))
+            frame = frame.f_back
+
+        stack.append(thread_name)
+        return tuple(reversed(stack))
+
+    def _sample(self) -> None:
+        """
+        Sampling thread: sample every other thread's stack while the loop is running
+        """
+        own_id: int = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            if self._loop is None or not self._loop.is_running():
+                continue
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.stacks[self._collapse(names.get(thread_id, str(thread_id)), frame)] += 1
+            self.samples += 1
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Start profiling loop
+
+        :param asyncio.AbstractEventLoop loop: Loop to profile
+        """
+        self._loop = loop
+        self._loop_thread = threading.current_thread().name
+
+        # Debug mode makes asyncio warn about slow callbacks
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.slow_callback
+        logging.getLogger("asyncio").addHandler(self.slow_callbacks)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop profiling
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+        self.lag.stop()
+        logging.getLogger("asyncio").removeHandler(self.slow_callbacks)
+        if self._loop is not None:
+            self._loop.set_debug(False)
+
+    def write_collapsed(self, path: str) -> None:
+        """
+        Write stacks in collapsed format ("frame;frame;frame count"), for flamegraph.pl or speedscope
+
+        :param str path: Output path
+        """
+        with open(path, "w") as fh:
+            for stack, count in sorted(self.stacks.items()):
+                fh.write(f"{';'.join(stack)} {count}\n")
+
+    def top(self, count: int = 20) -> List[Tuple[str, int, int]]:
+        """
+        Find the functions with the most samples
+
+        :param int count: Number of functions
+        :return: Function label, samples in the function itself, and samples in it or anything it called
+        :rtype: List[Tuple[str, int, int]]
+        """
+        own: CounterType[str] = Counter()
+        total: CounterType[str] = Counter()
+        for stack, samples in self.stacks.items():
+            if stack[-1] == "(idle)":
+                continue
+            own[stack[-1]] += samples
+            for label in set(stack[1:]):
+                total[label] += samples
+
+        return [(label, own[label], samples) for label, samples in total.most_common(count)]
+
+    def summary(self, count: int = 20) -> str:
+        """
+        Summarize the profile: the top functions (percent of samples, across threads), how much of the time the
+        event loop was idle, loop lag, and slow callbacks
+
+        :param int count: Number of functions
+        :return: Summary
+        :rtype: str
+        """
+        samples: int = max(self.samples, 1)
+        lines: List[str] = [
+            f"{self.samples} samples every {self.interval * 1000:.1f} ms",
+            f"{'own %':>7} {'total %':>8}  function",
+        ]
+        for label, own, total in self.top(count):
+            lines.append(f"{own / samples * 100:7.1f} {total / samples * 100:8.1f}  {label}")
+
+        idle: int = self.stacks[(self._loop_thread, "(idle)")]
+        lines.append(f"Event loop idle: {idle / samples * 100:.1f}%")
+        lines.append(f"Loop lag: {self.lag.summary()}")
+        lines.append(f"Slow callbacks (> {self.slow_callback * 1000:.0f} ms): {self.slow_callbacks.count}")
+        lines.extend(f"    {message}" for message in self.slow_callbacks.first)
+        return "\n".join(lines)